@@ -1,15 +1,117 @@
 import streamlit as st
-from PIL import Image
-import numpy as np
 import cv2
 import time
 import os
+import tempfile
 
-from models.model_loader import ModelLoader
+from models.registry import get_registry, HandleGroup
+from models.artifacts import get_artifact_manager
 from models.detector import ObjectDetector
-from captioning.caption_generator import CaptionGenerator
+from models.ensemble import EnsembleDetector
+from models.cascade import CascadeDetector
 from utils.visualizer import ResultVisualizer
 from tracking.mlflow_tracker import MLflowTracker
+from serving.client import InferenceClient
+from utils.result_cache import CachedDetector, CachedCaptionGenerator
+from utils.analysis_image import AnalysisImage
+from utils.orchestrator import AnalysisOrchestrator
+from models.detections import Detections
+from utils.telemetry import start_metrics_server
+from utils.video_stream import VideoAnalyzer
+from config.settings import Config
+
+@st.cache_resource
+def _init_registry():
+    """Registry'yi süreç başına bir kez oluşturur ve ön yüklemeyi başlatır"""
+    registry = get_registry()
+    get_artifact_manager().prefetch()
+    registry.preload()
+    start_metrics_server()
+    return registry
+
+def _acquire(registry, model_type):
+    """Modeli oturumun handle grubuna kaydederek alır; oturum bitince grup referansları bırakır"""
+    if 'model_handles' not in st.session_state:
+        st.session_state.model_handles = HandleGroup()
+    return st.session_state.model_handles.add(registry.acquire(model_type))
+
+def _release_handles():
+    for name in ('detector_handle', 'caption_handle', 'member_handles', 'detector_model', 'caption_gen'):
+        st.session_state.pop(name, None)
+    if 'model_handles' in st.session_state:
+        st.session_state.model_handles.release_all()
+    st.session_state.loaded_model_type = None
+
+def _build_detector(tiled=False):
+    """Aktif modelden (veya ensemble/cascade üyelerinden) dedektör oluşturur"""
+    members = {
+        name: ObjectDetector(handle.model, "YOLO11" if "YOLO" in name else name, tiled=tiled)
+        for name, handle in st.session_state.get('member_handles', {}).items()
+    }
+    if st.session_state.loaded_model_type == ENSEMBLE:
+        return EnsembleDetector(members)
+    if st.session_state.loaded_model_type == CASCADE:
+        return CascadeDetector(members[Config.CASCADE_FAST_MODEL], members[Config.CASCADE_HEAVY_MODEL])
+    loaded_type = st.session_state.loaded_model_type
+    effective_type = "YOLO11" if "YOLO" in loaded_type else loaded_type
+    return ObjectDetector(st.session_state.detector_model, effective_type, tiled=tiled)
+
+STAGE_LABELS = {'detection': "Nesne tespiti", 'caption': "AI yorumu"}
+DETECTOR_MODELS = ["YOLO11", "DETR", "MY YOLO (PC Setup)"]
+ENSEMBLE = "Ensemble"
+CASCADE = "Cascade"
+
+def run_video_mode(input_mode):
+    """Video dosyası veya kamera/RTSP akışını kare kare analiz edip overlay'i canlı gösterir"""
+    if st.session_state.get('inference_client') is not None:
+        st.warning("Video modu yalnızca modeller bu süreçte yüklüyken kullanılabilir.")
+        return
+
+    temp_path = None
+    if input_mode == "Video":
+        video_file = st.file_uploader("Video Yükle", type=['mp4', 'avi', 'mov', 'mkv'])
+        if not video_file:
+            return
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(video_file.name)[1]) as tmp:
+            tmp.write(video_file.getvalue())
+            temp_path = tmp.name
+        source, max_frames = temp_path, None
+    else:
+        source = st.text_input("Kaynak (kamera indeksi veya RTSP URL):", "0")
+        max_frames = Config.VIDEO_MAX_FRAMES
+
+    target_fps = st.sidebar.slider("Hedef Tespit FPS", 1, 30, Config.VIDEO_TARGET_FPS)
+
+    if not st.button("▶️ Akışı Başlat", type="primary"):
+        if temp_path:
+            os.remove(temp_path)
+        return
+
+    detector = _build_detector()
+    analyzer = VideoAnalyzer(detector, st.session_state.caption_gen, target_fps=target_fps)
+
+    frame_slot = st.empty()
+    stats_slot = st.empty()
+    try:
+        for result in analyzer.stream(source, max_frames):
+            # Yalnızca analiz edilen kareler gönderilir; ara kareler tarayıcıya taşınmaz
+            if result.analyzed:
+                frame_slot.image(cv2.cvtColor(result.frame, cv2.COLOR_BGR2RGB), use_container_width=True)
+                stats = analyzer.stats
+                stats_slot.caption(
+                    f"Kare: {stats['frames']} · Çıkış FPS: {stats['output_fps']:.1f} · "
+                    f"Tespit FPS: {stats['detection_fps']:.1f} · Atlanan: {stats['skipped_frames']} · "
+                    f"Düşen: {stats['dropped_frames']}"
+                )
+    except RuntimeError as e:
+        st.error(f"Hata oluştu: {e}")
+    finally:
+        analyzer.close()
+        if temp_path:
+            os.remove(temp_path)
+
+    if analyzer.stats.get('frames'):
+        st.success(f"✅ {analyzer.stats['frames']} kare işlendi, ortalama {analyzer.stats['output_fps']:.1f} FPS")
 
 def main():
     st.set_page_config(page_title="AI Image Analyzer", layout="wide")
@@ -17,25 +119,77 @@ def main():
     st.markdown("---")
 
     st.sidebar.header("⚙️ Model Ayarları")
-    model_type = st.sidebar.selectbox("Algoritma Seçin:", ["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    model_type = st.sidebar.selectbox("Algoritma Seçin:", DETECTOR_MODELS + [ENSEMBLE, CASCADE])
+    if model_type == ENSEMBLE:
+        ensemble_members = st.sidebar.multiselect("Ensemble Modelleri:", DETECTOR_MODELS, default=DETECTOR_MODELS)
     
+    registry = _init_registry()
+
     if 'loaded_model_type' not in st.session_state:
         st.session_state.loaded_model_type = None
 
     if st.sidebar.button("Modeli Aktifleştir", type="primary"):
         with st.spinner(f"{model_type} yükleniyor..."):
-            st.session_state.detector_model = ModelLoader.load_model(model_type)
-            
-            st.session_state.caption_gen = CaptionGenerator()
+            if model_type == ENSEMBLE and not ensemble_members:
+                st.sidebar.error("En az bir model seçin.")
+                st.stop()
+            if model_type in (ENSEMBLE, CASCADE) and Config.INFERENCE_SERVER_URL:
+                st.sidebar.error(f"{model_type} modu yalnızca modeller bu süreçte yüklüyken kullanılabilir.")
+                st.stop()
+            # Model değişince önceki modellerin referansları bırakılır; yükleme yarıda kalırsa alınanlar da
+            _release_handles()
+            try:
+                if Config.INFERENCE_SERVER_URL:
+                    # Modeller ayrı servis sürecinde çalışır, UI yalnızca istemcidir
+                    st.session_state.inference_client = InferenceClient()
+                else:
+                    st.session_state.inference_client = None
+                    if model_type in (ENSEMBLE, CASCADE):
+                        members = ensemble_members if model_type == ENSEMBLE else \
+                            [Config.CASCADE_FAST_MODEL, Config.CASCADE_HEAVY_MODEL]
+                        st.session_state.member_handles = {name: _acquire(registry, name) for name in members}
+                        st.session_state.detector_model = None
+                    else:
+                        st.session_state.detector_handle = _acquire(registry, model_type)
+                        st.session_state.detector_model = st.session_state.detector_handle.model
+                    st.session_state.caption_handle = _acquire(registry, "BLIP")
+
+                    st.session_state.caption_gen = st.session_state.caption_handle.model
+            except RuntimeError as e:
+                _release_handles()
+                st.sidebar.error(f"❌ {e}")
+                st.stop()
             st.session_state.tracker = MLflowTracker()
             st.session_state.loaded_model_type = model_type
             st.sidebar.success(f"✅ {model_type} Hazır!")
 
+    caption_preset = st.sidebar.selectbox(
+        "Caption Modu:", list(Config.CAPTION_PRESETS),
+        index=list(Config.CAPTION_PRESETS).index(Config.CAPTION_PRESET)
+    )
+
+    tiled = st.sidebar.checkbox(
+        "Parçalı Tespit (yüksek çözünürlük)", value=Config.TILED_INFERENCE,
+        help=f"Uzun kenarı {Config.TILE_MIN_SIDE}px üzerindeki görseller {Config.TILE_SIZE}px karolarla taranır"
+    )
+
+    input_mode = st.sidebar.radio("Girdi Türü:", ["Görsel", "Video", "Kamera / RTSP"])
+    if input_mode != "Görsel":
+        if st.session_state.loaded_model_type:
+            run_video_mode(input_mode)
+        else:
+            st.info("💡 Başlamak için önce yan menüden bir model aktifleştirin.")
+        return
+
     uploaded_file = st.file_uploader("Resim Yükle", type=['jpg', 'png', 'jpeg'])
 
     if uploaded_file and st.session_state.loaded_model_type:
-        image = Image.open(uploaded_file)
-        img_cv_orig = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        # Görsel yalnızca yeni dosya yüklendiğinde bir kez çözülür, tüm modeller aynı tamponu kullanır
+        file_key = getattr(uploaded_file, 'file_id', None) or uploaded_file.name
+        if st.session_state.get('image_key') != file_key:
+            st.session_state.analysis_image = AnalysisImage.from_file(uploaded_file)
+            st.session_state.image_key = file_key
+        image = st.session_state.analysis_image
         
         if st.button("🎯 Analizi Başlat", type="primary"):
             st.session_state.tracker.start_run(run_name=f"{model_type}_Analysis")
@@ -43,11 +197,52 @@ def main():
             
             with st.spinner("Yapay zeka analiz ediyor..."):
                 try:
-                    effective_type = "YOLO11" if "YOLO" in model_type else model_type
-                    detector = ObjectDetector(st.session_state.detector_model, effective_type)
-                    boxes, confs, class_ids, classes, indexes = detector.detect(image)
-                    
-                    ai_caption = st.session_state.caption_gen.generate_ai_caption(uploaded_file)
+                    client = st.session_state.get('inference_client')
+                    st.session_state.stage_timings = {}
+                    st.session_state.caption_stats = {}
+                    st.session_state.member_latencies = {}
+                    st.session_state.cascade_info = None
+                    if client is not None:
+                        remote = client.analyze(uploaded_file.getvalue(), st.session_state.loaded_model_type, caption_preset)
+                        boxes, confs, class_ids = remote['boxes'], remote['confs'], remote['class_ids']
+                        classes, indexes = remote['classes'], remote['indexes']
+                        ai_caption = remote['ai_caption']
+                        detections = Detections.from_legacy(boxes, confs, class_ids, classes)
+                    else:
+                        detector = ensemble = _build_detector(tiled)
+                        caption_gen = st.session_state.caption_gen
+                        if Config.RESULT_CACHE_ENABLED:
+                            detector = CachedDetector(detector, model_id=st.session_state.loaded_model_type)
+                            caption_gen = CachedCaptionGenerator(caption_gen)
+                        progress = st.empty()
+                        preview = st.empty()
+                        done_stages = []
+
+                        def _on_result(stage, result, elapsed):
+                            # İlk biten aşamanın sonucu diğeri beklenmeden gösterilir
+                            done_stages.append(f"✅ {STAGE_LABELS[stage]} ({elapsed:.2f}s)")
+                            progress.caption(" · ".join(done_stages))
+                            if stage == 'caption':
+                                preview.info(f"**AI Yorumu:** {result}")
+                            elif result is not None:
+                                preview.info(f"**Toplam Nesne:** {len(result)}")
+
+                        orchestrator = AnalysisOrchestrator(detector, caption_gen, caption_preset=caption_preset)
+                        outcome = orchestrator.run(image, on_result=_on_result)
+                        detections = outcome['detection']
+                        boxes, confs, class_ids, classes, indexes = detections.to_legacy()
+                        ai_caption = outcome['caption']
+                        st.session_state.stage_timings = outcome['timings']
+                        if isinstance(ensemble, EnsembleDetector):
+                            # Önbellekten dönen sonuçta gecikme tablosu boş kalır
+                            st.session_state.member_latencies = ensemble.last_latencies
+                        elif isinstance(ensemble, CascadeDetector) and ensemble.stats()['images']:
+                            # Oturum boyunca yükseltme oranı; önbellekten dönen sonuçlar sayılmaz
+                            totals = st.session_state.setdefault('cascade_totals', {'images': 0, 'escalated': 0})
+                            totals['images'] += 1
+                            totals['escalated'] += ensemble.last_reason is not None
+                            st.session_state.cascade_info = (ensemble.last_reason, totals['escalated'] / totals['images'])
+                        st.session_state.caption_stats = outcome['caption_stats']
 
                     st.session_state.analysis_results = {
                         'boxes': boxes,
@@ -56,10 +251,20 @@ def main():
                         'classes': classes,
                         'indexes': indexes,
                         'ai_caption': ai_caption,
-                        'img_cv': img_cv_orig.copy()
+                        'detections': detections,
+                        'image': image
                     }
                     st.session_state.analyzed = True
                     st.session_state.process_time = time.time() - start_time
+
+                    tracker = st.session_state.tracker
+                    tracker.log_metrics({
+                        'boxes': boxes,
+                        'confidences': confs,
+                        'inference_time': st.session_state.stage_timings.get('detection', st.session_state.process_time)
+                    })
+                    # Süreç geneli Telemetry özeti diğer oturumları da içerir; yalnızca bu isteğin süreleri yazılır
+                    tracker.log_stage_timings(st.session_state.stage_timings)
                 
                 except Exception as e:
                     st.error(f"Hata oluştu: {e}")
@@ -74,6 +279,26 @@ def main():
                 st.subheader("📊 Analiz Özeti")
                 st.info(f"**AI Yorumu:** {res['ai_caption']}")
                 st.metric("İşlem Süresi", f"{st.session_state.process_time:.2f}s")
+                timings = st.session_state.get('stage_timings') or {}
+                if timings:
+                    stage_cols = st.columns(2)
+                    for col, stage in zip(stage_cols, ('detection', 'caption')):
+                        if stage in timings:
+                            col.metric(STAGE_LABELS[stage], f"{timings[stage]:.2f}s")
+                latencies = st.session_state.get('member_latencies') or {}
+                if latencies:
+                    st.write("### ⏱️ Model Gecikmeleri")
+                    for name, seconds in sorted(latencies.items(), key=lambda item: item[1]):
+                        st.caption(f"{name}: {seconds:.2f}s")
+                cascade_info = st.session_state.get('cascade_info')
+                if cascade_info:
+                    reason, escalation_rate = cascade_info
+                    status = f"ağır modele yükseltildi ({reason})" if reason else "hızlı model yeterli oldu"
+                    st.caption(f"Cascade: {status} · yükseltme oranı %{escalation_rate * 100:.0f}")
+                caption_stats = st.session_state.get('caption_stats')
+                if caption_stats:
+                    st.caption(f"Caption hızı ({caption_preset}): {caption_stats['tokens_per_sec']:.1f} token/s "
+                               f"({caption_stats['tokens']} token, {caption_stats['seconds']:.2f}s)")
                 st.metric("Toplam Nesne", len(res['boxes']))
                 
                 if len(res['boxes']) > 0:
@@ -91,39 +316,25 @@ def main():
             with col1:
                 st.subheader("🎯 Görselleştirme")
                 viz = ResultVisualizer(res['classes'])
-                display_img = res['img_cv'].copy()
-
+                # Çizimler (sonuç, seçim) başına görsel üzerinde önbelleklenir; tekrar çalıştırmalarda yalnızca byte'lar gönderilir
                 if selected_option == "Hepsini Göster":
-                    final_img = viz.draw_detections(
-                        display_img, 
-                        res['boxes'], 
-                        res['confs'], 
-                        res['class_ids'], 
-                        res['indexes']
-                    )
-                    st.image(cv2.cvtColor(final_img, cv2.COLOR_BGR2RGB), use_container_width=True)
+                    st.image(viz.render(res['image'], res['detections']), use_container_width=True)
                 
                 else:
                     selected_idx_num = int(selected_option.split(".")[0]) - 1
-                    actual_idx = res['indexes'].flatten()[selected_idx_num]
+                    actual_idx = int(res['indexes'].flatten()[selected_idx_num])
                     
                     box = res['boxes'][actual_idx] 
                     label = res['classes'][res['class_ids'][actual_idx]]
-                    conf_val = res['confs'][actual_idx]
                     
                     x, y, w, h = box
                     x, y = max(0, x), max(0, y)
                     
-                    label_text = f"{label.capitalize()}: %{conf_val*100:.1f}"
-                    cv2.rectangle(display_img, (x, y), (x + w, y + h), (0, 255, 0), 3)
-                    cv2.putText(display_img, label_text, (x, y - 10), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    
-                    st.image(cv2.cvtColor(display_img, cv2.COLOR_BGR2RGB), use_container_width=True)
+                    st.image(viz.render(res['image'], res['detections'], selected=actual_idx), use_container_width=True)
                     
-                    crop_img = res['img_cv'][y:y+h, x:x+w]
+                    crop_img = res['image'].rgb[y:y+h, x:x+w]
                     st.write(f"🔍 **Seçili Nesne Yakın Çekim:** {label.capitalize()}")
-                    st.image(cv2.cvtColor(crop_img, cv2.COLOR_BGR2RGB), width=250)
+                    st.image(crop_img, width=250)
 
             st.session_state.tracker.log_parameters(st.session_state.loaded_model_type)
             st.session_state.tracker.end_run()
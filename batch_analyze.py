@@ -0,0 +1,81 @@
+import argparse
+import json
+import time
+
+from PIL import Image
+
+from config.settings import Config
+from models.registry import get_registry
+from models.detector import ObjectDetector
+from utils.image_files import list_images
+
+
+def analyze_directory(directory, model_type="YOLO11", batch_size=None, with_captions=True, output=None):
+    """Klasördeki tüm görselleri batch'ler halinde analiz eder ve sonuçları JSONL olarak yazar"""
+    batch_size = batch_size or Config.BATCH_SIZE
+    paths = list_images(directory)
+    print(f"🚀 {len(paths)} görsel bulundu, batch boyutu: {batch_size}")
+
+    registry = get_registry()
+    detector_handle = registry.acquire(model_type)
+    caption_handle = registry.acquire("BLIP") if with_captions else None
+
+    effective_type = "YOLO11" if "YOLO" in model_type else model_type
+    detector = ObjectDetector(detector_handle.model, effective_type)
+
+    out = open(output, 'w') if output else None
+    start_time = time.time()
+    try:
+        for start in range(0, len(paths), batch_size):
+            chunk = paths[start:start + batch_size]
+            images = [Image.open(p).convert('RGB') for p in chunk]
+
+            detections = detector.detect_batch(images, batch_size=batch_size)
+            if caption_handle:
+                captions = caption_handle.model.generate_captions_batch(images, batch_size=batch_size)
+            else:
+                captions = [None] * len(chunk)
+
+            for path, (boxes, confs, class_ids, classes, _), caption in zip(chunk, detections, captions):
+                record = {
+                    "image": path,
+                    "model": model_type,
+                    "detections": [
+                        {"object": classes[cid], "confidence": float(conf), "bbox": [int(v) for v in box]}
+                        for box, conf, cid in zip(boxes or [], confs or [], class_ids or [])
+                    ],
+                    "ai_caption": caption
+                }
+                line = json.dumps(record, ensure_ascii=False)
+                if out:
+                    out.write(line + "\n")
+                else:
+                    print(line)
+
+            if out:
+                print(f"   İşlenen: {min(start + batch_size, len(paths))}/{len(paths)}")
+    finally:
+        if out:
+            out.close()
+        detector_handle.release()
+        if caption_handle:
+            caption_handle.release()
+
+    elapsed = time.time() - start_time
+    print(f"✅ Tamamlandı: {len(paths)} görsel, {elapsed:.2f}s ({len(paths) / max(elapsed, 1e-9):.1f} görsel/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Klasördeki görseller için batch tespit + caption")
+    parser.add_argument("directory", help="Görsellerin bulunduğu klasör")
+    parser.add_argument("--model", default="YOLO11", choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--batch-size", type=int, default=Config.BATCH_SIZE)
+    parser.add_argument("--no-caption", action="store_true", help="BLIP caption üretimini atla")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSONL dosyası (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    analyze_directory(args.directory, args.model, args.batch_size, not args.no_caption, args.output)
+
+
+if __name__ == "__main__":
+    main()
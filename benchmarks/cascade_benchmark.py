@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from models.model_loader import ModelLoader
+from models.detector import ObjectDetector
+from models.cascade import CascadeDetector
+from models.detections import box_iou
+from models.ensemble import canonical_ids
+from utils.analysis_image import AnalysisImage
+from utils.image_files import list_images
+
+
+def load_ground_truth(image_path, width, height, names):
+    """YOLO etiket dosyasını (kutu veya poligon) piksel xyxy kutularına çevirir"""
+    label_path = os.path.splitext(image_path.replace(f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"))[0] + ".txt"
+    boxes, labels = [], []
+    if not os.path.exists(label_path):
+        return np.zeros((0, 4), np.float32), labels
+
+    with open(label_path) as f:
+        for line in f:
+            values = line.split()
+            if len(values) < 5:
+                continue
+            cls, coords = int(values[0]), np.array(values[1:], dtype=np.float32)
+            if len(coords) == 4:
+                cx, cy, w, h = coords
+                box = [cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2]
+            else:
+                # Roboflow segmentasyon etiketi: poligonun çevreleyen kutusu
+                xs, ys = coords[0::2], coords[1::2]
+                box = [xs.min(), ys.min(), xs.max(), ys.max()]
+            boxes.append(np.array(box) * [width, height, width, height])
+            labels.append(names[cls])
+    return np.array(boxes, dtype=np.float32).reshape(-1, 4), labels
+
+
+def average_precision(matches, n_gt):
+    """Güvene göre sıralı (conf, tp) listesinden tüm noktalı interpolasyonla AP"""
+    if n_gt == 0:
+        return None
+    if not matches:
+        return 0.0
+    matches = sorted(matches, key=lambda m: -m[0])
+    tp = np.cumsum([m[1] for m in matches])
+    fp = np.cumsum([1 - m[1] for m in matches])
+    recall = np.concatenate([[0.0], tp / n_gt, [1.0]])
+    precision = np.concatenate([[1.0], tp / np.maximum(tp + fp, 1e-9), [0.0]])
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    return float(np.sum((recall[1:] - recall[:-1]) * precision[1:]))
+
+
+def evaluate(predictions, ground_truth, names, iou_threshold=0.5):
+    """Sınıf başına AP50, mAP50 ve CONFIDENCE_THRESHOLD'daki precision/recall"""
+    per_class = {name: {"matches": [], "n_gt": 0} for name in names}
+    for detections, (gt_boxes, gt_labels) in zip(predictions, ground_truth):
+        pred_names = [detections.vocab.name(i) for i in canonical_ids(detections).tolist()] if detections else []
+        pred_xyxy = detections.xyxy if detections else np.zeros((0, 4), np.float32)
+        pred_confs = detections.confs if detections else np.zeros(0, np.float32)
+
+        for name in names:
+            gt = gt_boxes[[label == name for label in gt_labels]] if gt_labels else gt_boxes[:0]
+            per_class[name]["n_gt"] += len(gt)
+            idx = [i for i, n in enumerate(pred_names) if n == name]
+            idx.sort(key=lambda i: -pred_confs[i])
+            matched = np.zeros(len(gt), dtype=bool)
+            ious = box_iou(pred_xyxy[idx], gt) if idx and len(gt) else None
+            for row, i in enumerate(idx):
+                tp = 0
+                if ious is not None:
+                    candidates = np.where(~matched & (ious[row] >= iou_threshold))[0]
+                    if len(candidates):
+                        matched[candidates[np.argmax(ious[row][candidates])]] = True
+                        tp = 1
+                per_class[name]["matches"].append((float(pred_confs[i]), tp))
+
+    report = {"per_class": {}}
+    aps = []
+    total_tp = total_pred = total_gt = 0
+    for name, data in per_class.items():
+        ap = average_precision(data["matches"], data["n_gt"])
+        kept = [tp for conf, tp in data["matches"] if conf >= Config.CONFIDENCE_THRESHOLD]
+        total_tp += sum(kept)
+        total_pred += len(kept)
+        total_gt += data["n_gt"]
+        report["per_class"][name] = {"ap50": ap, "ground_truth": data["n_gt"], "predictions": len(data["matches"])}
+        if ap is not None:
+            aps.append(ap)
+
+    report["map50"] = float(np.mean(aps)) if aps else 0.0
+    report["precision"] = total_tp / total_pred if total_pred else 0.0
+    report["recall"] = total_tp / total_gt if total_gt else 0.0
+    return report
+
+
+def run_mode(detector, images, batch_size):
+    start = time.perf_counter()
+    predictions = detector.detect_arrays_batch(images, batch_size)
+    elapsed = time.perf_counter() - start
+    return predictions, {"seconds": elapsed, "images_per_sec": len(images) / max(elapsed, 1e-9)}
+
+
+def run(image_dir, data_yaml, fast_type, heavy_type, low_conf, high_conf, limit, batch_size):
+    with open(data_yaml) as f:
+        names = yaml.safe_load(f)["names"]
+    paths = list_images(image_dir)[:limit]
+    if not paths:
+        raise SystemExit(f"❌ Görsel bulunamadı: {image_dir}")
+
+    # Decode süresi karşılaştırmaya girmesin diye görseller önceden çözülür
+    images = [AnalysisImage.from_file(path) for path in paths]
+    ground_truth = [load_ground_truth(path, img.width, img.height, names) for path, img in zip(paths, images)]
+    print(f"🚀 Cascade benchmark: {len(images)} görsel, {fast_type} -> {heavy_type}")
+
+    fast = ObjectDetector(ModelLoader.load_model(fast_type), "YOLO11" if "YOLO" in fast_type else fast_type)
+    heavy = ObjectDetector(ModelLoader.load_model(heavy_type), "YOLO11" if "YOLO" in heavy_type else heavy_type)
+    cascade = CascadeDetector(fast, heavy, low_conf, high_conf)
+
+    for detector in (fast, heavy):
+        detector.detect_arrays_batch(images[:batch_size], batch_size)  # warmup
+
+    report = {
+        "images": len(images),
+        "fast_model": fast_type,
+        "heavy_model": heavy_type,
+        "thresholds": {"low_conf": cascade.low_conf, "high_conf": cascade.high_conf},
+        "modes": {}
+    }
+    for mode, detector in (("fast", fast), ("heavy", heavy), ("cascade", cascade)):
+        predictions, timing = run_mode(detector, images, batch_size)
+        report["modes"][mode] = dict(timing, **evaluate(predictions, ground_truth, names))
+        print(f"   {mode}: {timing['images_per_sec']:.2f} img/s, mAP50 {report['modes'][mode]['map50']:.3f}")
+
+    report["modes"]["cascade"]["escalation"] = cascade.stats()
+    heavy_mode, cascade_mode = report["modes"]["heavy"], report["modes"]["cascade"]
+    report["throughput_gain_vs_heavy"] = cascade_mode["images_per_sec"] / max(heavy_mode["images_per_sec"], 1e-9)
+    report["map50_drop_vs_heavy"] = heavy_mode["map50"] - cascade_mode["map50"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade (hızlı -> ağır model) throughput/doğruluk karşılaştırması")
+    parser.add_argument("--images", default="PC/valid/images")
+    parser.add_argument("--data", default="PC/data.yaml")
+    parser.add_argument("--fast", default=Config.CASCADE_FAST_MODEL, choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--heavy", default=Config.CASCADE_HEAVY_MODEL, choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--low", type=float, default=Config.CASCADE_LOW_CONF)
+    parser.add_argument("--high", type=float, default=Config.CASCADE_HIGH_CONF)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=Config.BATCH_SIZE)
+    parser.add_argument("--output", default=os.path.join("cache", "cascade_results.json"))
+    args = parser.parse_args()
+
+    report = run(args.images, args.data, args.fast, args.heavy, args.low, args.high, args.limit, args.batch_size)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Sonuçlar yazıldı: {args.output} (escalation rate "
+          f"{report['modes']['cascade']['escalation']['escalation_rate']:.1%}, "
+          f"throughput x{report['throughput_gain_vs_heavy']:.2f}, mAP50 farkı {report['map50_drop_vs_heavy']:+.3f})")
+
+
+if __name__ == "__main__":
+    main()
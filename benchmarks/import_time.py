@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Giriş noktası -> import edildiğinde yüklenmemesi gereken ağır paketler
+ENTRY_POINTS = {
+    "app": ("torch", "transformers", "ultralytics", "mlflow"),
+    "batch_analyze": ("torch", "transformers", "ultralytics", "mlflow"),
+    "bulk_process": ("torch", "transformers", "ultralytics", "mlflow", "cv2"),
+    "serving.server": ("torch", "transformers", "ultralytics", "mlflow"),
+    "models.registry": ("torch", "transformers", "ultralytics"),
+    "tracking.mlflow_tracker": ("mlflow",),
+}
+
+
+def parse_importtime(stderr):
+    """`-X importtime` çıktısını [(self_us, cumulative_us, derinlik, modül)] listesine çevirir"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def measure(module):
+    """Modülü temiz bir yorumlayıcıda import edip süreleri ölçer"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import edilemedi:\n{result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def summarize(module, rows, top=10):
+    """Toplam süre, üst seviye pakete göre self süreleri ve yüklenen ağır paketler"""
+    total = next((cum for _, cum, depth, name in rows if depth == 0 and name == module), sum(r[0] for r in rows))
+    by_package = {}
+    for self_us, _, _, name in rows:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    loaded = {name.split(".")[0] for *_, name in rows}
+    return {
+        "total_ms": total / 1000,
+        "modules": len(rows),
+        "top_packages_ms": {
+            package: us / 1000 for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+        "heavy_loaded": sorted(loaded & set(ENTRY_POINTS[module])) if module in ENTRY_POINTS else sorted(loaded)
+    }
+
+
+def run(modules, repeat):
+    report = {}
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        summaries = [summarize(module, rows) for rows in runs]
+        # Gürültüyü azaltmak için toplam süresi medyan olan çalıştırma raporlanır
+        summaries.sort(key=lambda s: s["total_ms"])
+        report[module] = dict(summaries[len(summaries) // 2], total_ms_runs=[s["total_ms"] for s in summaries])
+        report[module]["total_ms_median"] = statistics.median(report[module]["total_ms_runs"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Giriş noktalarının import süresi raporu ve lazy-import kontrolü")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, help="Bir giriş noktası için en fazla medyan import süresi")
+    parser.add_argument("--check", action="store_true", help="Ağır paket yüklenirse veya bütçe aşılırsa 1 ile çık")
+    parser.add_argument("--output", help="JSON raporunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    failures = []
+    report = {}
+    for module in args.modules:
+        try:
+            report.update(run([module], args.repeat))
+        except RuntimeError as e:
+            failures.append(str(e))
+    for module, summary in report.items():
+        heavy = summary["heavy_loaded"] if module in ENTRY_POINTS else []
+        status = "❌" if heavy or (args.budget_ms and summary["total_ms_median"] > args.budget_ms) else "✅"
+        print(f"{status} {module}: {summary['total_ms_median']:.0f} ms, {summary['modules']} modül")
+        for package, ms in list(summary["top_packages_ms"].items())[:5]:
+            print(f"     {package:<20} {ms:8.1f} ms")
+        if heavy:
+            failures.append(f"{module} import sırasında ağır paket yüklüyor: {', '.join(heavy)}")
+        if args.budget_ms and summary["total_ms_median"] > args.budget_ms:
+            failures.append(f"{module} {summary['total_ms_median']:.0f} ms > bütçe {args.budget_ms:.0f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if args.check and failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from utils.image_files import list_images
+
+
+def memory_usage():
+    """Peak RSS ile /proc/self/smaps_rollup'tan anlık RSS ve PSS (paylaşılan sayfalar süreç sayısına bölünür)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    usage = {"peak_rss_mb": peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                if key in ("Rss", "Pss", "Shared_Clean", "Private_Dirty"):
+                    usage[f"{key.lower()}_mb"] = int(value.split()[0]) / 1024
+    except OSError:
+        pass  # Linux dışı sistemlerde yalnızca peak RSS raporlanır
+    return usage
+
+
+def _worker(model_type, precision, mmap_weights, image_path, barrier, results):
+    """Modeli yükler, bir çıkarım yapar ve tüm işçiler ayaktayken belleği ölçer"""
+    from models.model_loader import ModelLoader
+    from models.detector import ObjectDetector
+    from utils.analysis_image import AnalysisImage
+
+    Config.MODEL_MMAP_WEIGHTS = mmap_weights
+    try:
+        start = time.perf_counter()
+        model = ModelLoader.load_model(model_type, device="cpu", dtype=precision)
+        if model is None:
+            raise RuntimeError(f"{model_type} yüklenemedi")
+        load_s = time.perf_counter() - start
+
+        image = AnalysisImage.from_file(image_path)
+        start = time.perf_counter()
+        if model_type == "BLIP":
+            model.generate_ai_caption(image, preset="greedy")
+        else:
+            ObjectDetector(model, "YOLO11" if "YOLO" in model_type else model_type).detect(image)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        barrier.wait()
+    except Exception as e:
+        barrier.abort()
+        results.put({"error": str(e)})
+        return
+
+    results.put(dict(memory_usage(), load_s=load_s, latency_ms=latency_ms))
+    try:
+        # Diğer işçiler ölçüm yapana kadar model bellekte kalır
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+
+
+def measure(model_type, precision, mmap_weights, workers, image_path):
+    """Aynı yapılandırmayı yükleyen `workers` adet temiz süreç başlatır ve bellek özetini döndürür"""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers, timeout=600)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(model_type, precision, mmap_weights, image_path, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = []
+    while len(samples) < workers:
+        try:
+            samples.append(results.get(timeout=1))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                # Örn. bellek yetersizliğinden öldürülen işçi sonuç bırakmaz
+                samples.append({"error": "işçi süreç beklenmedik şekilde sonlandı"})
+    for process in processes:
+        process.join()
+
+    errors = [s["error"] for s in samples if "error" in s]
+    report = {"model": model_type, "precision": precision, "mmap": mmap_weights, "workers": workers}
+    if errors:
+        # Bariyeri bozulan işçilerin hata mesajı boştur; asıl hata ilk dolu mesajdır
+        return dict(report, error=next((e for e in errors if e), "işçi senkronizasyonu bozuldu"))
+    return dict(
+        report,
+        load_s=max(s["load_s"] for s in samples),
+        latency_ms=sum(s["latency_ms"] for s in samples) / len(samples),
+        peak_rss_mb=max(s["peak_rss_mb"] for s in samples),
+        rss_mb_total=sum(s.get("rss_mb", s["peak_rss_mb"]) for s in samples),
+        pss_mb_total=sum(s["pss_mb"] for s in samples) if all("pss_mb" in s for s in samples) else None
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hassasiyet / mmap / süreç sayısına göre peak RSS ve PSS karşılaştırması")
+    parser.add_argument("--models", nargs="+", default=["BLIP", "DETR"], choices=["BLIP", "DETR"])
+    parser.add_argument("--precisions", nargs="+", default=["float32", "bfloat16", "int8"])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("--images", default="PC/valid/images")
+    parser.add_argument("--output", default=os.path.join("cache", "memory_results.json"))
+    args = parser.parse_args()
+
+    images = list_images(args.images)
+    if not images:
+        raise SystemExit(f"❌ Görsel bulunamadı: {args.images}")
+
+    configs = []
+    for model_type in args.models:
+        for precision in args.precisions:
+            # mmap yalnızca dosyadaki dtype'la yüklenen (float32) ağırlıklarda paylaşım sağlar
+            for mmap_weights in ([False, True] if precision == "float32" else [False]):
+                for workers in args.workers:
+                    configs.append((model_type, precision, mmap_weights, workers))
+
+    print(f"🚀 Bellek benchmark'ı: {len(configs)} yapılandırma")
+    print(f"   {'model':<6} {'precision':<9} {'mmap':<5} {'proc':>4} {'peak RSS':>10} {'toplam RSS':>11} {'toplam PSS':>11} {'gecikme':>9}")
+    report = []
+    for config in configs:
+        result = measure(*config, images[0])
+        report.append(result)
+        model_type, precision, mmap_weights, workers = config
+        if "error" in result:
+            print(f"❌ {model_type} {precision} mmap={mmap_weights} x{workers}: {result['error']}")
+            continue
+        pss = f"{result['pss_mb_total']:.0f} MB" if result["pss_mb_total"] is not None else "-"
+        print(f"   {model_type:<6} {precision:<9} {str(mmap_weights):<5} {workers:>4} {result['peak_rss_mb']:>7.0f} MB "
+              f"{result['rss_mb_total']:>8.0f} MB {pss:>11} {result['latency_ms']:>6.0f} ms")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Sonuçlar yazıldı: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
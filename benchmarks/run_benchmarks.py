@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from models.model_loader import ModelLoader
+from models.detector import ObjectDetector
+from serving.batcher import percentile
+from utils.analysis_image import AnalysisImage
+from utils.visualizer import ResultVisualizer
+from utils.image_files import list_images
+
+SYNTHETIC_SIZES = [(640, 480), (1280, 720), (1920, 1080), (3024, 4032)]
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek RSS değeri (Linux'ta KB, macOS'ta byte döner)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def summarize(samples):
+    """Saniye cinsinden örneklerden ms istatistikleri"""
+    if not samples:
+        return None
+    return {
+        "count": len(samples),
+        "mean_ms": float(np.mean(samples) * 1000),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "max_ms": float(np.max(samples) * 1000)
+    }
+
+
+def synthetic_images(count, seed=0):
+    """Gürültü + basit şekillerden oluşan, farklı çözünürlüklerde tekrarlanabilir görseller"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for i in range(count):
+        width, height = SYNTHETIC_SIZES[i % len(SYNTHETIC_SIZES)]
+        rgb = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+        images.append((f"synthetic_{width}x{height}_{i}", rgb))
+    return images
+
+
+def load_inputs(image_dir, synthetic_count, limit):
+    sources = []
+    if image_dir and os.path.isdir(image_dir):
+        sources.extend((path, path) for path in list_images(image_dir)[:limit])
+    sources.extend(synthetic_images(synthetic_count))
+    return sources
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_cold_load(model_type):
+    model, elapsed = timed(ModelLoader.load_model, model_type)
+    return model, {"seconds": elapsed}
+
+
+def bench_memory(model_type, sources):
+    """Modeli kendi temiz sürecinde yükleyip bir çıkarım yapar ve bellek kullanımını ölçer.
+
+    Bu süreçteki ru_maxrss ömür boyu tepe değeridir; önceki modelleri de içerdiği için model başına kullanılamaz.
+    """
+    from benchmarks.memory_benchmark import measure
+
+    image_path = next((source for _, source in sources if isinstance(source, str)), None)
+    temp_path = None
+    if image_path is None:
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            temp_path = image_path = tmp.name
+        cv2.imwrite(temp_path, cv2.cvtColor(sources[0][1], cv2.COLOR_RGB2BGR))
+    try:
+        result = measure(model_type, None, Config.MODEL_MMAP_WEIGHTS, 1, image_path)
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+    if "error" in result:
+        return {"error": result["error"]}
+    return {"peak_rss_mb": result["peak_rss_mb"], "rss_mb": result["rss_mb_total"], "pss_mb": result["pss_mb_total"]}
+
+
+def bench_stages(model_type, model, sources, caption_gen=None, repeat=1, warmup=1):
+    """Her görsel için decode, preprocess, inference, post-process, caption ve çizim sürelerini ölçer"""
+    effective_type = "YOLO11" if "YOLO" in model_type else model_type
+    detector = ObjectDetector(model, effective_type)
+    stages = {name: [] for name in ("decode", "preprocess", "inference", "postprocess", "caption", "caption_cached", "draw")}
+
+    for run in range(warmup + repeat):
+        record = run >= warmup
+        for _, source in sources:
+            if isinstance(source, np.ndarray):
+                image, t_decode = timed(AnalysisImage, source)
+            else:
+                image, t_decode = timed(AnalysisImage.from_file, source)
+
+            (model_input, scale), t_pre = timed(image.model_input, effective_type)
+
+            if effective_type == "YOLO11":
+                raw, t_inf = timed(model, model_input, verbose=False)
+                detections, t_post = timed(detector._parse_yolo, raw[0])
+            else:
+                # transformers pipeline ön/son işlemeyi kendi içinde yapar; ikisi inference'a dahildir
+                raw, t_inf = timed(model, model_input)
+                detections, t_post = timed(detector._parse_detr, raw)
+            detections = detections.scaled(*scale)
+
+            t_caption = t_caption_cached = None
+            if caption_gen is not None:
+                # Önceki görsellerin/turların ViT çıktıları ölçümü önbellek isabetine çevirmesin
+                caption_gen.clear_embed_cache()
+                _, t_caption = timed(caption_gen.generate_ai_caption, image)
+                _, t_caption_cached = timed(caption_gen.generate_ai_caption, image)
+
+            _, t_draw = timed(ResultVisualizer(detections.names).draw, image, detections)
+
+            if record:
+                stages["decode"].append(t_decode)
+                stages["preprocess"].append(t_pre)
+                stages["inference"].append(t_inf)
+                stages["postprocess"].append(t_post)
+                stages["draw"].append(t_draw)
+                if t_caption is not None:
+                    stages["caption"].append(t_caption)
+                    stages["caption_cached"].append(t_caption_cached)
+
+    return {name: summarize(samples) for name, samples in stages.items()}
+
+
+def bench_caption_presets(caption_gen, sources, presets, limit=8):
+    """Her decoding modu için görsel başına önbelleksiz/önbellekli gecikme ve token/s ölçer.
+
+    Önbelleksiz ölçümde her görselden önce ViT önbelleği boşaltılır; önbellekli ölçüm aynı görselleri
+    ikinci kez işler ve yalnızca decoding maliyetini gösterir.
+    """
+    images = [AnalysisImage(s) if isinstance(s, np.ndarray) else AnalysisImage.from_file(s) for _, s in sources[:limit]]
+    caption_gen.generate_ai_caption(images[0], presets[0])  # warmup
+    results = {}
+
+    def uncached(image, preset):
+        caption_gen.clear_embed_cache()
+        return timed(caption_gen.generate_ai_caption, image, preset)
+
+    for preset in presets:
+        before = caption_gen.decode_stats().get(preset, {"tokens": 0, "seconds": 0.0})
+        captions, uncached_times = zip(*[uncached(image, preset) for image in images])
+        after = caption_gen.decode_stats()[preset]
+        _, cached_elapsed = timed(lambda: [caption_gen.generate_ai_caption(image, preset) for image in images])
+        decode_seconds = after["seconds"] - before["seconds"]
+        results[preset] = {
+            "settings": Config.CAPTION_PRESETS[preset],
+            "uncached": summarize(uncached_times),
+            "cached_mean_ms_per_image": cached_elapsed / max(len(images), 1) * 1000,
+            "tokens": after["tokens"] - before["tokens"],
+            "tokens_per_sec": (after["tokens"] - before["tokens"]) / decode_seconds if decode_seconds else 0.0,
+            "samples": list(captions[:3])
+        }
+        print(f"   BLIP {preset}: {results[preset]['uncached']['mean_ms']:.0f} ms/görsel önbelleksiz, "
+              f"{results[preset]['cached_mean_ms_per_image']:.0f} ms önbellekli, "
+              f"{results[preset]['tokens_per_sec']:.1f} token/s")
+
+    caption_gen.clear_embed_cache()
+
+    return results
+
+
+def bench_throughput(model_type, model, sources, batch_sizes, thread_counts):
+    """Batch boyutu ve thread sayısı kombinasyonları için görsel/s ölçer"""
+    effective_type = "YOLO11" if "YOLO" in model_type else model_type
+    detector = ObjectDetector(model, effective_type)
+    images = [AnalysisImage(s) if isinstance(s, np.ndarray) else AnalysisImage.from_file(s) for _, s in sources]
+    original_threads = torch.get_num_threads()
+    results = []
+
+    try:
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            for batch_size in batch_sizes:
+                detector.detect_arrays_batch(images[:batch_size], batch_size)  # warmup
+                _, elapsed = timed(detector.detect_arrays_batch, images, batch_size)
+                results.append({
+                    "threads": threads,
+                    "batch_size": batch_size,
+                    "images": len(images),
+                    "seconds": elapsed,
+                    "images_per_sec": len(images) / max(elapsed, 1e-9)
+                })
+                print(f"   {model_type} threads={threads} batch={batch_size}: {results[-1]['images_per_sec']:.2f} img/s")
+    finally:
+        torch.set_num_threads(original_threads)
+
+    return results
+
+
+def run(models, image_dir, synthetic_count, limit, batch_sizes, thread_counts, repeat, warmup, with_caption):
+    sources = load_inputs(image_dir, synthetic_count, limit)
+    print(f"🚀 Benchmark: {len(sources)} görsel, modeller: {', '.join(models)}")
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "platform": {"python": platform.python_version(), "machine": platform.machine(),
+                     "cpu_count": os.cpu_count(), "torch": torch.__version__},
+        "config": {"backend": Config.INFERENCE_BACKEND, "img_size": Config.IMG_SIZE,
+                   "caption_preset": Config.CAPTION_PRESET, "num_beams": Config.NUM_BEAMS,
+                   "max_caption_length": Config.MAX_CAPTION_LENGTH,
+                   "caption_embed_cache_size": Config.CAPTION_EMBED_CACHE_SIZE},
+        "images": len(sources),
+        "cold_load": {},
+        "memory": {},
+        "stages": {},
+        "throughput": {},
+        "caption_presets": {}
+    }
+
+    for model_type in models + (["BLIP"] if with_caption else []):
+        print(f"🧠 {model_type}: bellek ayrı süreçte ölçülüyor...")
+        report["memory"][model_type] = bench_memory(model_type, sources)
+
+    caption_gen = None
+    if with_caption:
+        caption_gen, report["cold_load"]["BLIP"] = bench_cold_load("BLIP")
+        print("⏱️ BLIP: decoding modları ölçülüyor...")
+        report["caption_presets"] = bench_caption_presets(caption_gen, sources, list(Config.CAPTION_PRESETS))
+
+    for model_type in models:
+        model, report["cold_load"][model_type] = bench_cold_load(model_type)
+        if model is None:
+            print(f"❌ {model_type} yüklenemedi, atlanıyor")
+            continue
+        print(f"⏱️ {model_type}: aşama süreleri ölçülüyor...")
+        report["stages"][model_type] = bench_stages(model_type, model, sources, caption_gen, repeat, warmup)
+        report["throughput"][model_type] = bench_throughput(model_type, model, sources, batch_sizes, thread_counts)
+        del model
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uçtan uca ve aşama bazlı gecikme/throughput benchmark'ı")
+    parser.add_argument("--models", nargs="+", default=["YOLO11"], choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--images", default="PC/test/images", help="Gerçek görsellerin klasörü")
+    parser.add_argument("--synthetic", type=int, default=4, help="Eklenecek sentetik görsel sayısı")
+    parser.add_argument("--limit", type=int, default=32, help="Klasörden alınacak en fazla görsel")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, max(1, (os.cpu_count() or 2) // 2), os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--no-caption", action="store_true", help="BLIP aşamasını atla")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    report = run(args.models, args.images, args.synthetic, args.limit, args.batch_sizes,
+                 sorted(set(args.threads)), args.repeat, args.warmup, not args.no_caption)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Sonuçlar yazıldı: {args.output} (peak RSS {report['peak_rss_mb']:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
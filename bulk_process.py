@@ -0,0 +1,283 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config.settings import Config
+from utils.image_files import iter_images
+
+# Ana süreç model yığınını import etmez; modeller yalnızca worker'larda yüklenir
+_worker = {}
+
+
+def iter_inputs(source):
+    """Klasörü (her seviyede sıralı os.walk) veya manifest dosyasını (satır başına bir yol) akış halinde okur"""
+    if os.path.isdir(source):
+        yield from iter_images(source)
+    else:
+        with open(source) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+
+def iter_chunks(paths, batch_size):
+    chunk_id, chunk = 0, []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == batch_size:
+            yield chunk_id, chunk
+            chunk_id, chunk = chunk_id + 1, []
+    if chunk:
+        yield chunk_id, chunk
+
+
+def _init_worker(model_type, with_caption, threads):
+    """Her worker süreci modelleri yalnızca bir kez yükler"""
+    import torch
+    from models.model_loader import ModelLoader
+    from models.detector import ObjectDetector
+
+    if threads:
+        torch.set_num_threads(threads)
+    effective_type = "YOLO11" if "YOLO" in model_type else model_type
+    # ModelLoader hata durumunda None döndürür; initializer'da hata verilmezse her chunk hata satırı olarak
+    # "tamamlanır" ve devamda tekrar denenmez. Hata havuzu bozar ve çalıştırma hemen durur.
+    model = ModelLoader.load_model(model_type)
+    if model is None:
+        raise RuntimeError(f"{model_type} yüklenemedi")
+    caption_gen = None
+    if with_caption:
+        caption_gen = ModelLoader.load_model("BLIP")
+        if caption_gen is None:
+            raise RuntimeError("BLIP yüklenemedi")
+    _worker["model_type"] = model_type
+    _worker["detector"] = ObjectDetector(model, effective_type)
+    _worker["caption_gen"] = caption_gen
+
+
+def _process_chunk(chunk_id, paths):
+    from utils.analysis_image import AnalysisImage
+
+    images, records = [], []
+    for path in paths:
+        try:
+            images.append(AnalysisImage.from_file(path))
+            records.append({"image": path, "model": _worker["model_type"]})
+        except Exception as e:
+            records.append({"image": path, "model": _worker["model_type"], "error": str(e)})
+
+    valid = [r for r in records if "error" not in r]
+    detections = _worker["detector"].detect_arrays_batch(images, len(images)) if images else []
+    captions = _worker["caption_gen"].generate_captions_batch(images, len(images)) if images and _worker["caption_gen"] else [None] * len(images)
+    for record, det, caption in zip(valid, detections, captions):
+        record["detections"] = det.to_records() if det is not None else []
+        record["ai_caption"] = caption
+
+    return chunk_id, records
+
+
+class JsonlSink:
+    """JSONL çıktısı; checkpoint'te byte ofseti saklanır, devamda sonrası kesilir"""
+    def __init__(self, path, state=None, overwrite=False):
+        self.path = path
+        if state is None and not overwrite and os.path.exists(path) and os.path.getsize(path):
+            raise FileExistsError(f"{path} zaten var ve checkpoint'i yok; üzerine yazmak için --overwrite kullanın")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'ab')
+        offset = (state or {}).get("offset", 0)
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def write(self, records):
+        self._file.write(b"".join((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records))
+
+    def commit(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"offset": self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """Checkpoint aralığı başına bir part dosyası yazan Parquet çıktısı (pyarrow gerekir)"""
+    PART_PATTERN = re.compile(r"part-\d{6}\.parquet(\.tmp)?")
+
+    def __init__(self, directory, state=None, overwrite=False):
+        import pyarrow  # noqa: F401 (eksikse erken hata)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.parts = list((state or {}).get("parts", []))
+        # Yalnızca bu sink'in adlandırdığı part dosyalarına dokunulur; klasördeki diğer dosyalar korunur
+        stale = [name for name in os.listdir(directory)
+                 if self.PART_PATTERN.fullmatch(name) and name not in self.parts]
+        if state is None and not overwrite and any(name.endswith(".parquet") for name in stale):
+            raise FileExistsError(f"{directory} içinde checkpoint'i olmayan part dosyaları var; "
+                                  f"üzerine yazmak için --overwrite kullanın")
+        # Devamda: son checkpoint'ten sonra yazılmış yarım partlar atılır
+        for name in stale:
+            os.remove(os.path.join(directory, name))
+        self._buffer = []
+
+    def write(self, records):
+        for record in records:
+            row = dict(record)
+            row["detections"] = json.dumps(row.get("detections", []), ensure_ascii=False)
+            self._buffer.append(row)
+
+    def commit(self):
+        if self._buffer:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            name = f"part-{len(self.parts):06d}.parquet"
+            columns = ("image", "model", "detections", "ai_caption", "error")
+            table = pa.table({c: [row.get(c) for row in self._buffer] for c in columns})
+            tmp = os.path.join(self.directory, name + ".tmp")
+            pq.write_table(table, tmp)
+            os.replace(tmp, os.path.join(self.directory, name))
+            self.parts.append(name)
+            self._buffer = []
+        return {"parts": list(self.parts)}
+
+    def close(self):
+        pass
+
+
+class Checkpoint:
+    """Tamamlanan chunk'ları (watermark + üstündeki küme) ve çıktı durumunu atomik olarak saklar"""
+    def __init__(self, path, batch_size):
+        self.path = path
+        self.batch_size = batch_size
+        self.watermark = 0
+        self.done = set()
+        self.processed = 0
+        self.sink_state = None
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            # Chunk sınırları (ve watermark) batch boyutuna bağlıdır; farklı boyutla devam yanlış chunk'ları atlar
+            saved = data.get("batch_size")
+            if saved is not None and saved != batch_size:
+                raise ValueError(f"Checkpoint batch boyutu {saved} ile yazılmış, bu çalıştırma {batch_size}; "
+                                 f"--batch-size {saved} ile devam edin veya --overwrite kullanın")
+            self.watermark = data["watermark"]
+            self.done = set(data["done"])
+            self.processed = data["processed"]
+            self.sink_state = data["sink"]
+
+    def is_done(self, chunk_id):
+        return chunk_id < self.watermark or chunk_id in self.done
+
+    def mark(self, chunk_id, count):
+        self.done.add(chunk_id)
+        self.processed += count
+        while self.watermark in self.done:
+            self.done.discard(self.watermark)
+            self.watermark += 1
+
+    def save(self, sink_state):
+        self.sink_state = sink_state
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"batch_size": self.batch_size, "watermark": self.watermark, "done": sorted(self.done),
+                       "processed": self.processed, "sink": sink_state}, f)
+        os.replace(tmp, self.path)
+
+
+def run(source, output, model_type="YOLO11", output_format="jsonl", workers=None, batch_size=None,
+        with_captions=True, max_in_flight=None, checkpoint_every=None, overwrite=False):
+    """Girdileri süreç havuzuna dağıtır, sonuçları akış halinde yazar ve periyodik checkpoint alır"""
+    workers = workers or Config.BULK_WORKERS or max(1, (os.cpu_count() or 2) // 2)
+    batch_size = batch_size or Config.BATCH_SIZE
+    max_in_flight = max_in_flight or workers * 2
+    checkpoint_every = checkpoint_every or Config.BULK_CHECKPOINT_EVERY
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    checkpoint_path = output.rstrip("/") + ".checkpoint.json"
+    if overwrite and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path, batch_size)
+    sink = (ParquetSink if output_format == "parquet" else JsonlSink)(output, checkpoint.sink_state, overwrite)
+    if checkpoint.processed:
+        print(f"↩️ Devam ediliyor: {checkpoint.processed} görsel zaten işlenmiş")
+
+    print(f"🚀 {workers} worker, batch {batch_size}, en fazla {max_in_flight} chunk havada")
+    start = time.time()
+    processed_now = 0
+    since_checkpoint = 0
+    pending = {}  # future -> (chunk_id, paths)
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_type, with_captions, threads)) as pool:
+        def drain(block_until):
+            nonlocal processed_now, since_checkpoint
+            while len(pending) > block_until:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_id, paths = pending.pop(future)
+                    try:
+                        _, records = future.result()
+                    except BrokenProcessPool:
+                        # Havuz kullanılamaz; işaretlenmemiş chunk'lar devamda yeniden işlenir
+                        raise
+                    except Exception as e:
+                        print(f"   ⚠️ chunk {chunk_id} başarısız: {e}")
+                        records = [{"image": path, "model": model_type, "error": str(e)} for path in paths]
+                    sink.write(records)
+                    checkpoint.mark(chunk_id, len(records))
+                    processed_now += len(records)
+                    since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    checkpoint.save(sink.commit())
+                    since_checkpoint = 0
+                    rate = processed_now / max(time.time() - start, 1e-9)
+                    print(f"   💾 checkpoint: toplam {checkpoint.processed} görsel ({rate:.1f} görsel/s)")
+
+        try:
+            for chunk_id, paths in iter_chunks(iter_inputs(source), batch_size):
+                if checkpoint.is_done(chunk_id):
+                    continue
+                # Havadaki chunk sayısı sınırlanır; bellek girdi sayısından bağımsız kalır
+                drain(max_in_flight - 1)
+                pending[pool.submit(_process_chunk, chunk_id, paths)] = (chunk_id, paths)
+            drain(0)
+        finally:
+            checkpoint.save(sink.commit())
+            sink.close()
+
+    elapsed = time.time() - start
+    print(f"✅ Tamamlandı: bu çalıştırmada {processed_now} görsel, {elapsed:.1f}s "
+          f"({processed_now / max(elapsed, 1e-9):.1f} görsel/s), toplam {checkpoint.processed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok süreçli, kaldığı yerden devam edebilen toplu görsel işleme")
+    parser.add_argument("source", help="Görsel klasörü veya satır başına bir yol içeren manifest dosyası")
+    parser.add_argument("output", help="JSONL dosyası veya Parquet klasörü")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--model", default="YOLO11", choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--batch-size", type=int, default=Config.BATCH_SIZE)
+    parser.add_argument("--max-in-flight", type=int, help="Aynı anda işlenen en fazla chunk (varsayılan: 2 x worker)")
+    parser.add_argument("--checkpoint-every", type=int, help="Kaç chunk'ta bir checkpoint alınacağı")
+    parser.add_argument("--no-caption", action="store_true")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Checkpoint'i olmayan mevcut çıktıyı (ve varsa checkpoint'i) silip baştan başla")
+    args = parser.parse_args()
+
+    try:
+        run(args.source, args.output, args.model, args.format, args.workers, args.batch_size,
+            not args.no_caption, args.max_in_flight, args.checkpoint_every, args.overwrite)
+    except (FileExistsError, ValueError) as e:
+        raise SystemExit(f"❌ {e}")
+    except BrokenProcessPool:
+        raise SystemExit("❌ Worker havuzu çöktü (model yüklenemedi mi?); checkpoint korundu, sorunu giderip tekrar çalıştırın")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
-import torch
-from transformers import BlipProcessor, BlipForConditionalGeneration
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 from PIL import Image
-import cv2
 from config.settings import Config
+from utils.analysis_image import AnalysisImage
+from utils.telemetry import get_telemetry
+from models.artifacts import get_artifact_manager
+from models.weights import resolve_precision, torch_dtype, load_pretrained, apply_precision
+
+CAPTION_ERROR = "Unable to generate caption for this image."
 
 class CaptionGenerator:
-    def __init__(self):
-        if torch.backends.mps.is_available():
+    def __init__(self, device=None, dtype=None, backend=None, quantize=None):
+        # torch/transformers yalnızca caption üreteci ilk kez oluşturulduğunda import edilir
+        import torch
+
+        if device:
+            self.device = device
+        elif torch.backends.mps.is_available():
             self.device = "mps"
         elif torch.cuda.is_available():
             self.device = "cuda"
@@ -16,20 +29,39 @@ class CaptionGenerator:
         print(f"✅ CaptionGenerator aygıt olarak şunu kullanacak: {self.device}") 
 
 
+        self.dtype = dtype
+        self.precision = None
+        self.compute_dtype = None
+        self.backend = backend or Config.INFERENCE_BACKEND
+        self.quantize = quantize
         self.processor = None
         self.model = None
+        self._embed_cache = OrderedDict()
+        self._embed_lock = threading.Lock()
+        self._decode_stats = {}
+        self._stats_lock = threading.Lock()
         self.load_model()
     
     def load_model(self):
         """BLIP model load karta hai"""
+        from transformers import BlipProcessor, BlipForConditionalGeneration
+
         try:
             print("📥 Loading BLIP model for captioning...")
-            self.processor = BlipProcessor.from_pretrained(Config.BLIP_MODEL)
+            model_source = get_artifact_manager().resolve(Config.BLIP_MODEL)
+            self.processor = BlipProcessor.from_pretrained(model_source)
             
-            self.model = BlipForConditionalGeneration.from_pretrained(
-                Config.BLIP_MODEL,
-                torch_dtype=torch.float16 if self.device != "cpu" else torch.float32 # <-- DEĞİŞİKLİK (self.device == "cuda" yerine self.device != "cpu")
-            ).to(self.device)
+            self.precision = resolve_precision("BLIP", self.device, self.dtype)
+            self.compute_dtype = torch_dtype(self.precision)
+            model = load_pretrained(BlipForConditionalGeneration, model_source, self.precision)
+            self.model = apply_precision(model, self.precision).to(self.device)
+            print(f"   Hassasiyet: {self.precision}")
+
+            if self.backend == "onnx":
+                # ViT encoder ONNX Runtime'da, metin decoder'ı ve beam search PyTorch'ta çalışır
+                from models.export import ensure_exported
+                from models.onnx_backends import OnnxVisionEncoder
+                self.model.vision_model = OnnxVisionEncoder(ensure_exported("BLIP", quantize=self.quantize))
         
             
             print("✅ BLIP model loaded successfully!")
@@ -37,28 +69,152 @@ class CaptionGenerator:
             print(f"❌ BLIP model loading failed: {e}")
             raise e
     
-    def generate_ai_caption(self, image_path):
-        """AI se creative caption generate karta hai"""
+    def generation_kwargs(self, preset=None):
+        """Decoding modunun generate() parametrelerini döndürür (greedy, small_beam, beam_capped, quality)"""
+        preset = preset or Config.CAPTION_PRESET
+        if preset not in Config.CAPTION_PRESETS:
+            raise ValueError(f"Bilinmeyen caption modu: {preset}")
+        # KV-cache açık: her adımda yalnızca yeni token için attention hesaplanır
+        return dict(Config.CAPTION_PRESETS[preset], use_cache=True)
+
+    def generate_ai_caption(self, image_path, preset=None, stats=None):
+        """AI se creative caption generate karta hai; stats sözlüğü verilirse bu çağrının token/süre değerleri yazılır"""
         try:
-            pil_image = Image.open(image_path).convert('RGB')
-            
-            inputs = self.processor(pil_image, return_tensors="pt").to(self.device)
-           
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=Config.MAX_CAPTION_LENGTH,
-                    num_beams=Config.NUM_BEAMS,
-                    early_stopping=True
-                )
-           
-            
-            caption = self.processor.decode(outputs[0], skip_special_tokens=True)
-            return caption
-            
+            captions, decode = self._caption([image_path], preset, "caption")
+            if stats is not None:
+                stats.update(decode)
+            return captions[0]
         except Exception as e:
             print(f"❌ Caption generation error: {e}")
-            return "Unable to generate caption for this image."
+            return CAPTION_ERROR
+    
+    def generate_captions_batch(self, images, batch_size=None, preset=None):
+        """Birden fazla görsel için caption'ları batch'ler halinde tek generate çağrısıyla üretir"""
+        batch_size = batch_size or Config.BATCH_SIZE
+        images = list(images)
+        captions = []
+
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            try:
+                captions.extend(self._caption(chunk, preset, "caption_batch")[0])
+            except Exception as e:
+                print(f"❌ Batch caption generation error: {e}")
+                captions.extend(CAPTION_ERROR for _ in chunk)
+
+        return captions
+
+    def _caption(self, images, preset, stage):
+        import torch
+
+        preset = preset or Config.CAPTION_PRESET
+        generate_kwargs = self.generation_kwargs(preset)
+        telemetry = get_telemetry()
+        image_embeds = self._image_embeds(images)
+
+        start = time.perf_counter()
+        with telemetry.stage(stage, model="BLIP", preset=preset), torch.no_grad():
+            outputs = self._decode(image_embeds, generate_kwargs)
+        elapsed = time.perf_counter() - start
+
+        # BOS ve pad token'ları sayılmaz
+        tokens = int((outputs != self.model.config.text_config.pad_token_id).sum()) - len(images)
+        telemetry.inc("images", len(images), model="BLIP")
+        telemetry.inc("tokens_generated", tokens, model="BLIP", preset=preset)
+        with self._stats_lock:
+            stats = self._decode_stats.setdefault(preset, {"captions": 0, "tokens": 0, "seconds": 0.0})
+            stats["captions"] += len(images)
+            stats["tokens"] += tokens
+            stats["seconds"] += elapsed
+        decode = {"tokens": tokens, "seconds": elapsed, "tokens_per_sec": tokens / elapsed if elapsed else 0.0}
+        return self.processor.batch_decode(outputs, skip_special_tokens=True), decode
+
+    def _image_embeds(self, images):
+        """ViT çıktılarını döndürür; önbellekteki görseller için vision encoder tekrar çalıştırılmaz"""
+        import torch
+
+        telemetry = get_telemetry()
+        with telemetry.stage("caption_preprocess", model="BLIP"):
+            pil_images = [self._to_pil(img) for img in images]
+            keys = [self._embed_key(img, pil) for img, pil in zip(images, pil_images)]
+
+        embeds = [None] * len(images)
+        with self._embed_lock:
+            for i, key in enumerate(keys):
+                if key is not None and key in self._embed_cache:
+                    self._embed_cache.move_to_end(key)
+                    embeds[i] = self._embed_cache[key]
+        missing = [i for i, embed in enumerate(embeds) if embed is None]
+        telemetry.inc("caption_embed_hits", len(images) - len(missing), model="BLIP")
+
+        if missing:
+            with telemetry.stage("caption_preprocess", model="BLIP"):
+                inputs = self.processor([pil_images[i] for i in missing], return_tensors="pt").to(self.device)
+            with telemetry.stage("caption_vision", model="BLIP"), torch.no_grad():
+                pixel_values = inputs["pixel_values"].to(self.compute_dtype)
+                computed = self.model.vision_model(pixel_values=pixel_values)[0]
+            with self._embed_lock:
+                for i, embed in zip(missing, computed):
+                    embeds[i] = embed
+                    if keys[i] is not None:
+                        # Kopya: önbellek tüm batch tensörünü canlı tutmaz
+                        self._embed_cache[keys[i]] = embed.clone()
+                while len(self._embed_cache) > Config.CAPTION_EMBED_CACHE_SIZE:
+                    self._embed_cache.popitem(last=False)
+
+        return torch.stack(embeds)
+
+    @staticmethod
+    def _embed_key(image, pil_image):
+        if not Config.CAPTION_EMBED_CACHE_SIZE:
+            return None
+        key = lambda: hashlib.sha256(pil_image.tobytes()).hexdigest()
+        if isinstance(image, AnalysisImage):
+            return image.memo('blip_embed_key', key)
+        return key()
+
+    def _decode(self, image_embeds, generate_kwargs):
+        import torch
+
+        # BlipForConditionalGeneration.generate ile aynı adımlar, ancak hazır ViT çıktısı üzerinden
+        text_config = self.model.config.text_config
+        input_ids = torch.full(
+            (image_embeds.shape[0], 1), text_config.bos_token_id, dtype=torch.long, device=image_embeds.device
+        )
+        return self.model.text_decoder.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            eos_token_id=text_config.sep_token_id,
+            pad_token_id=text_config.pad_token_id,
+            encoder_hidden_states=image_embeds,
+            encoder_attention_mask=torch.ones(image_embeds.shape[:-1], dtype=torch.long, device=image_embeds.device),
+            **generate_kwargs
+        )
+
+    def clear_embed_cache(self):
+        """ViT çıktı önbelleğini boşaltır (örn. benchmark'ta önbelleksiz gecikmeyi ölçmek için)"""
+        with self._embed_lock:
+            self._embed_cache.clear()
+
+    def decode_stats(self):
+        """Decoding modu başına üretilen token ve token/saniye değerlerini döndürür"""
+        with self._stats_lock:
+            return {
+                preset: dict(stats, tokens_per_sec=stats["tokens"] / stats["seconds"] if stats["seconds"] else 0.0)
+                for preset, stats in self._decode_stats.items()
+            }
+
+    @staticmethod
+    def _to_pil(image):
+        """AnalysisImage, dosya yolu, dosya nesnesi, numpy (RGB) veya PIL girdisini RGB PIL'e çevirir"""
+        if isinstance(image, AnalysisImage):
+            # İşlemcinin kendi yeniden boyutlandırmasıyla aynı bicubic 384x384 varyant
+            return image.model_input("BLIP")[0]
+        if isinstance(image, Image.Image):
+            return image.convert('RGB')
+        if hasattr(image, 'shape'):
+            return Image.fromarray(image).convert('RGB')
+        return Image.open(image).convert('RGB')
     
     def generate_simple_caption(self, boxes, confs, class_ids, classes):
         """Detected objects se simple caption banata hai"""
@@ -77,4 +233,15 @@ class CaptionGenerator:
             else:
                 caption_parts.append(f"{count} {obj}s")
         
+        return "Image contains " + ", ".join(caption_parts)
+
+    def caption_from_detections(self, detections):
+        """Detections nesnesinden sınıf sayımlarını tek seferde alarak basit caption üretir"""
+        if len(detections) == 0:
+            return "No objects detected in the image"
+        
+        caption_parts = [
+            f"a {obj}" if count == 1 else f"{count} {obj}s"
+            for obj, count in detections.counts().items()
+        ]
         return "Image contains " + ", ".join(caption_parts)
\ No newline at end of file
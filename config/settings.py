@@ -1,5 +1,6 @@
 class Config:
     YOLO11_MODEL_PATH = "yolo11n.pt" 
+    PC_MODEL_PATH = "models/yolo11_pc.pt"
     DETR_MODEL_NAME = "facebook/detr-resnet-50"
     
     YOLO_WEIGHTS = 'models/yolov3.weights'
@@ -13,11 +14,116 @@ class Config:
     BLIP_MODEL = 'Salesforce/blip-image-captioning-base'
     MAX_CAPTION_LENGTH = 50
     NUM_BEAMS = 5
+    CAPTION_PRESET = 'quality'  # istek başına değiştirilebilir varsayılan decoding modu
+    CAPTION_PRESETS = {
+        'greedy': {'num_beams': 1, 'max_length': 30},
+        'small_beam': {'num_beams': 2, 'max_length': 30, 'early_stopping': True},
+        'beam_capped': {'num_beams': NUM_BEAMS, 'max_length': 20, 'early_stopping': True},
+        'quality': {'num_beams': NUM_BEAMS, 'max_length': MAX_CAPTION_LENGTH, 'early_stopping': True},
+    }
+    CAPTION_EMBED_CACHE_SIZE = 32  # görsel başına ViT çıktısı; 0 ise kapalı
+    
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_MAX_ITEMS = 256
+    RESULT_CACHE_DISK_PATH = 'cache/results.sqlite'  # None ise yalnızca bellek katmanı
+    RESULT_CACHE_DISK_MAX_MB = 512
     
     EXPERIMENT_NAME = 'Object_Detection_Analysis'
+    TRACKING_ASYNC = True
+    TRACKING_QUEUE_SIZE = 1000
+    TRACKING_HIGH_WATERMARK = 0.75  # kuyruk bu orana ulaşınca run'lar örneklenir
+    TRACKING_SAMPLE_RATE = 0.1
+    TRACKING_FLUSH_INTERVAL_S = 1.0
+
+    METRICS_PORT = None  # örn: 9108, Streamlit sürecinde Prometheus /metrics uç noktası açar
+    PROFILER = None  # None, 'cprofile' veya 'torch'
+    PROFILE_DIR = 'profiles'
+
+    INFERENCE_BACKEND = 'pytorch'  # 'pytorch' veya 'onnx' (CPU için ONNX Runtime)
+    ONNX_QUANTIZE_INT8 = False
+
+    ENSEMBLE_METHOD = 'wbf'  # 'wbf' (weighted box fusion) veya 'nms'
+    ENSEMBLE_IOU_THRESHOLD = 0.55
+    ENSEMBLE_WEIGHTS = {"MY YOLO (PC Setup)": 2.0}  # modele göre güven ağırlığı, varsayılan 1.0
+    ENSEMBLE_MIN_CONF = 0.3
+    ENSEMBLE_WORKERS = None  # üyeleri paralel çalıştıran süreç geneli havuz; None ise üye sayısı
+    CLASS_ALIASES = {'tv': 'monitor', 'tvmonitor': 'monitor'}  # COCO adı -> PC/data.yaml adı
+
+    CASCADE_FAST_MODEL = "YOLO11"
+    CASCADE_HEAVY_MODEL = "MY YOLO (PC Setup)"  # veya "DETR"
+    CASCADE_LOW_CONF = 0.3  # [LOW, HIGH) aralığında tespit varsa ağır modele yükseltilir
+    CASCADE_HIGH_CONF = 0.6
+    CASCADE_ESCALATE_ON_EMPTY = True
+    CASCADE_MERGE = True  # hızlı modelin kesin tespitleri ağır modelin sonucuyla birleştirilir
 
     IMG_SIZE = 640
+
+    TILED_INFERENCE = False  # büyük görselleri örtüşen karolarla tespit et
+    TILE_SIZE = 640
+    TILE_OVERLAP = 0.2
+    TILE_MIN_SIDE = 1280  # uzun kenarı bundan küçük görseller karolanmaz
+    TILE_INCLUDE_FULL = True  # büyük nesneler için küçültülmüş tam görsel de eklenir
+    TILE_MERGE_IOS = 0.5  # farklı karolardaki kutuların küçüğünün bu oranı örtüşüyorsa aynı nesne sayılır
+    BATCH_SIZE = 8
+    MAX_BATCH_WAIT_MS = 10
+
+    ANALYSIS_PARALLEL = True
+    # Aşama havuzu süreç geneldir ve tüm oturumlarca paylaşılır: 2 işçiyle bir analizin iki aşaması paralel koşar,
+    # eşzamanlı analizler sıraya girer. Artırmak eşzamanlılığı artırır ama çekirdekleri daha çok böler.
+    ANALYSIS_WORKERS = 2
+    ANALYSIS_TORCH_THREADS = None  # torch intra-op thread sayısı (süreç geneli, bir kez); None ise çekirdek / ANALYSIS_WORKERS
+
+    VIDEO_TARGET_FPS = 5
+    VIDEO_QUEUE_SIZE = 4
+    SCENE_CHANGE_THRESHOLD = 0.15  # küçük gri karelerde ortalama mutlak fark (0-1)
+    VIDEO_MAX_FRAMES = 900  # Streamlit'te kamera/RTSP oturumu başına en fazla kare
+    VIDEO_TRACKING = True  # atlanan karelerde kutular son iki tespitten kestirilen sabit hızla ilerletilir
+    VIDEO_TRACK_IOU = 0.3  # ardışık tespitlerde aynı nesne sayılmak için en düşük IoU
+    VIDEO_TRACK_MAX_GAP_S = 1.0  # bundan uzun aralıkta hız kestirilmez, kutular yerinde kalır
+
+    BULK_WORKERS = None  # None ise çekirdek sayısının yarısı
+    BULK_CHECKPOINT_EVERY = 50  # chunk
+
+    TRAIN_DATA = 'PC/data.yaml'
+    TRAIN_BASE_MODEL = YOLO11_MODEL_PATH  # sıfırdan eğitimde başlangıç ağırlıkları
+    TRAIN_EPOCHS = 50
+    TRAIN_IMG_SIZE = 512
+    TRAIN_BATCH = 16
+    TRAIN_DEVICE = None  # None ise cuda > mps > cpu sırasıyla otomatik seçilir
+    TRAIN_WORKERS = None  # DataLoader ve önbellek oluşturma işçileri; None ise çekirdek sayısı (en fazla 8)
+    TRAIN_CACHE_DIR = 'cache/train'  # önceden çözülmüş memmap görsel önbelleği; None ise kapalı
+    TRAIN_PROJECT = 'runs/pc_train'
+    TRAIN_SAVE_PERIOD = 5  # last.pt her epoch yazılır, ayrıca bu aralıkla epochN.pt saklanır
+    TRAIN_INCREMENTAL_EPOCHS = 10
+    TRAIN_INCREMENTAL_LR = 0.001
+    TRAIN_INCREMENTAL_FREEZE = 10  # ince ayarda dondurulan ilk katman sayısı (YOLO11 omurgası)
+    TRAIN_REPLAY_FRACTION = 0.3  # ince ayarda yeni etiketlere eklenen eski görsel oranı
+
+    ARTIFACT_CACHE_DIR = 'cache/artifacts'
+    ARTIFACT_MIRROR = None  # yerel klasör veya 'http://...' ayna; düzen: <artefakt>/<dosya>
+    ARTIFACT_OFFLINE = False  # True ise yalnızca önbellek ve ayna kullanılır
+    ARTIFACT_DOWNLOAD_WORKERS = 4  # aynı anda indirilen dosya
+    ARTIFACT_SEGMENTS = 4  # Range destekleyen sunucularda dosya başına paralel parça
+    ARTIFACT_MIN_SEGMENT_MB = 8
+    ARTIFACT_TIMEOUT_S = 60
+    PREFETCH_ARTIFACTS = [YOLO11_MODEL_PATH, DETR_MODEL_NAME, BLIP_MODEL]  # uygulama açılışında arka planda indirilir
+    ARTIFACT_SHA256 = {}  # '<artefakt>/<dosya>': sha256; boşsa ilk indirmede kilit dosyasına yazılır
+    ARTIFACT_PINS_PATH = 'models/artifact_pins.json'  # repoda tutulan sabit sha256 listesi (download_models.py --pin yazar)
+
+    SERVER_HOST = '127.0.0.1'
+    SERVER_PORT = 8502
+    SERVER_WORKERS = 1  # >1 ise aynı soketi dinleyen fork'lanmış süreçler (ağırlıklar mmap ile paylaşılır)
+    INFERENCE_SERVER_URL = None  # örn: 'http://127.0.0.1:8502', None ise modeller süreç içinde çalışır
+
+    MODEL_MEMORY_BUDGET_MB = 4096
+    PRELOAD_MODELS = []  # örn: ["YOLO11", "BLIP"]
+    MODEL_PRECISION = {'BLIP': 'auto', 'DETR': 'auto'}  # 'auto' (GPU'da float16, CPU'da float32), 'float32', 'float16', 'bfloat16', 'int8' (CPU, dinamik nicemleme)
+    MODEL_MMAP_WEIGHTS = True  # dtype dönüşümü yoksa safetensors ağırlıkları kopyalanmadan mmap ile açılır
     
+    DISPLAY_MAX_WIDTH = 1280  # Streamlit'e gönderilen görselin en fazla genişliği
+    DISPLAY_FORMAT = 'JPEG'  # 'JPEG' veya 'WEBP'
+    DISPLAY_QUALITY = 85
+
     COLORS = {
         'person': (255, 0, 0),
         'vehicle': (0, 255, 0),
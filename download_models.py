@@ -1,85 +1,81 @@
+import argparse
+import json
 import os
-import requests
-import time
 
-def download_file_with_progress(url, filename):
-    """File download karta hai with proper progress"""
-    try:
-        print(f"📥 Downloading {filename} from {url}")
-        
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 8192
-        downloaded = 0
-        
-        with open(filename, 'wb') as file:
-            for data in response.iter_content(block_size):
-                file.write(data)
-                downloaded += len(data)
-                if total_size > 0:
-                    percent = (downloaded / total_size) * 100
-                    print(f"   Progress: {percent:.1f}% ({downloaded/(1024*1024):.1f} MB / {total_size/(1024*1024):.1f} MB)", end='\r')
-        
-        file_size = os.path.getsize(filename) / (1024 * 1024)
-        print(f"\n✅ Downloaded: {filename} ({file_size:.1f} MB)")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Download failed: {e}")
-        return False
+from config.settings import Config
+from models.artifacts import ARTIFACTS, ArtifactManager
+
+DEFAULT_ARTIFACTS = [Config.YOLO11_MODEL_PATH, Config.DETR_MODEL_NAME, Config.BLIP_MODEL]
+
+
+def pin_hashes(manager, names):
+    """Doğrulanmış sha256 değerlerini repodaki sabit listeye ekler; sonraki kurulumlar ilk indirmeye güvenmez"""
+    pins = {}
+    if os.path.exists(Config.ARTIFACT_PINS_PATH):
+        with open(Config.ARTIFACT_PINS_PATH) as f:
+            pins = json.load(f)
+    for name in names:
+        pins.update(manager.locked_hashes(name))
+    with open(Config.ARTIFACT_PINS_PATH, 'w') as f:
+        json.dump(pins, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"📌 {len(pins)} sha256 değeri {Config.ARTIFACT_PINS_PATH} dosyasına yazıldı")
+
 
 def main():
-    """YOLO model files download karta hai"""
-    print("🚀 Downloading YOLO Model Files...")
-    os.makedirs('models', exist_ok=True)
-    
-    model_files = [
-        {
-            'url': 'https://pjreddie.com/media/files/yolov3.weights',
-            'filename': 'models/yolov3.weights',
-            'expected_size': 237  
-        },
-        {
-            'url': 'https://raw.githubusercontent.com/pjreddie/darknet/master/cfg/yolov3.cfg', 
-            'filename': 'models/yolov3.cfg',
-            'expected_size': 0.008  
-        },
-        {
-            'url': 'https://raw.githubusercontent.com/pjreddie/darknet/master/data/coco.names',
-            'filename': 'models/coco.names', 
-            'expected_size': 0.001  
-        }
-    ]
-    
-    all_success = True
-    for file_info in model_files:
-        filename = file_info['filename']
-        
-        if os.path.exists(filename):
-            actual_size = os.path.getsize(filename) / (1024 * 1024)
-            expected_size = file_info['expected_size']
-            
-            if abs(actual_size - expected_size) <= (expected_size * 0.1):
-                print(f"✅ Already exists: {os.path.basename(filename)} ({actual_size:.1f} MB)")
-                continue
-            else:
-                print(f"⚠️  File exists but wrong size: {actual_size:.1f} MB (expected: {expected_size:.1f} MB)")
-                os.remove(filename)
-        
-        if not download_file_with_progress(file_info['url'], filename):
-            all_success = False
-    
-    if all_success:
-        print("\n🎯 All model files downloaded successfully!")
-        print("\n📁 Files in 'models' folder:")
-        for file_info in model_files:
-            if os.path.exists(file_info['filename']):
-                size = os.path.getsize(file_info['filename']) / (1024 * 1024)
-                print(f"   - {os.path.basename(file_info['filename'])} ({size:.1f} MB)")
-    else:
-        print("\n❌ Some downloads failed!")
+    """Model dosyalarını içerik adresli önbelleğe indirir ve SHA-256 ile doğrular"""
+    parser = argparse.ArgumentParser(description="Model artefaktlarını paralel indirir ve doğrular")
+    parser.add_argument("artifacts", nargs="*", help=f"İndirilecek artefaktlar (varsayılan: {', '.join(DEFAULT_ARTIFACTS)})")
+    parser.add_argument("--all", action="store_true", help="Bilinen tüm artefaktlar (YOLOv3 dahil)")
+    parser.add_argument("--mirror", help="Yerel ayna klasörü veya http(s) adresi")
+    parser.add_argument("--offline", action="store_true", help="Ağa çıkmadan yalnızca önbellek/ayna kullan")
+    parser.add_argument("--cache-dir", default=Config.ARTIFACT_CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=Config.ARTIFACT_DOWNLOAD_WORKERS)
+    parser.add_argument("--verify", action="store_true", help="İndirmeden önbellekteki dosyaları doğrula")
+    parser.add_argument("--list", action="store_true", help="Bilinen artefaktları listele")
+    parser.add_argument("--pin", action="store_true",
+                        help=f"İndirilen dosyaların sha256 değerlerini {Config.ARTIFACT_PINS_PATH} dosyasına yaz (repoya eklenir)")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in ARTIFACTS.items():
+            print(f"   - {name}: {', '.join(spec['files'])}")
+        return
+
+    names = list(ARTIFACTS) if args.all else (args.artifacts or DEFAULT_ARTIFACTS)
+    unknown = [name for name in names if name not in ARTIFACTS]
+    if unknown:
+        parser.error(f"Bilinmeyen artefakt: {', '.join(unknown)}")
+
+    manager = ArtifactManager(args.cache_dir, args.mirror, args.offline or None, args.workers)
+
+    if args.verify:
+        all_valid = True
+        for name in names:
+            for filename, valid in manager.verify(name).items():
+                all_valid &= valid
+                print(f"{'✅' if valid else '❌'} {name}/{filename}")
+        if not all_valid:
+            raise SystemExit(1)
+        return
+
+    print(f"🚀 Downloading {len(names)} artifacts...")
+    failed = []
+    for name in names:
+        try:
+            path = manager.fetch(name)
+            print(f"📁 {name} -> {path}")
+        except Exception as e:
+            print(f"❌ {name} indirilemedi: {e}")
+            failed.append(name)
+
+    if failed:
+        print(f"\n❌ Some downloads failed: {', '.join(failed)}")
+        raise SystemExit(1)
+    if args.pin:
+        pin_hashes(manager, names)
+    print(f"\n🎯 All model files downloaded successfully! (cache: {os.path.abspath(args.cache_dir)})")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
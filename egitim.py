@@ -1,18 +1,6 @@
-from ultralytics import YOLO
-import os
+from train import main
 
-
-model = YOLO("yolo11n.pt") 
-
-
-data_path = os.path.abspath("PC/data.yaml")
-
-
-results = model.train(
-    data=data_path,
-    epochs=50,       
-    imgsz=512,       
-    device="mps"     
-)
-
-print("✅ Eğitim tamamlandı!")
\ No newline at end of file
+# Eski giriş noktası; ayarlar artık Config.TRAIN_* ve train.py argümanlarından gelir
+# (aygıt otomatik seçilir, örn. CPU'da: python egitim.py --device cpu)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config.settings import Config
+
+HF_URL = "https://huggingface.co/{repo}/resolve/main/{filename}"
+SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+# Artefakt adı -> indirilecek dosyalar. "link" verilirse dosya önbellekten o yola da bağlanır (mevcut kod yolları için).
+ARTIFACTS = {
+    "yolo11n.pt": {
+        "files": {"yolo11n.pt": "https://github.com/ultralytics/assets/releases/download/v8.3.0/yolo11n.pt"},
+        "link": {"yolo11n.pt": "yolo11n.pt"}
+    },
+    "facebook/detr-resnet-50": {
+        "files": {name: HF_URL.format(repo="facebook/detr-resnet-50", filename=name) for name in (
+            "config.json", "preprocessor_config.json", "model.safetensors"
+        )}
+    },
+    "Salesforce/blip-image-captioning-base": {
+        "files": {name: HF_URL.format(repo="Salesforce/blip-image-captioning-base", filename=name) for name in (
+            "config.json", "preprocessor_config.json", "model.safetensors", "special_tokens_map.json",
+            "tokenizer.json", "tokenizer_config.json", "vocab.txt"
+        )}
+    },
+    "yolov3": {
+        "files": {
+            "yolov3.weights": "https://pjreddie.com/media/files/yolov3.weights",
+            "yolov3.cfg": "https://raw.githubusercontent.com/pjreddie/darknet/master/cfg/yolov3.cfg",
+            "coco.names": "https://raw.githubusercontent.com/pjreddie/darknet/master/data/coco.names"
+        },
+        "link": {
+            "yolov3.weights": "models/yolov3.weights",
+            "yolov3.cfg": "models/yolov3.cfg",
+            "coco.names": "models/coco.names"
+        }
+    }
+}
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _check_size(part, size):
+    """Eksik inen dosya hash'lenip kilide yazılmadan önce reddedilir"""
+    received = os.path.getsize(part)
+    if size and received != size:
+        os.remove(part)
+        if os.path.exists(part + ".json"):
+            os.remove(part + ".json")
+        raise RuntimeError(f"Eksik indirme: {os.path.basename(part)} ({received}/{size} bayt)")
+
+
+def _link(source, target):
+    """Hard link, olmazsa kopya (farklı dosya sistemleri)"""
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    tmp = target + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+class ArtifactManager:
+    """Model dosyalarını paralel, kaldığı yerden devam eden indirmelerle içerik adresli önbelleğe alır.
+
+    Önbellek düzeni: blobs/<sha256> (içerik) ve snapshots/<artefakt>/<dosya> (isimli bağlantılar).
+    Beklenen SHA-256 sırasıyla Config.ARTIFACT_SHA256, repodaki sabit liste (Config.ARTIFACT_PINS_PATH),
+    sunucunun bildirdiği özet (HuggingFace LFS) ve ilk boyutu doğrulanmış indirmede yazılan kilit dosyasından gelir.
+    """
+    def __init__(self, cache_dir=None, mirror=None, offline=None, workers=None, segments=None):
+        self.cache_dir = cache_dir or Config.ARTIFACT_CACHE_DIR
+        self.mirror = Config.ARTIFACT_MIRROR if mirror is None else mirror
+        self.offline = Config.ARTIFACT_OFFLINE if offline is None else offline
+        self.workers = workers or Config.ARTIFACT_DOWNLOAD_WORKERS
+        self.segments = segments or Config.ARTIFACT_SEGMENTS
+        self.lock_path = os.path.join(self.cache_dir, "artifacts.lock.json")
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+        self._pinned_hashes = self._read_json(Config.ARTIFACT_PINS_PATH)
+        self._locked_hashes = self._read_json(self.lock_path)
+
+    @staticmethod
+    def _read_json(path):
+        if path and os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+        return {}
+
+    def _expected_sha256(self, key):
+        return Config.ARTIFACT_SHA256.get(key) or self._pinned_hashes.get(key) or self._locked_hashes.get(key)
+
+    def locked_hashes(self, name):
+        """Artefaktın bilinen (sabit veya kilitlenmiş) SHA-256 değerleri ('<artefakt>/<dosya>': sha256)"""
+        keys = [f"{name}/{filename}" for filename in ARTIFACTS[name]["files"]]
+        return {key: self._expected_sha256(key) for key in keys if self._expected_sha256(key)}
+
+    def _record_sha256(self, key, digest):
+        with self._lock:
+            self._locked_hashes[key] = digest
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self.lock_path + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self._locked_hashes, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.lock_path)
+
+    def snapshot_dir(self, name):
+        return os.path.join(self.cache_dir, "snapshots", name.replace("/", "__"))
+
+    def _source(self, name, filename, url):
+        """İndirme kaynağı: ayna (URL veya klasör) ya da orijinal URL"""
+        if self.mirror:
+            if self.mirror.startswith(("http://", "https://")):
+                return f"{self.mirror.rstrip('/')}/{name}/{filename}"
+            return os.path.join(self.mirror, name, filename)
+        if self.offline:
+            raise RuntimeError(f"Çevrimdışı mod: {name}/{filename} önbellekte yok ve ayna tanımlı değil")
+        return url
+
+    def fetch(self, name):
+        """Artefaktın tüm dosyalarını indirir/doğrular; tek dosyalıysa dosya, değilse klasör yolunu döndürür"""
+        spec = ARTIFACTS[name]
+        files = spec["files"]
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(name, threading.Lock())
+        # Ön indirme ve model yükleme aynı artefaktı aynı anda isterse dosyalar bir kez indirilir
+        with fetch_lock:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                paths = dict(zip(files, pool.map(lambda item: self._fetch_file(name, *item), files.items())))
+
+            for filename, target in spec.get("link", {}).items():
+                if not (os.path.exists(target) and os.path.samefile(paths[filename], target)):
+                    _link(paths[filename], target)
+
+        if len(files) == 1:
+            return next(iter(paths.values()))
+        return self.snapshot_dir(name)
+
+    def resolve(self, name_or_path):
+        """Yerel dosya varsa onu, bilinen bir artefaktsa önbellek yolunu, değilse girdiyi aynen döndürür"""
+        if os.path.exists(name_or_path) or name_or_path not in ARTIFACTS:
+            return name_or_path
+        try:
+            return self.fetch(name_or_path)
+        except Exception as e:
+            # Örn. ağ yok: kütüphanelerin kendi indirme/önbellek davranışına geri dönülür
+            print(f"⚠️ {name_or_path} artefakt önbelleğinden alınamadı: {e}")
+            return name_or_path
+
+    def prefetch(self, names=None, background=True):
+        """Uygulamanın kullandığı artefaktları ilk istekten önce indirir"""
+        names = list(names or Config.PREFETCH_ARTIFACTS)
+
+        def run():
+            for name in names:
+                self.resolve(name)
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="artifact-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def verify(self, name):
+        """Önbellekteki dosyaların SHA-256 değerlerini yeniden hesaplayıp kilit dosyasıyla karşılaştırır"""
+        results = {}
+        for filename in ARTIFACTS[name]["files"]:
+            path = os.path.join(self.snapshot_dir(name), filename)
+            expected = self._expected_sha256(f"{name}/{filename}")
+            results[filename] = os.path.exists(path) and expected is not None and sha256_file(path) == expected
+        return results
+
+    def _fetch_file(self, name, filename, url):
+        key = f"{name}/{filename}"
+        snapshot = os.path.join(self.snapshot_dir(name), filename)
+        expected = self._expected_sha256(key)
+        if os.path.exists(snapshot) and (expected is None or os.path.exists(self._blob_path(expected))):
+            return snapshot
+
+        if expected and os.path.exists(self._blob_path(expected)):
+            # Aynı içerik başka bir artefakt için zaten indirilmiş
+            _link(self._blob_path(expected), snapshot)
+            return snapshot
+
+        source = self._source(name, filename, url)
+        part = os.path.join(self.cache_dir, "downloads", key.replace("/", "__") + ".part")
+        os.makedirs(os.path.dirname(part), exist_ok=True)
+        print(f"📥 {key} <- {source}")
+
+        if source.startswith(("http://", "https://")):
+            advertised = self._download(source, part)
+            if advertised and expected and advertised != expected:
+                print(f"⚠️ {key}: sunucunun bildirdiği sha256 sabit değerden farklı, sabit değer kullanılıyor")
+            expected = expected or advertised
+        elif os.path.exists(source):
+            shutil.copyfile(source, part)
+        else:
+            raise RuntimeError(f"Aynada bulunamadı: {source}")
+
+        digest = sha256_file(part)
+        if expected and digest != expected:
+            os.remove(part)
+            self._clear_state(part)
+            raise RuntimeError(f"SHA-256 uyuşmazlığı: {key} (beklenen {expected[:12]}, gelen {digest[:12]})")
+
+        blob = self._blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        os.replace(part, blob)
+        self._clear_state(part)
+        _link(blob, snapshot)
+        if self._locked_hashes.get(key) != digest:
+            self._record_sha256(key, digest)
+        print(f"✅ {key} ({os.path.getsize(blob) / (1024 * 1024):.1f} MB, sha256 {digest[:12]})")
+        return snapshot
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    @staticmethod
+    def _clear_state(part):
+        if os.path.exists(part + ".json"):
+            os.remove(part + ".json")
+
+    @staticmethod
+    def _advertised_sha256(head):
+        """HuggingFace LFS dosyaları için yönlendirme öncesi yanıttaki X-Linked-Etag içeriğin sha256'sıdır"""
+        for response in (*head.history, head):
+            etag = response.headers.get("X-Linked-Etag", "").strip('W/"').lower()
+            if SHA256_RE.fullmatch(etag):
+                return etag
+        return None
+
+    def _download(self, url, part):
+        """Sunucu Range destekliyorsa dosyayı parçalara bölüp paralel indirir; tamamlanan parçalar devamda atlanır.
+
+        Sunucunun bildirdiği sha256 değerini (yoksa None) döndürür.
+        """
+        head = requests.head(url, allow_redirects=True, timeout=Config.ARTIFACT_TIMEOUT_S)
+        head.raise_for_status()
+        advertised = self._advertised_sha256(head)
+        size = int(head.headers.get("Content-Length", 0))
+        ranged = head.headers.get("Accept-Ranges") == "bytes" and size > 0
+        if not ranged:
+            self._download_stream(head.url, part, size)
+            return advertised
+
+        segment_size = max(Config.ARTIFACT_MIN_SEGMENT_MB * 1024 * 1024, -(-size // self.segments))
+        ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+
+        state_path = part + ".json"
+        state = {"url": url, "size": size, "done": []}
+        if os.path.exists(state_path) and os.path.exists(part):
+            with open(state_path) as f:
+                saved = json.load(f)
+            if saved.get("url") == url and saved.get("size") == size:
+                state = saved
+        if state["done"]:
+            print(f"   ↩️ {len(state['done'])}/{len(ranges)} parça zaten indirilmiş, devam ediliyor")
+
+        with open(part, 'ab') as f:
+            f.truncate(size)
+        state_lock = threading.Lock()
+
+        def fetch_range(index):
+            start, end = ranges[index]
+            response = requests.get(head.url, headers={"Range": f"bytes={start}-{end}"}, stream=True,
+                                    timeout=Config.ARTIFACT_TIMEOUT_S)
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RuntimeError("Sunucu Range isteğini yok saydı")
+            with open(part, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(1024 * 1024):
+                    f.write(chunk)
+                if f.tell() != end + 1:
+                    raise RuntimeError(f"Eksik parça: {start}-{end}")
+            with state_lock:
+                state["done"].append(index)
+                with open(state_path, 'w') as f:
+                    json.dump(state, f)
+
+        pending = [i for i in range(len(ranges)) if i not in state["done"]]
+        with ThreadPoolExecutor(max_workers=self.segments) as pool:
+            list(pool.map(fetch_range, pending))
+        _check_size(part, size)
+        return advertised
+
+    @staticmethod
+    def _download_stream(url, part, size=0):
+        # Range desteklenmiyor: tek akış, büyük bloklarla
+        with requests.get(url, stream=True, timeout=Config.ARTIFACT_TIMEOUT_S) as response:
+            response.raise_for_status()
+            if not size and response.headers.get("Content-Encoding", "identity") == "identity":
+                size = int(response.headers.get("Content-Length", 0))
+            with open(part, 'wb') as f:
+                for chunk in response.iter_content(1024 * 1024):
+                    f.write(chunk)
+        _check_size(part, size)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_artifact_manager():
+    """Süreç genelindeki tek ArtifactManager örneğini döndürür"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ArtifactManager()
+        return _manager
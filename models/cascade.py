@@ -0,0 +1,109 @@
+import threading
+
+from config.settings import Config
+from models.detections import Detections
+from models.ensemble import canonical_ids, member_cache_key
+from utils.telemetry import get_telemetry
+
+
+class CascadeDetector:
+    """Önce hızlı modeli çalıştırır; sonuç belirsizse ya da boşsa görseli ağır modele yükseltir"""
+    def __init__(self, fast, heavy, low_conf=None, high_conf=None, escalate_on_empty=None, merge=None):
+        self.fast = fast
+        self.heavy = heavy
+        self.low_conf = Config.CASCADE_LOW_CONF if low_conf is None else low_conf
+        self.high_conf = Config.CASCADE_HIGH_CONF if high_conf is None else high_conf
+        self.escalate_on_empty = Config.CASCADE_ESCALATE_ON_EMPTY if escalate_on_empty is None else escalate_on_empty
+        self.merge = Config.CASCADE_MERGE if merge is None else merge
+        self.model_type = f"Cascade({fast.model_type}->{heavy.model_type})"
+        self.last_reason = None
+        self._counters = {"images": 0, "escalated": 0, "empty": 0, "uncertain": 0}
+        self._lock = threading.Lock()
+
+    def members(self):
+        """Ağırlık özetleri önbellek anahtarına katılacak hızlı ve ağır model"""
+        return [self.fast, self.heavy]
+
+    def cache_key(self):
+        """Önbellek anahtarı için eşikler, birleştirme ayarları ve üyelerin kendi anahtarları"""
+        return (
+            self.low_conf, self.high_conf, self.escalate_on_empty, self.merge, Config.NMS_THRESHOLD,
+            sorted(Config.CLASS_ALIASES.items()), [member_cache_key(d) for d in self.members()]
+        )
+
+    def precision_key(self):
+        """Önbellek anahtarı için hızlı ve ağır modelin çözümlenmiş hassasiyetleri"""
+        return [getattr(d, "precision_key", lambda: None)() for d in (self.fast, self.heavy)]
+
+    def escalation_reason(self, detections):
+        """Yükseltme nedeni ('empty', 'uncertain') veya None"""
+        if detections is None or len(detections) == 0:
+            return "empty" if self.escalate_on_empty else None
+        in_band = (detections.confs >= self.low_conf) & (detections.confs < self.high_conf)
+        return "uncertain" if in_band.any() else None
+
+    def detect(self, image):
+        detections = self.detect_arrays(image)
+        if detections is None:
+            return None, None, None, None, None
+        return detections.to_legacy()
+
+    def detect_arrays(self, image):
+        fast_result = self.fast.detect_arrays(image)
+        reason = self.escalation_reason(fast_result)
+        self._record([reason])
+        self.last_reason = reason
+        if reason is None:
+            return fast_result
+        return self._combine(fast_result, self.heavy.detect_arrays(image))
+
+    def detect_arrays_batch(self, images, batch_size=None):
+        """Hızlı model tüm batch'i, ağır model yalnızca yükseltilen görselleri işler"""
+        images = list(images)
+        fast_results = self.fast.detect_arrays_batch(images, batch_size)
+        reasons = [self.escalation_reason(d) for d in fast_results]
+        self._record(reasons)
+
+        escalated = [i for i, reason in enumerate(reasons) if reason is not None]
+        if escalated:
+            heavy_results = self.heavy.detect_arrays_batch([images[i] for i in escalated], batch_size)
+            for i, heavy_result in zip(escalated, heavy_results):
+                fast_results[i] = self._combine(fast_results[i], heavy_result)
+        return fast_results
+
+    def detect_batch(self, images, batch_size=None):
+        return [
+            d.to_legacy() if d is not None else (None, None, None, None, None)
+            for d in self.detect_arrays_batch(images, batch_size)
+        ]
+
+    def _combine(self, fast_result, heavy_result):
+        if not self.merge or fast_result is None or heavy_result is None:
+            return heavy_result
+        # Hızlı modelin kesin tespitleri korunur (örn. PC modelinin bilmediği COCO sınıfları)
+        confident = fast_result.filter(min_conf=self.high_conf)
+        parts = [Detections(d.xywh, d.confs, canonical_ids(d), d.vocab) for d in (confident, heavy_result)]
+        return Detections.concat(parts).nms(Config.NMS_THRESHOLD)
+
+    def _record(self, reasons):
+        telemetry = get_telemetry()
+        with self._lock:
+            self._counters["images"] += len(reasons)
+            for reason in reasons:
+                if reason is not None:
+                    self._counters["escalated"] += 1
+                    self._counters[reason] += 1
+                    telemetry.inc("cascade_escalations", 1, reason=reason)
+        telemetry.inc("cascade_images", len(reasons))
+
+    def stats(self):
+        """Yükseltme sayıları ve oranı"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["escalation_rate"] = stats["escalated"] / stats["images"] if stats["images"] else 0.0
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+
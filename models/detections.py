@@ -0,0 +1,224 @@
+import threading
+
+import numpy as np
+
+from config.settings import Config
+
+
+class ClassVocabulary:
+    """Tüm modeller arasında paylaşılan sınıf adı <-> tamsayı id sözlüğü"""
+    def __init__(self):
+        self._names = []
+        self._ids = {}
+        self._model_maps = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def id_for(self, name):
+        """Sınıf adının ortak id'sini döndürür, ilk kez görülüyorsa ekler"""
+        class_id = self._ids.get(name)
+        if class_id is None:
+            with self._lock:
+                class_id = self._ids.get(name)
+                if class_id is None:
+                    class_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = class_id
+        return class_id
+
+    def ids_for(self, names):
+        return np.fromiter((self.id_for(n) for n in names), dtype=np.int32, count=len(names))
+
+    def name(self, class_id):
+        return self._names[class_id]
+
+    def names(self):
+        """Eski 'classes' formatı: {id: ad}"""
+        return dict(enumerate(self._names))
+
+    def model_map(self, model_names):
+        """Modelin yerel sınıf id'lerini ortak id'lere çeviren tablo (model başına bir kez hesaplanır)"""
+        if isinstance(model_names, dict):
+            size = max(model_names.keys(), default=-1) + 1
+            local = [model_names.get(i, str(i)) for i in range(size)]
+        else:
+            local = list(model_names)
+        key = tuple(local)
+        table = self._model_maps.get(key)
+        if table is None:
+            table = self.ids_for(local)
+            self._model_maps[key] = table
+        return table
+
+
+_vocabulary = ClassVocabulary()
+
+
+def get_vocabulary():
+    """Süreç genelindeki ortak sınıf sözlüğünü döndürür"""
+    return _vocabulary
+
+
+class Detections:
+    """Tespit sonuçlarının sütunlu (NumPy) gösterimi: xywh (float piksel), güven skorları ve ortak sınıf id'leri"""
+    __slots__ = ("xywh", "confs", "class_ids", "vocab")
+
+    def __init__(self, xywh, confs, class_ids, vocab=None):
+        self.xywh = np.asarray(xywh, dtype=np.float32).reshape(-1, 4)
+        self.confs = np.asarray(confs, dtype=np.float32).reshape(-1)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32).reshape(-1)
+        self.vocab = vocab or get_vocabulary()
+
+    @classmethod
+    def from_xyxy(cls, xyxy, confs, class_ids, vocab=None):
+        """Köşe koordinatlarından (x1, y1, x2, y2) tek seferde xywh üretir"""
+        xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        xywh = xyxy.copy()
+        xywh[:, 2:] -= xyxy[:, :2]
+        return cls(xywh, confs, class_ids, vocab)
+
+    @classmethod
+    def from_legacy(cls, boxes, confs, class_ids, classes, vocab=None):
+        """Eski (boxes, confs, class_ids, classes) formatından ortak sözlüğe eşleyerek oluşturur"""
+        vocab = vocab or get_vocabulary()
+        # Girdiler NumPy dizisi olabilir; "x or []" çok elemanlı dizide ValueError verir
+        names = [classes[int(c)] for c in (class_ids if class_ids is not None else [])]
+        boxes = np.asarray(boxes if boxes is not None else [], dtype=np.float32)
+        return cls(boxes, confs if confs is not None else [], vocab.ids_for(names), vocab)
+
+    @classmethod
+    def empty(cls, vocab=None):
+        return cls(np.zeros((0, 4)), [], [], vocab)
+
+    @classmethod
+    def concat(cls, items):
+        """Birden fazla modelin sonuçlarını tek sütunlu sonuçta birleştirir"""
+        items = [d for d in items if d is not None]
+        if not items:
+            return cls.empty()
+        return cls(
+            np.concatenate([d.xywh for d in items]),
+            np.concatenate([d.confs for d in items]),
+            np.concatenate([d.class_ids for d in items]),
+            items[0].vocab
+        )
+
+    def __len__(self):
+        return len(self.confs)
+
+    def __reduce__(self):
+        # Ortak id'ler süreçten sürece değişebileceği için sınıflar ad olarak saklanır
+        return (_restore_detections, (self.xywh, self.confs, self.class_names()))
+
+    @property
+    def xyxy(self):
+        xyxy = self.xywh.copy()
+        xyxy[:, 2:] += self.xywh[:, :2]
+        return xyxy
+
+    @property
+    def names(self):
+        return self.vocab.names()
+
+    def class_names(self):
+        return [self.vocab.name(i) for i in self.class_ids.tolist()]
+
+    def select(self, index):
+        """Maske veya indeks dizisiyle alt küme döndürür"""
+        return Detections(self.xywh[index], self.confs[index], self.class_ids[index], self.vocab)
+
+    def filter(self, min_conf=None, class_ids=None):
+        mask = np.ones(len(self), dtype=bool)
+        if min_conf is not None:
+            mask &= self.confs >= min_conf
+        if class_ids is not None:
+            mask &= np.isin(self.class_ids, np.asarray(class_ids, dtype=np.int32))
+        return self.select(mask)
+
+    def counts(self):
+        """{sınıf adı: adet} — tek np.unique çağrısıyla"""
+        ids, counts = np.unique(self.class_ids, return_counts=True)
+        return {self.vocab.name(i): int(c) for i, c in zip(ids.tolist(), counts.tolist())}
+
+    def scaled(self, sx, sy):
+        """Kutuları x/y eksenlerinde ölçekler (küçültülmüş girdiden orijinal koordinatlara)"""
+        if sx == 1.0 and sy == 1.0:
+            return self
+        factors = np.array([sx, sy, sx, sy], dtype=np.float32)
+        return Detections(self.xywh * factors, self.confs, self.class_ids, self.vocab)
+
+    def shifted(self, dx, dy):
+        """Kutuları öteler (karo koordinatlarından tüm görsel koordinatlarına)"""
+        if dx == 0 and dy == 0:
+            return self
+        xywh = self.xywh.copy()
+        xywh[:, 0] += dx
+        xywh[:, 1] += dy
+        return Detections(xywh, self.confs, self.class_ids, self.vocab)
+
+    def nms(self, iou_threshold=None, class_aware=True):
+        """Greedy NMS; class_aware ise yalnızca aynı sınıftaki kutular birbirini bastırır"""
+        iou_threshold = Config.NMS_THRESHOLD if iou_threshold is None else iou_threshold
+        if len(self) < 2:
+            return self
+        xyxy = self.xyxy
+        if class_aware:
+            # Her sınıf ayrı bir koordinat bölgesine kaydırılır, böylece tek geçişte sınıf bazlı NMS yapılır
+            xyxy += (self.class_ids.astype(np.float32) * (xyxy.max() + 1))[:, None]
+        return self.select(nms_indices(xyxy, self.confs, iou_threshold))
+
+    def to_records(self):
+        """JSON'a yazılabilir tespit listesi"""
+        names = self.class_names()
+        boxes = self.xywh.astype(np.int32).tolist()
+        return [
+            {"id": i, "object": names[i], "confidence": conf, "bbox": boxes[i]}
+            for i, conf in enumerate(self.confs.tolist())
+        ]
+
+    def to_legacy(self):
+        """Eski (boxes, confs, class_ids, classes, indexes) formatına ince uyumluluk görünümü"""
+        return self.xywh.astype(np.int32).tolist(), self.confs.tolist(), self.class_ids.tolist(), self.names, np.arange(len(self))
+
+
+def _restore_detections(xywh, confs, names):
+    vocab = get_vocabulary()
+    return Detections(xywh, confs, vocab.ids_for(names), vocab)
+
+
+def box_iou(xyxy_a, xyxy_b):
+    """İki kutu kümesi arasındaki IoU matrisini (len(a) x len(b)) vektörel hesaplar"""
+    a = np.asarray(xyxy_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(xyxy_b, dtype=np.float32).reshape(-1, 4)
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).clip(0).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).clip(0).prod(axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def box_ios(xyxy_a, xyxy_b):
+    """Kesişimin küçük kutunun alanına oranı (IoS); karo kenarında kesilmiş parçalar için IoU'dan duyarlı"""
+    a = np.asarray(xyxy_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(xyxy_b, dtype=np.float32).reshape(-1, 4)
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).clip(0).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).clip(0).prod(axis=1)
+    return inter / np.maximum(np.minimum(area_a[:, None], area_b[None, :]), 1e-9)
+
+
+def nms_indices(xyxy, scores, iou_threshold):
+    """Skora göre azalan sırada tutulan kutuların indekslerini döndürür"""
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        order = rest[box_iou(xyxy[best], xyxy[rest])[0] <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
@@ -1,33 +1,175 @@
 import numpy as np
 import cv2
+from config.settings import Config
+from models.detections import Detections, get_vocabulary
+from models.tiling import iter_tile_batches, merge_tiles
+from utils.analysis_image import AnalysisImage
+from utils.telemetry import get_telemetry
 
 class ObjectDetector:
-    def __init__(self, model, model_type):
+    def __init__(self, model, model_type, tiled=None):
         self.model = model
         self.model_type = model_type
+        self.tiled = Config.TILED_INFERENCE if tiled is None else tiled
+
+    def tiling_key(self):
+        """Önbellek anahtarı için karo ayarları (kapalıysa None)"""
+        if not self.tiled:
+            return None
+        return (Config.TILE_SIZE, Config.TILE_OVERLAP, Config.TILE_MIN_SIDE, Config.TILE_INCLUDE_FULL)
+
+    def precision_key(self):
+        """Önbellek anahtarı için modelin çözümlenmiş hassasiyeti (ModelLoader işaretlemediyse None)"""
+        return getattr(self.model, "precision", None)
 
     def detect(self, image):
         """Seçili modele göre tespit yapar ve ortak format döndürür"""
-        boxes, confs, class_ids, classes = [], [], [], {}
+        detections = self.detect_arrays(image)
+        if detections is None:
+            return None, None, None, None, None
+        return detections.to_legacy()
+
+    def detect_arrays(self, image):
+        """Tespit sonucunu sütunlu Detections nesnesi olarak döndürür"""
+        telemetry = get_telemetry()
+        if isinstance(image, AnalysisImage):
+            if self.tiled and max(image.width, image.height) >= Config.TILE_MIN_SIDE:
+                return self.detect_tiled(image)
+            with telemetry.stage("preprocess", model=self.model_type):
+                model_input, scale = image.model_input(self.model_type)
+            detections = self.detect_arrays(model_input)
+            return detections.scaled(*scale) if detections is not None else None
 
         if self.model_type == "YOLO11":
-            results = self.model(image)[0]
-            classes = results.names
-            for box in results.boxes:
-                coords = box.xyxy[0].tolist() 
-                boxes.append([int(coords[0]), int(coords[1]), int(coords[2]-coords[0]), int(coords[3]-coords[1])])
-                confs.append(float(box.conf[0]))
-                class_ids.append(int(box.cls[0]))
-            return boxes, confs, class_ids, classes, np.arange(len(boxes))
+            with telemetry.stage("inference", model=self.model_type):
+                results = self.model(image)[0]
+            with telemetry.stage("postprocess", model=self.model_type):
+                detections = self._parse_yolo(results)
 
         elif self.model_type == "DETR":
-            results = self.model(image)
-            for i, res in enumerate(results):
-                b = res['box']
-                boxes.append([b['xmin'], b['ymin'], b['xmax']-b['xmin'], b['ymax']-b['ymin']])
-                confs.append(res['score'])
-                class_ids.append(i)
-                classes[i] = res['label']
-            return boxes, confs, class_ids, classes, np.arange(len(boxes))
+            with telemetry.stage("inference", model=self.model_type):
+                results = self.model(image)
+            with telemetry.stage("postprocess", model=self.model_type):
+                detections = self._parse_detr(results)
         
-        return None, None, None, None, None
\ No newline at end of file
+        else:
+            return None
+
+        telemetry.inc("images", 1, model=self.model_type)
+        telemetry.inc("boxes", len(detections), model=self.model_type)
+        return detections
+
+    def detect_batch(self, images, batch_size=None):
+        """Görselleri batch'ler halinde modele verir, her görsel için detect() ile aynı formatı döndürür"""
+        return [
+            d.to_legacy() if d is not None else (None, None, None, None, None)
+            for d in self.detect_arrays_batch(images, batch_size)
+        ]
+
+    def detect_arrays_batch(self, images, batch_size=None):
+        """detect_batch'in Detections döndüren sürümü"""
+        batch_size = batch_size or Config.BATCH_SIZE
+        telemetry = get_telemetry()
+        with telemetry.stage("preprocess", model=self.model_type):
+            images, scales = self._prepare_inputs(images)
+        outputs = []
+
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            parsed = self._run_batch(chunk)
+            if parsed is None:
+                outputs.extend(None for _ in chunk)
+                continue
+
+            outputs.extend(parsed)
+            telemetry.inc("images", len(chunk), model=self.model_type)
+            telemetry.inc("boxes", sum(len(d) for d in parsed), model=self.model_type)
+
+        return [d.scaled(*scale) if d is not None else None for d, scale in zip(outputs, scales)]
+
+    def detect_tiled(self, image, tile_size=None, overlap=None, batch_size=None, include_full=None):
+        """Büyük görseli örtüşen karolara bölüp batch'ler halinde tespit eder, kutuları merge_tiles ile birleştirir.
+
+        Küçük nesneler karoların kendi çözünürlüğünde görülür; include_full ise büyük nesneler için
+        küçültülmüş tam görsel de eklenir. Aynı anda yalnızca bir batch'lik karo bellekte tutulur.
+        """
+        image = AnalysisImage.ensure(image)
+        batch_size = batch_size or Config.BATCH_SIZE
+        include_full = Config.TILE_INCLUDE_FULL if include_full is None else include_full
+        telemetry = get_telemetry()
+        parts, regions = [], []
+
+        if include_full:
+            with telemetry.stage("preprocess", model=self.model_type):
+                model_input, scale = image.model_input(self.model_type)
+            # detect_arrays değil: görsel/kutu sayaçları birleştirmeden sonra bir kez artırılır
+            full = self._run_batch([model_input])
+            if full is None:
+                return None
+            parts.append(full[0].scaled(*scale))
+            regions.append((0, 0, image.width, image.height))
+
+        for batch in iter_tile_batches(image, batch_size, tile_size, overlap):
+            parsed = self._run_batch([tile for tile, _ in batch])
+            if parsed is None:
+                return None
+            parts.extend(d.shifted(x, y) for d, (_, (x, y)) in zip(parsed, batch))
+            regions.extend((x, y, x + tile.width, y + tile.height) for tile, (x, y) in batch)
+            telemetry.inc("tiles", len(batch), model=self.model_type)
+
+        with telemetry.stage("tile_merge", model=self.model_type):
+            detections = merge_tiles(parts, regions)
+        telemetry.inc("images", 1, model=self.model_type)
+        telemetry.inc("boxes", len(detections), model=self.model_type)
+        return detections
+
+    def _run_batch(self, chunk):
+        """Bir grup model girdisini tek çağrıda işler; desteklenmeyen model tipinde None döner"""
+        telemetry = get_telemetry()
+        if self.model_type == "YOLO11":
+            # Ultralytics liste girdisini letterbox'layıp tek tensörde işler
+            with telemetry.stage("inference_batch", model=self.model_type):
+                results = self.model(chunk, verbose=False)
+            with telemetry.stage("postprocess", model=self.model_type):
+                return [self._parse_yolo(r) for r in results]
+
+        if self.model_type == "DETR":
+            # Pipeline görüntü işlemcisi batch'i pixel_mask ile pad'ler
+            with telemetry.stage("inference_batch", model=self.model_type):
+                results = self.model(chunk, batch_size=len(chunk))
+            if len(chunk) == 1 and results and isinstance(results[0], dict):
+                results = [results]
+            with telemetry.stage("postprocess", model=self.model_type):
+                return [self._parse_detr(r) for r in results]
+
+        return None
+
+    def _prepare_inputs(self, images):
+        inputs, scales = [], []
+        for image in images:
+            if isinstance(image, AnalysisImage):
+                image, scale = image.model_input(self.model_type)
+            else:
+                scale = (1.0, 1.0)
+            inputs.append(image)
+            scales.append(scale)
+        return inputs, scales
+
+    @staticmethod
+    def _parse_yolo(results):
+        # Kutu başına tensör->Python dönüşümü yerine tüm sütunlar tek seferde CPU'ya alınır
+        boxes = results.boxes
+        class_map = get_vocabulary().model_map(results.names)
+        return Detections.from_xyxy(
+            boxes.xyxy.cpu().numpy(),
+            boxes.conf.cpu().numpy(),
+            class_map[boxes.cls.cpu().numpy().astype(np.int64)]
+        )
+
+    @staticmethod
+    def _parse_detr(results):
+        # Etiketler ortak sözlükteki id'lere çevrilir; aynı sınıfın tüm tespitleri aynı id'yi paylaşır
+        xyxy = [[res['box']['xmin'], res['box']['ymin'], res['box']['xmax'], res['box']['ymax']] for res in results]
+        confs = [res['score'] for res in results]
+        class_ids = get_vocabulary().ids_for([res['label'] for res in results])
+        return Detections.from_xyxy(xyxy, confs, class_ids)
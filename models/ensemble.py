@@ -0,0 +1,158 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config.settings import Config
+from models.detections import Detections, box_iou
+from utils.analysis_image import AnalysisImage
+from utils.telemetry import get_telemetry
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(members):
+    """Süreç geneli üye havuzu; Config.ENSEMBLE_WORKERS yoksa en büyük ensemble'ın üye sayısı kadar işçi"""
+    global _executor, _executor_workers
+    workers = Config.ENSEMBLE_WORKERS or members
+    with _executor_lock:
+        if _executor is None or _executor_workers < workers:
+            # Eski havuz kapatılmaz: ona iş göndermekte olan iş parçacıkları hata almaz, boştaki işçiler bekler
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ensemble")
+            _executor_workers = workers
+        return _executor
+
+
+def member_cache_key(detector):
+    """Üyenin önbellek anahtarı: cache_key() varsa o, yoksa karo ayarları"""
+    key = getattr(detector, "cache_key", None) or getattr(detector, "tiling_key", None)
+    return key() if key else None
+
+
+def canonical_ids(detections, aliases=None):
+    """Farklı sözlüklerdeki eş sınıfları (örn. COCO 'tv' -> PC 'monitor') tek id'ye eşler"""
+    aliases = Config.CLASS_ALIASES if aliases is None else aliases
+    vocab = detections.vocab
+    if not aliases or len(detections) == 0:
+        return detections.class_ids
+    ids, inverse = np.unique(detections.class_ids, return_inverse=True)
+    mapped = np.array([vocab.id_for(aliases.get(vocab.name(i), vocab.name(i))) for i in ids.tolist()], dtype=np.int32)
+    return mapped[inverse]
+
+
+def weighted_box_fusion(parts, weights, iou_threshold):
+    """Modellerin aynı nesneye ait kutularını güven ağırlıklı ortalamayla tek kutuda birleştirir (WBF).
+
+    parts çalışan her model için bir Detections'tır (boş olabilir); None olanlar çalışmamış sayılır.
+    """
+    parts = [(d, w) for d, w in zip(parts, weights) if d is not None]
+    total_weight = sum(w for _, w in parts)
+    parts = [(m, d, w) for m, (d, w) in enumerate(parts) if len(d)]
+    if not parts or total_weight <= 0:
+        return Detections.empty()
+
+    xyxy = np.concatenate([d.xyxy for _, d, _ in parts])
+    scores = np.concatenate([d.confs * w for _, d, w in parts])
+    box_weights = np.concatenate([np.full(len(d), w, dtype=np.float32) for _, d, w in parts])
+    box_models = np.concatenate([np.full(len(d), m) for m, d, _ in parts])
+    model_weights = {m: w for m, _, w in parts}
+    class_ids = np.concatenate([d.class_ids for _, d, _ in parts])
+
+    fused_boxes, fused_class, members = [], [], []
+    for i in np.argsort(-scores, kind="stable"):
+        match = None
+        candidates = [c for c, cls in enumerate(fused_class) if cls == class_ids[i]]
+        if candidates:
+            ious = box_iou(xyxy[i], np.array([fused_boxes[c] for c in candidates]))[0]
+            best = int(np.argmax(ious))
+            if ious[best] > iou_threshold:
+                match = candidates[best]
+
+        if match is None:
+            fused_boxes.append(xyxy[i].copy())
+            fused_class.append(class_ids[i])
+            members.append([i])
+        else:
+            members[match].append(i)
+            idx = members[match]
+            fused_boxes[match] = (xyxy[idx] * scores[idx, None]).sum(axis=0) / scores[idx].sum()
+
+    # Ağırlıklı ortalama güven, kümeye katılan modellerin ağırlık payıyla ölçeklenir:
+    # yalnızca düşük ağırlıklı modelin bulduğu kutu, yüksek ağırlıklı modelin bulduğundan düşük skor alır
+    fused_confs = [
+        scores[idx].sum() / box_weights[idx].sum()
+        * min(sum(model_weights[m] for m in set(box_models[idx].tolist())), total_weight) / total_weight
+        for idx in members
+    ]
+    return Detections.from_xyxy(np.array(fused_boxes), fused_confs, fused_class)
+
+
+class EnsembleDetector:
+    """Birden fazla dedektörü aynı çözülmüş görsel üzerinde eşzamanlı çalıştırıp sonuçlarını birleştirir"""
+    model_type = "Ensemble"
+
+    def __init__(self, detectors, method=None, iou_threshold=None, weights=None, aliases=None):
+        self.detectors = dict(detectors)
+        self.method = method or Config.ENSEMBLE_METHOD
+        self.iou_threshold = Config.ENSEMBLE_IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        self.weights = dict(Config.ENSEMBLE_WEIGHTS, **(weights or {}))
+        self.aliases = aliases
+        self.last_latencies = {}
+
+    def members(self):
+        """Ağırlık özetleri önbellek anahtarına katılacak üye dedektörler (ad sırasıyla)"""
+        return [d for _, d in sorted(self.detectors.items())]
+
+    def cache_key(self):
+        """Önbellek anahtarı için üyeler, birleştirme ayarları ve üyelerin kendi anahtarları"""
+        return (
+            sorted(self.detectors), self.method, self.iou_threshold, sorted(self.weights.items()),
+            sorted((self.aliases if self.aliases is not None else Config.CLASS_ALIASES).items()),
+            Config.ENSEMBLE_MIN_CONF, [member_cache_key(d) for d in self.members()]
+        )
+
+    def precision_key(self):
+        """Önbellek anahtarı için üyelerin çözümlenmiş hassasiyetleri"""
+        return [(name, getattr(d, "precision_key", lambda: None)()) for name, d in sorted(self.detectors.items())]
+
+    def detect(self, image):
+        detections = self.detect_arrays(image)
+        return detections.to_legacy()
+
+    def detect_arrays(self, image):
+        detections, self.last_latencies = self.detect_with_latencies(image)
+        return detections
+
+    def detect_with_latencies(self, image):
+        """Birleşik Detections ve {model: saniye} gecikme tablosunu döndürür"""
+        image = AnalysisImage.ensure(image)
+        telemetry = get_telemetry()
+
+        def run(name, detector):
+            start = time.perf_counter()
+            detections = detector.detect_arrays(image)
+            elapsed = time.perf_counter() - start
+            telemetry.observe("ensemble_member", elapsed, model=name)
+            return name, detections, elapsed
+
+        executor = _get_executor(len(self.detectors))
+        futures = [executor.submit(run, name, det) for name, det in self.detectors.items()]
+        results = [future.result() for future in futures]
+        latencies = {name: elapsed for name, _, elapsed in results}
+
+        with telemetry.stage("ensemble_fusion", method=self.method):
+            parts = [
+                Detections(d.xywh, d.confs, canonical_ids(d, self.aliases), d.vocab)
+                for _, d, _ in results if d is not None
+            ]
+            if self.method == "nms":
+                fused = Detections.concat(parts).nms(self.iou_threshold)
+            else:
+                # Yüklenemeyen/hata veren (None) üyeler ağırlık toplamına katılmaz
+                weights = [self.weights.get(name, 1.0) for name, d, _ in results if d is not None]
+                fused = weighted_box_fusion(parts, weights, self.iou_threshold)
+
+        return fused.filter(min_conf=Config.ENSEMBLE_MIN_CONF), latencies
@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+from transformers import DetrForObjectDetection, BlipForConditionalGeneration
+
+from config.settings import Config
+from models.artifacts import get_artifact_manager
+
+ONNX_DIR = os.path.join("models", "onnx")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_weights(model_type, model_path=None):
+    """Modelin kaynak ağırlığını döndürür: yerel .pt yolu veya HuggingFace model adı"""
+    if model_path:
+        return model_path
+    return {
+        "YOLO11": Config.YOLO11_MODEL_PATH,
+        "MY YOLO (PC Setup)": Config.PC_MODEL_PATH,
+        "DETR": Config.DETR_MODEL_NAME,
+        "BLIP": Config.BLIP_MODEL
+    }[model_type]
+
+
+def artifact_path(model_type, model_path=None, quantize=False):
+    """ONNX dosyasının yolu: .pt ağırlıklarının yanında, HF modelleri için models/onnx altında"""
+    source = source_weights(model_type, model_path)
+    suffix = ".int8.onnx" if quantize else ".onnx"
+    if source.endswith(".pt"):
+        return os.path.splitext(source)[0] + suffix
+    name = source.replace("/", "__")
+    if model_type == "BLIP":
+        name += "__vision"
+    return os.path.join(ONNX_DIR, name + suffix)
+
+
+def _source_checksum(source):
+    return file_sha256(source) if os.path.isfile(source) else source
+
+
+def _is_fresh(path, source_checksum):
+    meta_path = path + ".json"
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return meta.get("source_checksum") == source_checksum and meta.get("sha256") == file_sha256(path)
+
+
+def _write_meta(path, source, source_checksum, quantize):
+    with open(path + ".json", 'w') as f:
+        json.dump({
+            "source": source,
+            "source_checksum": source_checksum,
+            "sha256": file_sha256(path),
+            "int8": quantize
+        }, f, indent=2)
+
+
+def ensure_exported(model_type, model_path=None, quantize=None):
+    """ONNX çıktısı yoksa veya kaynak ağırlık değiştiyse export eder, dosya yolunu döndürür"""
+    quantize = Config.ONNX_QUANTIZE_INT8 if quantize is None else quantize
+    source = source_weights(model_type, model_path)
+    if source.endswith(".pt"):
+        # yolo11n.pt artefakt önbelleğinden bağlanır; bilinmeyen ağırlıkları ultralytics indirir
+        get_artifact_manager().resolve(source)
+    if source.endswith(".pt") and not os.path.exists(source):
+        from ultralytics import YOLO
+        YOLO(source)
+
+    checksum = _source_checksum(source)
+    target = artifact_path(model_type, model_path, quantize)
+    if _is_fresh(target, checksum):
+        return target
+
+    print(f"📦 {model_type} ONNX formatına aktarılıyor -> {target}")
+    fp32_target = artifact_path(model_type, model_path, quantize=False)
+    if not _is_fresh(fp32_target, checksum):
+        os.makedirs(os.path.dirname(fp32_target) or '.', exist_ok=True)
+        if model_type in ("YOLO11", "MY YOLO (PC Setup)"):
+            _export_yolo(source, fp32_target)
+        elif model_type == "DETR":
+            _export_detr(source, fp32_target)
+        elif model_type == "BLIP":
+            _export_blip_vision(source, fp32_target)
+        else:
+            raise ValueError(f"ONNX export desteklenmiyor: {model_type}")
+        _write_meta(fp32_target, source, checksum, False)
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(fp32_target, target, weight_type=QuantType.QInt8)
+        _write_meta(target, source, checksum, True)
+
+    print(f"✅ ONNX hazır: {target}")
+    return target
+
+
+def _export_yolo(weights, target):
+    from ultralytics import YOLO
+    exported = YOLO(weights).export(format="onnx", imgsz=Config.IMG_SIZE, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(target):
+        os.replace(exported, target)
+
+
+class _DetrHead(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values, pixel_mask):
+        outputs = self.model(pixel_values=pixel_values, pixel_mask=pixel_mask)
+        return outputs.logits, outputs.pred_boxes
+
+
+def _export_detr(model_name, target):
+    model = DetrForObjectDetection.from_pretrained(get_artifact_manager().resolve(model_name)).eval()
+    pixel_values = torch.randn(1, 3, 800, 800)
+    pixel_mask = torch.ones(1, 800, 800, dtype=torch.int64)
+    with torch.no_grad():
+        torch.onnx.export(
+            _DetrHead(model), (pixel_values, pixel_mask), target,
+            input_names=["pixel_values", "pixel_mask"],
+            output_names=["logits", "pred_boxes"],
+            dynamic_axes={
+                "pixel_values": {0: "batch", 2: "height", 3: "width"},
+                "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+                "logits": {0: "batch"},
+                "pred_boxes": {0: "batch"}
+            },
+            opset_version=17
+        )
+
+
+class _BlipVision(torch.nn.Module):
+    def __init__(self, vision_model):
+        super().__init__()
+        self.vision_model = vision_model
+
+    def forward(self, pixel_values):
+        outputs = self.vision_model(pixel_values=pixel_values)
+        return outputs.last_hidden_state, outputs.pooler_output
+
+
+def _export_blip_vision(model_name, target):
+    # generate() döngüsünün ONNX karşılığı yok; en pahalı kısım olan ViT encoder aktarılır
+    model = BlipForConditionalGeneration.from_pretrained(
+        get_artifact_manager().resolve(model_name), torch_dtype=torch.float32
+    ).eval()
+    pixel_values = torch.randn(1, 3, 384, 384)
+    with torch.no_grad():
+        torch.onnx.export(
+            _BlipVision(model.vision_model), (pixel_values,), target,
+            input_names=["pixel_values"],
+            output_names=["last_hidden_state", "pooler_output"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "last_hidden_state": {0: "batch"}, "pooler_output": {0: "batch"}},
+            opset_version=17
+        )
+
+
+def _match(reference, candidate, iou_threshold):
+    """Aynı sınıftaki kutuları IoU ile eşler; (eşleşen oran, ort. IoU, ort. güven farkı) döndürür"""
+    from models.detections import box_iou
+    if len(reference) == 0:
+        return (1.0 if len(candidate) == 0 else 0.0), 1.0, 0.0
+    if len(candidate) == 0:
+        return 0.0, 0.0, 0.0
+
+    ious = box_iou(reference.xyxy, candidate.xyxy)
+    ious[reference.class_ids[:, None] != candidate.class_ids[None, :]] = 0.0
+    best = ious.argmax(axis=1)
+    best_iou = ious[np.arange(len(reference)), best]
+    matched = best_iou >= iou_threshold
+    if not matched.any():
+        return 0.0, 0.0, 0.0
+    conf_diff = np.abs(reference.confs[matched] - candidate.confs[best[matched]])
+    return float(matched.mean()), float(best_iou[matched].mean()), float(conf_diff.mean())
+
+
+def check_parity(model_type, images, model_path=None, quantize=None, iou_threshold=0.5):
+    """PyTorch ve ONNX çıktılarını aynı görsellerde karşılaştırır"""
+    from PIL import Image
+    from models.model_loader import ModelLoader
+
+    images = [Image.open(p).convert('RGB') if isinstance(p, str) else p for p in images]
+    torch_model = ModelLoader.load_model(model_type, model_path, backend="pytorch")
+    onnx_model = ModelLoader.load_model(model_type, model_path, backend="onnx", quantize=quantize)
+
+    if model_type == "BLIP":
+        torch_captions = torch_model.generate_captions_batch(images)
+        onnx_captions = onnx_model.generate_captions_batch(images)
+        inputs = torch_model.processor(images, return_tensors="pt")
+        with torch.no_grad():
+            reference = torch_model.model.vision_model(pixel_values=inputs["pixel_values"].to(torch_model.device))[0]
+            candidate = onnx_model.model.vision_model(pixel_values=inputs["pixel_values"].to(onnx_model.device))[0]
+        return {
+            "model": model_type,
+            "images": len(images),
+            "caption_exact_match": float(np.mean([a == b for a, b in zip(torch_captions, onnx_captions)])),
+            "embedding_max_abs_diff": float((reference.float() - candidate.float()).abs().max())
+        }
+
+    from models.detector import ObjectDetector
+    effective_type = "YOLO11" if "YOLO" in model_type else model_type
+    reference = ObjectDetector(torch_model, effective_type).detect_arrays_batch(images)
+    candidate = ObjectDetector(onnx_model, effective_type).detect_arrays_batch(images)
+    stats = np.array([_match(r, c, iou_threshold) for r, c in zip(reference, candidate)])
+    return {
+        "model": model_type,
+        "images": len(images),
+        "matched_ratio": float(stats[:, 0].mean()),
+        "mean_iou": float(stats[:, 1].mean()),
+        "mean_conf_abs_diff": float(stats[:, 2].mean())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelleri ONNX'e aktarır ve PyTorch ile doğruluk karşılaştırması yapar")
+    parser.add_argument("--model", default="YOLO11", choices=["YOLO11", "MY YOLO (PC Setup)", "DETR", "BLIP"])
+    parser.add_argument("--weights", help="Varsayılan dışındaki ağırlık dosyası")
+    parser.add_argument("--int8", action="store_true", help="Dinamik INT8 quantization uygula")
+    parser.add_argument("--check", metavar="DIR", help="Bu klasördeki görsellerle parity kontrolü yap")
+    parser.add_argument("--limit", type=int, default=16)
+    args = parser.parse_args()
+
+    path = ensure_exported(args.model, args.weights, args.int8)
+    print(f"📁 {path}")
+
+    if args.check:
+        from utils.image_files import list_images
+        report = check_parity(args.model, list_images(args.check)[:args.limit], args.weights, args.int8)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,71 @@
 import cv2
-from ultralytics import YOLO
-from transformers import pipeline
 from config.settings import Config
+from models.detections import get_vocabulary
+from models.artifacts import get_artifact_manager
+from models.weights import resolve_precision, load_pretrained, apply_precision
+from utils.telemetry import get_telemetry
 
 class ModelLoader:
     @staticmethod
-    def load_model(model_type, model_path=None): 
+    def load_model(model_type, model_path=None, device=None, dtype=None, backend=None, quantize=None): 
         """Kullanıcının seçtiği modele göre doğru ağırlık dosyasını yükler"""
+        backend = backend or Config.INFERENCE_BACKEND
+        with get_telemetry().stage("model_load", model=model_type, backend=backend):
+            return ModelLoader._load(model_type, model_path, device, dtype, backend, quantize)
+
+    @staticmethod
+    def _load(model_type, model_path, device, dtype, backend, quantize):
         try:
+            # Ağır kütüphaneler yalnızca ilgili dal ilk kez kullanıldığında import edilir
             if model_type == "MY YOLO (PC Setup)" or model_type == "YOLO11":
+                from ultralytics import YOLO
                 if model_path:
-                    return YOLO(model_path)
+                    weights = model_path
                 elif model_type == "MY YOLO (PC Setup)":
-                    return YOLO("models/yolo11_pc.pt")
+                    weights = Config.PC_MODEL_PATH
+                else:
+                    weights = Config.YOLO11_MODEL_PATH
+                weights = get_artifact_manager().resolve(weights)
+
+                if backend == "onnx":
+                    from models.export import ensure_exported
+                    model = YOLO(ensure_exported(model_type, model_path, quantize), task="detect")
                 else:
-                    return YOLO("yolo11n.pt")
+                    model = YOLO(weights)
+                    if device:
+                        model.to(device)
+                get_vocabulary().model_map(model.names)
+                return model
             
 
             elif model_type == "DETR":
-                return pipeline("object-detection", model=Config.DETR_MODEL_NAME)
+                from transformers import pipeline
+                if backend == "onnx":
+                    from models.export import ensure_exported
+                    from models.onnx_backends import OnnxDetrPipeline
+                    model = OnnxDetrPipeline(ensure_exported(model_type, model_path, quantize), model_path)
+                else:
+                    from transformers import AutoImageProcessor, AutoModelForObjectDetection
+                    kwargs = {}
+                    if device:
+                        kwargs["device"] = device
+                    precision = resolve_precision(model_type, device, dtype)
+                    model_source = get_artifact_manager().resolve(model_path or Config.DETR_MODEL_NAME)
+                    detr = load_pretrained(AutoModelForObjectDetection, model_source, precision)
+                    model = pipeline(
+                        "object-detection",
+                        model=apply_precision(detr, precision),
+                        image_processor=AutoImageProcessor.from_pretrained(model_source),
+                        **kwargs
+                    )
+                    # Sonuç önbelleği anahtarı hassasiyeti buradan okur
+                    model.precision = precision
+                get_vocabulary().model_map(model.model.config.id2label)
+                return model
+            
+            elif model_type == "BLIP":
+                from captioning.caption_generator import CaptionGenerator
+                return CaptionGenerator(device=device, dtype=dtype, backend=backend, quantize=quantize)
             
             elif model_type == "YOLOv3":
                 net = cv2.dnn.readNet(Config.YOLO_WEIGHTS, Config.YOLO_CONFIG)
@@ -28,4 +75,4 @@ class ModelLoader:
                 
         except Exception as e:
             print(f"❌ {model_type} yükleme hatası: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,83 @@
+import types
+
+import numpy as np
+import torch
+import onnxruntime as ort
+from transformers import DetrImageProcessor, AutoConfig
+from transformers.image_utils import load_image
+from transformers.modeling_outputs import BaseModelOutputWithPooling
+from transformers.models.detr.modeling_detr import DetrObjectDetectionOutput
+
+from config.settings import Config
+from models.artifacts import get_artifact_manager
+
+
+def create_session(onnx_path, num_threads=None):
+    """Tüm graf optimizasyonları açık bir CPU ONNX Runtime oturumu oluşturur"""
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+    return ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+
+class OnnxDetrPipeline:
+    """transformers object-detection pipeline'ı ile aynı çağrı arayüzüne sahip ONNX DETR çalıştırıcısı"""
+    def __init__(self, onnx_path, model_name=None):
+        # Ağırlıklar PyTorch yolu ile aynı doğrulanmış artefakt önbelleğinden okunur
+        model_name = get_artifact_manager().resolve(model_name or Config.DETR_MODEL_NAME)
+        self.session = create_session(onnx_path)
+        self.processor = DetrImageProcessor.from_pretrained(model_name)
+        config = AutoConfig.from_pretrained(model_name)
+        self.id2label = config.id2label
+        # ModelLoader ve registry 'model.config' üzerinden sınıf adlarına erişir
+        self.model = types.SimpleNamespace(config=config)
+
+    def __call__(self, images, batch_size=None, threshold=0.5):
+        single = not isinstance(images, list)
+        images = [load_image(img) for img in ([images] if single else images)]
+        batch_size = batch_size or len(images)
+        results = []
+
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            inputs = self.processor(images=chunk, return_tensors="np")
+            logits, pred_boxes = self.session.run(
+                ["logits", "pred_boxes"],
+                {"pixel_values": inputs["pixel_values"].astype(np.float32),
+                 "pixel_mask": inputs["pixel_mask"].astype(np.int64)}
+            )
+            outputs = DetrObjectDetectionOutput(logits=torch.from_numpy(logits), pred_boxes=torch.from_numpy(pred_boxes))
+            target_sizes = torch.tensor([[img.height, img.width] for img in chunk])
+            processed = self.processor.post_process_object_detection(outputs, threshold=threshold, target_sizes=target_sizes)
+
+            for item in processed:
+                results.append([
+                    {
+                        "score": score,
+                        "label": self.id2label[label],
+                        "box": {"xmin": int(box[0]), "ymin": int(box[1]), "xmax": int(box[2]), "ymax": int(box[3])}
+                    }
+                    for score, label, box in zip(item["scores"].tolist(), item["labels"].tolist(), item["boxes"].tolist())
+                ])
+
+        return results[0] if single else results
+
+
+class OnnxVisionEncoder(torch.nn.Module):
+    """BLIP vision encoder'ının yerine geçen ONNX Runtime modülü; metin decoder'ı PyTorch'ta kalır"""
+    def __init__(self, onnx_path):
+        super().__init__()
+        self.session = create_session(onnx_path)
+
+    def forward(self, pixel_values=None, output_attentions=None, output_hidden_states=None,
+                return_dict=None, interpolate_pos_encoding=False):
+        hidden, pooled = self.session.run(
+            ["last_hidden_state", "pooler_output"],
+            {"pixel_values": pixel_values.detach().to("cpu", torch.float32).numpy()}
+        )
+        device, dtype = pixel_values.device, pixel_values.dtype
+        return BaseModelOutputWithPooling(
+            last_hidden_state=torch.from_numpy(hidden).to(device, dtype),
+            pooler_output=torch.from_numpy(pooled).to(device, dtype)
+        )
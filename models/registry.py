@@ -0,0 +1,214 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+from config.settings import Config
+from models.model_loader import ModelLoader
+
+
+class ModelHandle:
+    """Registry'den alınan paylaşımlı (salt okunur) model referansı"""
+    def __init__(self, registry, key, model):
+        self._registry = registry
+        self.key = key
+        self.model = model
+        self._released = False
+
+    @property
+    def model_type(self):
+        return self.key[0]
+
+    def release(self):
+        """Referansı registry'ye geri verir, birden fazla çağrı güvenlidir"""
+        if not self._released:
+            self._released = True
+            self._registry.release(self.key)
+
+    def __enter__(self):
+        return self.model
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class HandleGroup:
+    """Bir oturumun aldığı handle'ları toplar; release_all çağrılınca ya da grup çöp toplanınca geri verir.
+
+    Streamlit oturum bitişi için kanca sunmaz; oturum durumu atıldığında finalizer referansları bırakır.
+    """
+    def __init__(self):
+        self._handles = []
+        # Finalizer grubun kendisine değil yalnızca listeye referans tutar
+        self._finalizer = weakref.finalize(self, _release_all, self._handles)
+
+    def add(self, handle):
+        self._handles.append(handle)
+        return handle
+
+    def release_all(self):
+        _release_all(self._handles)
+
+
+def _release_all(handles):
+    while handles:
+        handles.pop().release()
+
+
+class _Entry:
+    __slots__ = ("model", "refs", "size_mb", "ready", "error")
+
+    def __init__(self):
+        self.model = None
+        self.refs = 0
+        self.size_mb = 0.0
+        self.ready = threading.Event()
+        self.error = None
+
+
+class ModelRegistry:
+    """Her (model tipi, ağırlık yolu, aygıt, dtype) için modeli süreç başına bir kez yükler"""
+    def __init__(self, memory_budget_mb=None):
+        self.memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else Config.MODEL_MEMORY_BUDGET_MB
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_type, model_path=None, device=None, dtype=None):
+        return (model_type, model_path, device, dtype)
+
+    def acquire(self, model_type, model_path=None, device=None, dtype=None):
+        """Modeli (gerekirse yükleyerek) döndürür ve referans sayacını artırır"""
+        key = self.make_key(model_type, model_path, device, dtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_loader = entry is None
+            if is_loader:
+                entry = _Entry()
+                self._entries[key] = entry
+            entry.refs += 1
+            self._entries.move_to_end(key)
+
+        if is_loader:
+            self._load(key, entry)
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            with self._lock:
+                entry.refs -= 1
+            raise RuntimeError(f"{model_type} yüklenemedi: {entry.error}")
+
+        return ModelHandle(self, key, entry.model)
+
+    def release(self, key):
+        """Referans sayacını azaltır, boşta kalan modeller bütçe aşılırsa atılır"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            self._evict_locked()
+
+    def _load(self, key, entry):
+        model_type, model_path, device, dtype = key
+        print(f"📥 Registry: {model_type} yükleniyor...")
+        try:
+            model = ModelLoader.load_model(model_type, model_path, device=device, dtype=dtype)
+            if model is None:
+                raise RuntimeError("ModelLoader None döndürdü")
+            entry.model = model
+            entry.size_mb = estimate_model_size_mb(model)
+        except Exception as e:
+            entry.error = e
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+        finally:
+            entry.ready.set()
+
+        if entry.error is None:
+            print(f"✅ Registry: {model_type} hazır ({entry.size_mb:.0f} MB)")
+            with self._lock:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        """LRU sırasıyla, referansı olmayan modelleri bellek bütçesine inene kadar atar"""
+        total = sum(e.size_mb for e in self._entries.values())
+        if total <= self.memory_budget_mb:
+            return
+        for key in list(self._entries.keys()):
+            entry = self._entries[key]
+            if entry.refs > 0 or not entry.ready.is_set():
+                continue
+            del self._entries[key]
+            total -= entry.size_mb
+            print(f"♻️ Registry: {key[0]} bellekten atıldı ({entry.size_mb:.0f} MB)")
+            if total <= self.memory_budget_mb:
+                break
+
+    def preload(self, specs=None, background=True):
+        """Verilen modelleri başlangıçta ısıtır; specs (model_type, model_path, device, dtype) listesidir"""
+        specs = Config.PRELOAD_MODELS if specs is None else specs
+
+        def _run():
+            for spec in specs:
+                if isinstance(spec, str):
+                    spec = (spec,)
+                try:
+                    self.acquire(*spec).release()
+                except Exception as e:
+                    print(f"❌ Ön yükleme hatası ({spec[0]}): {e}")
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        """Yüklü modellerin referans ve bellek bilgisini döndürür"""
+        with self._lock:
+            return [
+                {"model_type": k[0], "model_path": k[1], "device": k[2], "dtype": k[3],
+                 "refs": e.refs, "size_mb": e.size_mb, "loaded": e.ready.is_set()}
+                for k, e in self._entries.items()
+            ]
+
+    def clear(self):
+        """Referansı olmayan tüm modelleri atar"""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refs == 0 and e.ready.is_set()]:
+                del self._entries[key]
+
+
+def estimate_model_size_mb(model):
+    """Model içindeki torch parametre ve buffer'larının kapladığı belleği tahmin eder"""
+    module = model
+    for _ in range(3):
+        if module is None or hasattr(module, "parameters"):
+            break
+        module = getattr(module, "model", None)
+    if not hasattr(module, "parameters"):
+        return 0.0
+    size = sum(p.numel() * p.element_size() for p in module.parameters())
+    size += sum(b.numel() * b.element_size() for b in module.buffers())
+    # Dinamik int8 Linear katmanlarının paketlenmiş ağırlıkları parameters() içinde görünmez
+    for submodule in module.modules():
+        if hasattr(submodule, "_packed_params") and callable(getattr(submodule, "weight", None)):
+            weight = submodule.weight()
+            size += weight.numel() * weight.element_size()
+    return size / (1024 * 1024)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Süreç genelindeki tek ModelRegistry örneğini döndürür"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
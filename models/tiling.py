@@ -0,0 +1,100 @@
+import numpy as np
+from PIL import Image
+
+from config.settings import Config
+from models.detections import Detections, box_iou, box_ios
+
+
+def tile_grid(width, height, tile_size=None, overlap=None):
+    """Görseli örtüşen karelere bölen (x1, y1, x2, y2) listesini döndürür; son karo kenara hizalanır"""
+    tile_size = tile_size or Config.TILE_SIZE
+    overlap = Config.TILE_OVERLAP if overlap is None else overlap
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        return list(range(0, length - tile_size, stride)) + [length - tile_size]
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height) for x in starts(width)
+    ]
+
+
+def iter_tile_batches(image, batch_size, tile_size=None, overlap=None):
+    """Karoları batch_size'lık gruplar halinde üretir: [(PIL karo, (x1, y1))].
+
+    Karolar orijinal piksellerin görünümünden kopyalanır; aynı anda yalnızca bir grup bellekte tutulur.
+    """
+    tiles = tile_grid(image.width, image.height, tile_size, overlap)
+    for start in range(0, len(tiles), batch_size):
+        yield [
+            (Image.fromarray(np.ascontiguousarray(image.rgb[y1:y2, x1:x2])), (x1, y1))
+            for x1, y1, x2, y2 in tiles[start:start + batch_size]
+        ]
+
+
+def clipped_mask(xyxy, region, bounds, margin=2.0):
+    """Karonun görsel içinde kalan bir kenarına değen (yani karo sınırında kesilmiş olabilecek) kutular"""
+    x1, y1, x2, y2 = region
+    width, height = bounds
+    mask = np.zeros(len(xyxy), dtype=bool)
+    if x1 > 0:
+        mask |= xyxy[:, 0] <= x1 + margin
+    if y1 > 0:
+        mask |= xyxy[:, 1] <= y1 + margin
+    if x2 < width:
+        mask |= xyxy[:, 2] >= x2 - margin
+    if y2 < height:
+        mask |= xyxy[:, 3] >= y2 - margin
+    return mask
+
+
+def merge_tiles(parts, regions=None, iou_threshold=None, ios_threshold=None):
+    """Karo (ve tam görsel) sonuçlarını sınıf bazlı birleştirir; regions her parçanın görseldeki (x1, y1, x2, y2) alanıdır.
+
+    IoU eşiğini geçen kutular düz NMS'teki gibi elenir. Karo kenarında kesilmiş bir kutu başka bir kaynaktaki
+    aynı sınıftan kutuyla IoS eşiğini geçerse aynı nesnenin parçası sayılır ve kutular birleşimde toplanır.
+    """
+    iou_threshold = Config.NMS_THRESHOLD if iou_threshold is None else iou_threshold
+    ios_threshold = Config.TILE_MERGE_IOS if ios_threshold is None else ios_threshold
+    merged = Detections.concat(parts)
+    if len(merged) < 2:
+        return merged
+
+    xyxy = merged.xyxy
+    sources = np.concatenate([np.full(len(d), i) for i, d in enumerate(parts)])
+    clipped = np.zeros(len(merged), dtype=bool)
+    if regions is not None:
+        bounds = (max(r[2] for r in regions), max(r[3] for r in regions))
+        clipped = np.concatenate([clipped_mask(d.xyxy, r, bounds) for d, r in zip(parts, regions)])
+
+    order = np.argsort(-merged.confs, kind="stable")
+    keep, boxes = [], []
+    while order.size:
+        best, rest = order[0], order[1:]
+        open_ = merged.class_ids[rest] == merged.class_ids[best]
+        fragments = np.zeros(len(rest), dtype=bool)
+        group = [best]
+        # Birden fazla karoya yayılan nesnede her yeni parça kalanlarla tekrar karşılaştırılır
+        while open_.any():
+            members = np.asarray(group)
+            pair = ((sources[members][:, None] != sources[rest][None, :])
+                    & (clipped[members][:, None] | clipped[rest][None, :])
+                    & (box_ios(xyxy[members], xyxy[rest]) > ios_threshold))
+            new = open_ & pair.any(axis=0)
+            if not new.any():
+                break
+            fragments |= new
+            open_ &= ~new
+            group.extend(rest[new].tolist())
+        duplicates = open_ & (box_iou(xyxy[best], xyxy[rest])[0] > iou_threshold)
+
+        parts_xyxy = xyxy[group]
+        keep.append(best)
+        boxes.append(np.concatenate([parts_xyxy[:, :2].min(axis=0), parts_xyxy[:, 2:].max(axis=0)]))
+        order = rest[~(fragments | duplicates)]
+
+    keep = np.asarray(keep, dtype=np.int64)
+    return Detections.from_xyxy(np.array(boxes), merged.confs[keep], merged.class_ids[keep], merged.vocab)
@@ -0,0 +1,116 @@
+import contextlib
+import json
+import mmap
+import os
+import struct
+
+from config.settings import Config
+
+PRECISIONS = ("auto", "float32", "float16", "bfloat16", "int8")
+
+# safetensors başlığındaki dtype adı -> torch dtype adı
+SAFETENSORS_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool"
+}
+
+
+def resolve_precision(model_type, device, precision=None):
+    """'auto'/None değerini aygıta göre somut hassasiyete çevirir: GPU/MPS'te float16, CPU'da float32"""
+    precision = precision or Config.MODEL_PRECISION.get(model_type, "auto")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Bilinmeyen hassasiyet: {precision} (seçenekler: {', '.join(PRECISIONS)})")
+    on_cpu = device in (None, "cpu")
+    if precision == "auto":
+        return "float32" if on_cpu else "float16"
+    if precision == "int8" and not on_cpu:
+        print(f"⚠️ {model_type}: dinamik int8 yalnızca CPU'da destekleniyor, float16 kullanılacak")
+        return "float16"
+    return precision
+
+
+def torch_dtype(precision):
+    """Ağırlıkların yükleneceği torch dtype'ı; int8 için önce float32 yüklenip sonra nicemlenir"""
+    import torch
+    return torch.float32 if precision == "int8" else getattr(torch, precision)
+
+
+def apply_precision(model, precision):
+    """int8 ise Linear katmanlarını yerinde dinamik nicemler (aktivasyonlar float32 kalır)"""
+    if precision != "int8":
+        return model
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def mmap_state_dict(path):
+    """safetensors dosyasını kopyalamadan, dosya destekli (copy-on-write) tensörler olarak açar.
+
+    Sayfalar işletim sisteminin sayfa önbelleğinden gelir; aynı dosyayı açan süreçler fiziksel belleği paylaşır.
+    """
+    import torch
+
+    with open(path, 'rb') as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_len
+    state = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info["dtype"]])
+        start, end = info["data_offsets"]
+        count = (end - start) // torch.empty((), dtype=dtype).element_size()
+        if count:
+            # frombuffer mmap nesnesine referans tutar; tensörler yaşadıkça eşleme açık kalır
+            tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + start)
+        else:
+            tensor = torch.empty(0, dtype=dtype)
+        state[name] = tensor.reshape(info["shape"])
+    return state
+
+
+def load_pretrained(model_class, source, precision="float32"):
+    """HF modelini yükler; dtype dönüşümü gerekmiyorsa ağırlıklar model.safetensors'a mmap ile bağlanır"""
+    dtype = torch_dtype(precision)
+    weights_path = os.path.join(source, "model.safetensors")
+    if Config.MODEL_MMAP_WEIGHTS and os.path.isfile(weights_path):
+        state = mmap_state_dict(weights_path)
+        if all(t.dtype == dtype for t in state.values() if t.is_floating_point()):
+            model = _from_state_dict(model_class, source, state)
+            if model is not None:
+                return model
+        else:
+            print(f"ℹ️ {source}: dtype dönüşümü ({precision}) gerektiği için ağırlıklar mmap yerine kopyalanıyor")
+    return model_class.from_pretrained(source, torch_dtype=dtype)
+
+
+def _from_state_dict(model_class, source, state):
+    """Modeli config'ten kurup parametreleri mmap tensörleriyle değiştirir; eşleşmezse None döner"""
+    from transformers import AutoConfig
+
+    config = AutoConfig.from_pretrained(source)
+    if getattr(config, "use_pretrained_backbone", False):
+        # Omurga ağırlıkları zaten dosyada; timm'den ayrıca indirilmez
+        config.use_pretrained_backbone = False
+    try:
+        from transformers.modeling_utils import no_init_weights
+    except ImportError:
+        no_init_weights = contextlib.nullcontext
+    # Rastgele başlatma atlanır; parametreler hemen ardından dosyadakilerle değiştirilir
+    with no_init_weights():
+        model = model_class.from_config(config) if hasattr(model_class, "from_config") else model_class(config)
+
+    missing, unexpected = model.load_state_dict(state, strict=False, assign=True)
+    model.tie_weights()
+
+    loaded = {t.data_ptr() for t in state.values()}
+    current = model.state_dict()
+    untouched = [k for k in missing if not k.endswith("num_batches_tracked") and current[k].data_ptr() not in loaded]
+    if unexpected or untouched:
+        print(f"⚠️ {source}: mmap yüklemesinde anahtarlar eşleşmedi "
+              f"({len(untouched)} eksik, {len(unexpected)} fazla), from_pretrained kullanılıyor")
+        return None
+    return model.eval()
@@ -0,0 +1,122 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+def percentile(values, pct):
+    """Sıralı olmayan bir listeden yüzdelik değeri (nearest-rank) hesaplar"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class MicroBatcher:
+    """Eşzamanlı istekleri max batch boyutu / max bekleme süresiyle sınırlı mikro-batch'lerde toplar"""
+    def __init__(self, process_batch, max_batch_size=8, max_wait_ms=10, name="batcher", latency_window=1000):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_sizes = {}
+        self._processed = 0
+        self._errors = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Girdiyi kuyruğa ekler, sonucu taşıyan bir Future döndürür"""
+        future = Future()
+        with self._lock:
+            # Durdurma işaretinden sonra kuyruğa giren iş hiç işlenmez ve çağıranı sonsuza kadar bekletirdi
+            if self._closed:
+                raise RuntimeError(f"{self.name} kapatıldı, yeni istek kabul edilmiyor")
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                nxt = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(nxt)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.process_batch(items)
+                error = None
+                # Eksik/fazla sonuç sessizce yanlış isteğe gitmesin; tüm batch hata alır, worker çalışmaya devam eder
+                if results is None or len(results) != len(batch):
+                    raise RuntimeError(f"{len(batch)} girdi için {0 if results is None else len(results)} sonuç döndü")
+            except Exception as e:
+                print(f"❌ {self.name} batch hatası: {e}")
+                results, error = None, e
+
+            done = time.perf_counter()
+            with self._lock:
+                self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+                self._processed += len(batch)
+                if error is not None:
+                    self._errors += len(batch)
+                for _, _, submitted in batch:
+                    self._latencies.append(done - submitted)
+
+            for i, (_, future, _) in enumerate(batch):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+
+    def stats(self):
+        """Kuyruk derinliği, batch boyutu histogramı ve p50/p99 gecikmeyi (ms) döndürür"""
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "processed": self._processed,
+                "errors": self._errors,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "latency_p50_ms": percentile(latencies, 50) * 1000,
+                "latency_p99_ms": percentile(latencies, 99) * 1000
+            }
+
+    def close(self, timeout=None):
+        """Kuyruktaki işler bittikten sonra worker thread'i durdurur; sonraki submit çağrıları hata verir"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -0,0 +1,40 @@
+import numpy as np
+import requests
+
+from config.settings import Config
+
+
+class InferenceClient:
+    """Inference server'a görsel gönderen ince istemci"""
+    def __init__(self, base_url=None, timeout=60):
+        self.base_url = (base_url or Config.INFERENCE_SERVER_URL).rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path, image_bytes, model_type=None, preset=None):
+        params = {key: value for key, value in (("model", model_type), ("preset", preset)) if value}
+        response = requests.post(f"{self.base_url}{path}", data=image_bytes, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _to_result(payload):
+        payload["classes"] = {int(k): v for k, v in payload.get("classes", {}).items()}
+        payload["indexes"] = np.arange(len(payload.get("boxes", [])))
+        return payload
+
+    def detect(self, image_bytes, model_type="YOLO11"):
+        """(boxes, confs, class_ids, classes, indexes) döndürür"""
+        r = self._to_result(self._post("/detect", image_bytes, model_type))
+        return r["boxes"], r["confs"], r["class_ids"], r["classes"], r["indexes"]
+
+    def caption(self, image_bytes, preset=None):
+        return self._post("/caption", image_bytes, preset=preset)["ai_caption"]
+
+    def analyze(self, image_bytes, model_type="YOLO11", preset=None):
+        """Tespit ve caption sonucunu app.py'nin beklediği sözlük formatında döndürür"""
+        return self._to_result(self._post("/analyze", image_bytes, model_type, preset))
+
+    def metrics(self):
+        response = requests.get(f"{self.base_url}/stats", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
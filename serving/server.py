@@ -0,0 +1,255 @@
+import argparse
+import functools
+import io
+import json
+import multiprocessing
+import signal
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from PIL import Image, UnidentifiedImageError
+
+from config.settings import Config
+from models.registry import get_registry
+from models.detector import ObjectDetector
+from serving.batcher import MicroBatcher
+from utils.telemetry import get_telemetry
+
+DETECTION_MODELS = ("YOLO11", "DETR", "MY YOLO (PC Setup)")
+
+
+class InferenceService:
+    """ObjectDetector ve CaptionGenerator'ı model başına birer MicroBatcher arkasında sunar"""
+    def __init__(self, max_batch_size=None, max_wait_ms=None, registry=None):
+        self.max_batch_size = max_batch_size or Config.BATCH_SIZE
+        self.max_wait_ms = Config.MAX_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.registry = registry or get_registry()
+
+        self._handles = {}
+        self._batchers = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def _get_batcher(self, name, preset=None):
+        # Her decoding modu kendi kuyruğunda batch'lenir; aynı batch'teki istekler aynı generate ayarını paylaşır
+        key = f"{name}:{preset}" if preset else name
+        with self._lock:
+            batcher = self._batchers.get(key)
+            if batcher is not None:
+                return batcher
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Model yüklemesi yalnızca aynı anahtarı isteyenleri bekletir; diğer modellerin istekleri akmaya devam eder
+        with load_lock:
+            with self._lock:
+                batcher = self._batchers.get(key)
+            if batcher is not None:
+                return batcher
+
+            handle = self.registry.acquire(name)
+            if name == "BLIP":
+                process = functools.partial(handle.model.generate_captions_batch, preset=preset)
+            else:
+                effective_type = "YOLO11" if "YOLO" in name else name
+                process = ObjectDetector(handle.model, effective_type).detect_batch
+
+            batcher = MicroBatcher(process, self.max_batch_size, self.max_wait_ms, name=key)
+            with self._lock:
+                self._handles[key] = handle
+                self._batchers[key] = batcher
+            return batcher
+
+    def submit_detection(self, image, model_type="YOLO11"):
+        """Tespit isteğini kuyruğa ekler, (boxes, confs, class_ids, classes, indexes) Future'ı döndürür"""
+        if model_type not in DETECTION_MODELS:
+            raise ValueError(f"Bilinmeyen model: {model_type} (geçerli: {', '.join(DETECTION_MODELS)})")
+        return self._get_batcher(model_type).submit(image)
+
+    def submit_caption(self, image, preset=None):
+        """Caption isteğini kuyruğa ekler, caption string Future'ı döndürür"""
+        if preset and preset not in Config.CAPTION_PRESETS:
+            raise ValueError(f"Bilinmeyen caption modu: {preset}")
+        return self._get_batcher("BLIP", preset).submit(image)
+
+    def analyze(self, image, model_type="YOLO11", with_caption=True, timeout=None, preset=None):
+        """Tespit ve caption isteklerini aynı anda kuyruğa verip sonuçları birleştirir"""
+        det_future = self.submit_detection(image, model_type)
+        cap_future = self.submit_caption(image, preset) if with_caption else None
+        boxes, confs, class_ids, classes, indexes = det_future.result(timeout=timeout)
+        return {
+            "boxes": boxes,
+            "confs": confs,
+            "class_ids": class_ids,
+            "classes": classes,
+            "indexes": indexes,
+            "ai_caption": cap_future.result(timeout=timeout) if cap_future else None
+        }
+
+    def stats(self):
+        with self._lock:
+            return {name: batcher.stats() for name, batcher in self._batchers.items()}
+
+    def prometheus_text(self):
+        """Telemetry metriklerine batcher kuyruk/gecikme göstergelerini ekler"""
+        gauges = []
+        for name, stats in self.stats().items():
+            gauges.append(("queue_depth", {"model": name}, stats["queue_depth"]))
+            gauges.append(("batcher_latency_p50_ms", {"model": name}, stats["latency_p50_ms"]))
+            gauges.append(("batcher_latency_p99_ms", {"model": name}, stats["latency_p99_ms"]))
+            for size, count in stats["batch_size_histogram"].items():
+                gauges.append(("batch_size_count", {"model": name, "size": size}, count))
+        return get_telemetry().prometheus_text(gauges)
+
+    def close(self):
+        with self._lock:
+            for batcher in self._batchers.values():
+                batcher.close()
+            for handle in self._handles.values():
+                handle.release()
+            self._batchers.clear()
+            self._handles.clear()
+
+
+def result_to_json(result):
+    """Analiz sonucunu JSON'a yazılabilir hale getirir"""
+    classes = result.get("classes") or {}
+    if isinstance(classes, (list, tuple)):
+        classes = dict(enumerate(classes))
+    return {
+        "boxes": [[int(v) for v in box] for box in (result.get("boxes") or [])],
+        "confs": [float(c) for c in (result.get("confs") or [])],
+        "class_ids": [int(c) for c in (result.get("class_ids") or [])],
+        "classes": {str(k): v for k, v in classes.items()},
+        "ai_caption": result.get("ai_caption")
+    }
+
+
+def make_handler(service):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/health":
+                self._send_json({"status": "ok"})
+            elif path == "/stats":
+                self._send_json(service.stats())
+            elif path == "/metrics":
+                body = service.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            model_type = params.get("model", ["YOLO11"])[0]
+            preset = params.get("preset", [None])[0]
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                image = Image.open(io.BytesIO(self.rfile.read(length))).convert("RGB")
+
+                if url.path == "/detect":
+                    boxes, confs, class_ids, classes, _ = service.submit_detection(image, model_type).result()
+                    result = {"boxes": boxes, "confs": confs, "class_ids": class_ids, "classes": classes}
+                elif url.path == "/caption":
+                    result = {"ai_caption": service.submit_caption(image, preset).result()}
+                elif url.path == "/analyze":
+                    result = service.analyze(image, model_type, preset=preset)
+                else:
+                    self._send_json({"error": "not found"}, 404)
+                    return
+
+                self._send_json(result_to_json(result))
+            except (ValueError, UnidentifiedImageError) as e:
+                # Bilinmeyen model/caption modu veya okunamayan görsel istemci hatasıdır
+                self._send_json({"error": str(e)}, 400)
+            except Exception as e:
+                print(f"❌ İstek hatası: {e}")
+                self._send_json({"error": str(e)}, 500)
+
+        def log_message(self, format, *args):
+            pass
+
+    return InferenceHandler
+
+
+def serve(host=None, port=None, max_batch_size=None, max_wait_ms=None, workers=None):
+    """HTTP çıkarım servisini başlatır (bloklar); workers > 1 ise aynı soketi paylaşan süreçler fork'lanır"""
+    host = host or Config.SERVER_HOST
+    port = port or Config.SERVER_PORT
+    workers = workers or Config.SERVER_WORKERS
+    sock = socket.create_server((host, port), backlog=128)
+    if workers <= 1:
+        print(f"🚀 Inference server: http://{host}:{port}")
+        _serve_socket(sock, max_batch_size, max_wait_ms)
+        return
+
+    # Üst süreç model yüklemez (torch import edilmez); her işçi modelleri kendisi yükler ve
+    # mmap'lenmiş safetensors sayfaları işletim sisteminin sayfa önbelleği üzerinden paylaşılır
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_serve_socket, args=(sock, max_batch_size, max_wait_ms), name=f"inference-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    # SIGTERM'de de işçiler aşağıdaki finally bloğunda sonlandırılır
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🚀 Inference server: http://{host}:{port} ({workers} işçi süreç)")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        sock.close()
+
+
+def _serve_socket(sock, max_batch_size, max_wait_ms):
+    """Dinlemedeki soket üzerinde HTTP sunucusunu çalıştırır"""
+    service = InferenceService(max_batch_size, max_wait_ms)
+    service.registry.preload()
+    httpd = ThreadingHTTPServer(sock.getsockname()[:2], make_handler(service), bind_and_activate=False)
+    httpd.socket.close()
+    httpd.socket = sock
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mikro-batch'li tespit + caption servisi")
+    parser.add_argument("--host", default=Config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=Config.BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=Config.MAX_BATCH_WAIT_MS)
+    parser.add_argument("--workers", type=int, default=Config.SERVER_WORKERS, help="Aynı portu paylaşan süreç sayısı")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config.settings import Config
+from models import artifacts
+from models.artifacts import ArtifactManager
+
+PAYLOAD = os.urandom(256 * 1024 + 123)
+
+
+def _make_handler(payload, ranged, log, truncate=0, head_headers=None):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _headers(self, status, length, extra=None):
+            self.send_response(status)
+            self.send_header("Content-Length", str(length))
+            if ranged:
+                self.send_header("Accept-Ranges", "bytes")
+            for key, value in (extra or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+
+        def do_HEAD(self):
+            log.append(("HEAD", None))
+            self._headers(200, len(payload), head_headers)
+
+        def do_GET(self):
+            match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+            log.append(("GET", match.group(0) if match else None))
+            if ranged and match:
+                start, end = int(match.group(1)), int(match.group(2))
+                body = payload[start:end + 1]
+                self._headers(206, len(body), {"Content-Range": f"bytes {start}-{end}/{len(payload)}"})
+            elif truncate:
+                # Bağlantı erken kapanır; Content-Length gönderilmediği için istemci bunu fark edemez
+                body = payload[:-truncate]
+                self.send_response(200)
+                self.end_headers()
+            else:
+                # Range desteklemeyen sunucu başlığı yok sayar ve tüm dosyayı döndürür
+                body = payload
+                self._headers(200, len(body))
+            self.wfile.write(body)
+
+    return Handler
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(ranged, payload=PAYLOAD, **kwargs):
+        log = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(payload, ranged, log, **kwargs))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/model.bin", log
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # Küçük test dosyası da birden fazla parçaya bölünsün
+    monkeypatch.setattr(Config, "ARTIFACT_MIN_SEGMENT_MB", 0)
+    monkeypatch.setattr(Config, "ARTIFACT_SHA256", {})
+    monkeypatch.setattr(Config, "ARTIFACT_PINS_PATH", str(tmp_path / "pins.json"))
+    return ArtifactManager(cache_dir=str(tmp_path / "cache"), mirror="", offline=False, workers=2, segments=4)
+
+
+def _register(monkeypatch, url):
+    monkeypatch.setitem(artifacts.ARTIFACTS, "test/model", {"files": {"model.bin": url}})
+
+
+def test_ranged_download(serve, manager, monkeypatch):
+    url, log = serve(ranged=True)
+    _register(monkeypatch, url)
+
+    path = manager.fetch("test/model")
+
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    ranges = [r for method, r in log if method == "GET"]
+    assert len(ranges) == 4 and all(ranges)
+    assert manager.verify("test/model") == {"model.bin": True}
+    with open(manager.lock_path) as f:
+        assert json.load(f)["test/model/model.bin"] == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_ranged_download_resumes_completed_segments(serve, manager, monkeypatch):
+    url, log = serve(ranged=True)
+    _register(monkeypatch, url)
+
+    # Önceki çalıştırmada ilk iki parça tamamlanmış
+    segment = -(-len(PAYLOAD) // 4)
+    part = os.path.join(manager.cache_dir, "downloads", "test__model__model.bin.part")
+    os.makedirs(os.path.dirname(part))
+    with open(part, 'wb') as f:
+        f.write(PAYLOAD[:2 * segment])
+    with open(part + ".json", 'w') as f:
+        json.dump({"url": url, "size": len(PAYLOAD), "done": [0, 1]}, f)
+
+    path = manager.fetch("test/model")
+
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    # Yalnızca eksik parçalar istenir (paralel indirildikleri için sıra önemsiz)
+    assert sorted(r for method, r in log if method == "GET") == [
+        f"bytes={2 * segment}-{3 * segment - 1}", f"bytes={3 * segment}-{len(PAYLOAD) - 1}"
+    ]
+    assert not os.path.exists(part + ".json")
+
+
+def test_download_without_range_support(serve, manager, monkeypatch):
+    url, log = serve(ranged=False)
+    _register(monkeypatch, url)
+
+    path = manager.fetch("test/model")
+
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert [entry for entry in log if entry[0] == "GET"] == [("GET", None)]
+
+
+def test_checksum_mismatch_is_rejected(serve, manager, monkeypatch):
+    url, _ = serve(ranged=True)
+    _register(monkeypatch, url)
+    monkeypatch.setattr(Config, "ARTIFACT_SHA256", {"test/model/model.bin": "0" * 64})
+
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        manager.fetch("test/model")
+    assert not os.path.exists(os.path.join(manager.cache_dir, "blobs"))
+
+
+def test_truncated_download_is_not_pinned(serve, manager, monkeypatch):
+    url, _ = serve(ranged=False, truncate=1000)
+    _register(monkeypatch, url)
+
+    with pytest.raises(RuntimeError, match="Eksik indirme"):
+        manager.fetch("test/model")
+    assert not os.path.exists(manager.lock_path)
+    assert not os.path.exists(os.path.join(manager.cache_dir, "blobs"))
+
+
+def test_advertised_sha256_is_enforced(serve, manager, monkeypatch):
+    url, _ = serve(ranged=False, head_headers={"X-Linked-Etag": f'"{"0" * 64}"'})
+    _register(monkeypatch, url)
+
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        manager.fetch("test/model")
+    assert not os.path.exists(manager.lock_path)
+
+
+def test_pinned_sha256_is_used(serve, tmp_path, monkeypatch):
+    url, _ = serve(ranged=False)
+    _register(monkeypatch, url)
+    pins = tmp_path / "pins.json"
+    pins.write_text(json.dumps({"test/model/model.bin": "0" * 64}))
+    monkeypatch.setattr(Config, "ARTIFACT_SHA256", {})
+    monkeypatch.setattr(Config, "ARTIFACT_PINS_PATH", str(pins))
+    manager = ArtifactManager(cache_dir=str(tmp_path / "cache"), mirror="", offline=False)
+
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        manager.fetch("test/model")
@@ -0,0 +1,74 @@
+import numpy as np
+
+from models import ensemble
+from models.cascade import CascadeDetector
+from models.detections import Detections
+from models.ensemble import EnsembleDetector
+from utils.result_cache import CachedDetector, ResultCache
+
+IMAGE = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+class _Member:
+    def __init__(self, model_type):
+        self.model_type = model_type
+        self.calls = 0
+
+    def detect_arrays(self, image):
+        self.calls += 1
+        return Detections.empty()
+
+
+def _cached_ensemble(members, **kwargs):
+    detector = EnsembleDetector({m.model_type: m for m in members}, **kwargs)
+    return CachedDetector(detector, cache=ResultCache(max_items=8, disk_path=""))
+
+
+def test_member_weights_invalidate_ensemble_cache(tmp_path):
+    weights = tmp_path / "member.pt"
+    weights.write_bytes(b"v1")
+    member = _Member(str(weights))
+    cache = ResultCache(max_items=8, disk_path="")
+
+    original = CachedDetector(EnsembleDetector({member.model_type: member}), cache=cache)
+    original.detect_arrays(IMAGE)
+    original.detect_arrays(IMAGE)
+    assert member.calls == 1
+
+    weights.write_bytes(b"v2-retrained")
+    retrained = CachedDetector(EnsembleDetector({member.model_type: member}), cache=cache)
+    retrained.detect_arrays(IMAGE)
+    assert member.calls == 2
+    assert retrained.weights != original.weights
+
+
+def test_ensemble_settings_are_part_of_cache_key():
+    members = [_Member("a"), _Member("b")]
+
+    assert _cached_ensemble(members, method="wbf").cache_key() != _cached_ensemble(members, method="nms").cache_key()
+    assert _cached_ensemble(members, weights={"a": 2.0}).cache_key() != _cached_ensemble(members).cache_key()
+
+
+def test_executor_grows_with_member_count(monkeypatch):
+    monkeypatch.setattr(ensemble, "_executor", None)
+    monkeypatch.setattr(ensemble, "_executor_workers", 0)
+
+    small = ensemble._get_executor(2)
+    assert ensemble._get_executor(2) is small
+    assert ensemble._get_executor(4)._max_workers == 4
+
+
+def test_cascade_is_keyed_by_member_weights(tmp_path):
+    fast_weights, heavy_weights = tmp_path / "fast.pt", tmp_path / "heavy.pt"
+    fast_weights.write_bytes(b"fast")
+    heavy_weights.write_bytes(b"heavy-v1")
+    cascade = CascadeDetector(_Member(str(fast_weights)), _Member(str(heavy_weights)))
+
+    before = CachedDetector(cascade, cache=ResultCache(max_items=8, disk_path=""))
+    heavy_weights.write_bytes(b"heavy-v2")
+    after = CachedDetector(cascade, cache=before.cache)
+
+    assert before.weights[0] == after.weights[0]
+    assert before.weights[1] != after.weights[1]
+    assert before.cache_key() == after.cache_key()
+    assert CachedDetector(CascadeDetector(cascade.fast, cascade.heavy, merge=False), cache=before.cache).cache_key() != after.cache_key()
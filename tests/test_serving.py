@@ -0,0 +1,61 @@
+import io
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+from PIL import Image
+
+from serving.batcher import MicroBatcher
+from serving.server import InferenceService, make_handler
+
+
+def test_submit_after_close_raises():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_wait_ms=1)
+    assert batcher(3, timeout=5) == 6
+
+    batcher.close(timeout=5)
+
+    with pytest.raises(RuntimeError):
+        batcher.submit(4)
+    batcher.close(timeout=5)
+
+
+@pytest.fixture
+def server_url():
+    # Bilinmeyen model registry'ye hiç ulaşmamalı
+    service = InferenceService(registry=object())
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(url, body):
+    try:
+        with urlopen(url, data=body, timeout=5) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, json.load(e)
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_unknown_model_is_client_error(server_url):
+    status, payload = _post(f"{server_url}/detect?model={quote('NOPE')}", _png())
+
+    assert status == 400
+    assert "NOPE" in payload["error"]
+
+
+def test_unknown_preset_and_bad_image_are_client_errors(server_url):
+    assert _post(f"{server_url}/caption?preset=nope", _png())[0] == 400
+    assert _post(f"{server_url}/detect", b"not an image")[0] == 400
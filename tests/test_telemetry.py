@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from utils import telemetry
+from utils.orchestrator import AnalysisOrchestrator
+from utils.telemetry import Telemetry
+
+LINE = re.compile(r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?P<labels>.*)\})? (?P<value>\S+)$")
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_samples(text):
+    """Prometheus metin çıktısını (ad, [etiket adları], değer) örneklerine ayırır"""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = LINE.match(line)
+        assert match, f"Geçersiz satır: {line}"
+        labels = [name for name, _ in LABEL.findall(match.group("labels") or "")]
+        samples.append((match.group("name"), labels, float(match.group("value"))))
+    return samples
+
+
+class _Detector:
+    model_type = "stub"
+
+    def detect(self, image):
+        return []
+
+
+class _Captioner:
+    def generate_ai_caption(self, image, preset=None, stats=None):
+        return "caption"
+
+
+@pytest.fixture
+def fresh_telemetry(monkeypatch):
+    instance = Telemetry(profiler="")
+    monkeypatch.setattr(telemetry, "_telemetry", instance)
+    return instance
+
+
+def test_exported_label_names_are_unique(fresh_telemetry):
+    AnalysisOrchestrator(_Detector(), _Captioner(), parallel=False).run("image")
+    with fresh_telemetry.stage("inference", model="YOLO11"):
+        pass
+    fresh_telemetry.inc("boxes", 3, model="YOLO11")
+
+    samples = parse_samples(fresh_telemetry.prometheus_text([("queue_depth", {"model": "BLIP"}, 0)]))
+
+    assert samples
+    for name, labels, _ in samples:
+        assert len(labels) == len(set(labels)), f"{name} yinelenen etiket: {labels}"
+    stages = {name for name, labels, _ in samples if name.endswith("_count") and "part" in labels}
+    assert stages == {f"{telemetry.METRIC_PREFIX}_stage_duration_seconds_count"}
+
+
+def test_reserved_label_is_rejected(fresh_telemetry):
+    with pytest.raises(ValueError):
+        fresh_telemetry.observe("analysis_stage", 0.1, stage="detection")
+    with pytest.raises(ValueError):
+        fresh_telemetry.observe("analysis_stage", 0.1, le="1")
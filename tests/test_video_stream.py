@@ -0,0 +1,64 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from models.detections import Detections
+from utils.video_stream import BoxTracker, FrameReader
+
+
+def _boxes(*xyxy, class_ids=None):
+    return Detections.from_xyxy(np.array(xyxy), [0.9] * len(xyxy), class_ids or [0] * len(xyxy))
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    for i in range(40):
+        writer.write(np.full((24, 32, 3), i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_tracker_propagates_matched_boxes():
+    tracker = BoxTracker(iou_threshold=0.3, max_gap=1.0)
+    tracker.update(_boxes([100, 100, 150, 150], [300, 300, 320, 320]), 0.0)
+    tracker.update(_boxes([110, 100, 160, 150], [400, 400, 420, 420]), 0.2)
+
+    predicted = tracker.predict(0.3)
+
+    # İlk kutu 50 px/s hızla sağa gider, yeni görünen kutu eşlenmediği için yerinde kalır
+    np.testing.assert_allclose(predicted.xyxy, [[115, 100, 165, 150], [400, 400, 420, 420]], atol=1e-3)
+
+
+def test_tracker_does_not_match_other_classes():
+    tracker = BoxTracker(iou_threshold=0.3, max_gap=1.0)
+    tracker.update(_boxes([100, 100, 150, 150], class_ids=[0]), 0.0)
+    tracker.update(_boxes([110, 100, 160, 150], class_ids=[1]), 0.2)
+
+    np.testing.assert_allclose(tracker.predict(0.4).xyxy, [[110, 100, 160, 150]], atol=1e-3)
+
+
+def test_tracker_clips_to_frame():
+    tracker = BoxTracker(iou_threshold=0.3, max_gap=1.0)
+    tracker.update(_boxes([0, 0, 20, 20]), 0.0)
+    tracker.update(_boxes([10, 0, 30, 20]), 0.1)
+
+    assert tracker.predict(1.0, (24, 32)).xyxy[0, 2] <= 32
+
+
+def test_stop_with_full_queue_releases_consumer(video):
+    reader = FrameReader(video, queue_size=2, live=False)
+    items = []
+    consumer = threading.Thread(target=lambda: items.extend(reader))
+
+    # Tüketici okumazken kuyruk dolar; stop() queue.Full ile patlamamalı
+    reader._thread.join(0.5)
+    reader.stop()
+    consumer.start()
+    consumer.join(2.0)
+
+    assert not consumer.is_alive()
+    assert not reader._thread.is_alive()
@@ -0,0 +1,223 @@
+import atexit
+import json
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from config.settings import Config
+
+MAX_PARAMS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+
+
+class AsyncTrackingWriter:
+    """MLflow çağrılarını sınırlı bir kuyruktan arka plan thread'inde toplu olarak yazar"""
+    def __init__(self, experiment_name=None, max_queue=None, flush_interval=None, sample_rate=None, synchronous=None):
+        self.experiment_name = experiment_name or Config.EXPERIMENT_NAME
+        self.flush_interval = Config.TRACKING_FLUSH_INTERVAL_S if flush_interval is None else flush_interval
+        self.sample_rate = Config.TRACKING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.synchronous = (not Config.TRACKING_ASYNC) if synchronous is None else synchronous
+        max_queue = max_queue or Config.TRACKING_QUEUE_SIZE
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._high_watermark = int(max_queue * Config.TRACKING_HIGH_WATERMARK)
+        self._client = None
+        self._experiment_id = None
+        self._run_ids = {}
+        self._skipped_runs = set()
+        self._lock = threading.Lock()
+        self.counters = {"enqueued": 0, "dropped": 0, "sampled_out_runs": 0, "batches": 0, "errors": 0}
+
+        self._thread = None
+        if not self.synchronous:
+            self._thread = threading.Thread(target=self._run, name="mlflow-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # --- üretici tarafı (istek yolunda, bloklamaz) ---
+
+    def start_run(self, run_name):
+        """Yeni bir run için yerel token döndürür; run MLflow'da arka planda oluşturulur"""
+        token = uuid.uuid4().hex
+        if not self.synchronous and self._queue.qsize() >= self._high_watermark and random.random() >= self.sample_rate:
+            # Kuyruk dolmak üzereyken run'lar bütün olarak örneklenir, yarım run yazılmaz
+            with self._lock:
+                self._skipped_runs.add(token)
+                self.counters["sampled_out_runs"] += 1
+            return token
+        self._put(("start_run", token, run_name))
+        return token
+
+    def log_params(self, token, params):
+        self._put(("params", token, {k: str(v) for k, v in params.items()}))
+
+    def log_metrics(self, token, metrics, step=0):
+        self._put(("metrics", token, (dict(metrics), int(time.time() * 1000), step)))
+
+    def log_dict(self, token, data, artifact_file):
+        """Sözlüğü bellekten JSON artifact olarak yazar (CWD'de geçici dosya oluşturmaz)"""
+        self._put(("artifact", token, (json.dumps(data, indent=2, default=str).encode("utf-8"), artifact_file)))
+
+    def log_bytes(self, token, payload, artifact_file):
+        self._put(("artifact", token, (payload, artifact_file)))
+
+    def end_run(self, token):
+        self._put(("end_run", token, None))
+
+    def _put(self, event):
+        token = event[1]
+        with self._lock:
+            if token in self._skipped_runs:
+                if event[0] == "end_run":
+                    self._skipped_runs.discard(token)
+                return
+        if self.synchronous:
+            self._process([event])
+            return
+        try:
+            self._queue.put_nowait(event)
+            self.counters["enqueued"] += 1
+        except queue.Full:
+            self.counters["dropped"] += 1
+
+    # --- tüketici tarafı (arka plan thread'i) ---
+
+    def _get_client(self):
+        if self._client is None:
+            # mlflow yalnızca ilk olay yazılırken, arka plan thread'inde import edilir
+            from mlflow.tracking import MlflowClient
+            self._client = MlflowClient()
+            experiment = self._client.get_experiment_by_name(self.experiment_name)
+            if experiment is None:
+                self._experiment_id = self._client.create_experiment(self.experiment_name)
+            else:
+                self._experiment_id = experiment.experiment_id
+        return self._client
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            batch = [event]
+            deadline = time.monotonic() + self.flush_interval
+            while event[0] not in ("flush", "stop"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(event)
+
+            self._process(batch)
+            if batch[-1][0] == "stop":
+                break
+
+    def _process(self, batch):
+        from mlflow.entities import Metric, Param
+
+        pending = {}
+
+        def flush_pending(token=None):
+            for tok in ([token] if token else list(pending)):
+                params, metrics = pending.pop(tok, ([], []))
+                run_id = self._run_ids.get(tok)
+                if run_id is None:
+                    continue
+                while params or metrics:
+                    self._get_client().log_batch(
+                        run_id,
+                        metrics=metrics[:MAX_METRICS_PER_BATCH],
+                        params=params[:MAX_PARAMS_PER_BATCH]
+                    )
+                    metrics = metrics[MAX_METRICS_PER_BATCH:]
+                    params = params[MAX_PARAMS_PER_BATCH:]
+                    self.counters["batches"] += 1
+
+        for kind, token, payload in batch:
+            try:
+                if kind == "start_run":
+                    run = self._get_client().create_run(self._experiment_id, run_name=payload)
+                    self._run_ids[token] = run.info.run_id
+                elif kind == "params":
+                    params = pending.setdefault(token, ([], []))[0]
+                    params.extend(Param(k, v) for k, v in payload.items())
+                elif kind == "metrics":
+                    values, timestamp, step = payload
+                    metrics = pending.setdefault(token, ([], []))[1]
+                    metrics.extend(Metric(k, float(v), timestamp, step) for k, v in values.items())
+                elif kind == "artifact":
+                    self._write_artifact(token, *payload)
+                elif kind == "end_run":
+                    flush_pending(token)
+                    run_id = self._run_ids.pop(token, None)
+                    if run_id is not None:
+                        self._get_client().set_terminated(run_id)
+                elif kind in ("flush", "stop"):
+                    flush_pending()
+                    if payload is not None:
+                        payload.set()
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"❌ MLflow yazma hatası ({kind}): {e}")
+
+        try:
+            flush_pending()
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"❌ MLflow batch hatası: {e}")
+
+    def _write_artifact(self, token, payload, artifact_file):
+        run_id = self._run_ids.get(token)
+        if run_id is None:
+            return
+        # Her artifact kendi geçici klasöründe; eşzamanlı oturumlar aynı dosya adında çakışmaz
+        tmp_dir = tempfile.mkdtemp(prefix="mlflow_artifact_")
+        try:
+            local_path = os.path.join(tmp_dir, os.path.basename(artifact_file))
+            with open(local_path, 'wb') as f:
+                f.write(payload)
+            artifact_dir = os.path.dirname(artifact_file) or None
+            self._get_client().log_artifact(run_id, local_path, artifact_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def flush(self, timeout=None):
+        """Kuyruktaki tüm olaylar yazılana kadar bekler"""
+        if self.synchronous:
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        """Kapanışta kalan olayları yazar ve worker'ı durdurur"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("stop", None, done))
+        done.wait(timeout)
+        self._thread.join(timeout)
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_tracking_writer():
+    """Süreç genelindeki tek AsyncTrackingWriter örneğini döndürür"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AsyncTrackingWriter()
+        return _writer
@@ -1,30 +1,29 @@
-import mlflow
-import mlflow.pytorch
-from datetime import datetime
 import os
-import json
+from datetime import datetime
 from config.settings import Config
+from tracking.async_writer import get_tracking_writer
 
 class MLflowTracker:
-    def __init__(self):
+    def __init__(self, writer=None):
         self.experiment_name = Config.EXPERIMENT_NAME
-        self.setup_mlflow()
+        self.writer = writer or get_tracking_writer()
+        self.run_token = None
     
     def setup_mlflow(self):
-        """MLflow experiment setup"""
-        mlflow.set_experiment(self.experiment_name)
+        """MLflow experiment setup (deney arka plan yazıcısında ilk kullanımda oluşturulur)"""
+        return self.writer
     
     def start_run(self, run_name=None):
         """New run start karta hai"""
         if run_name is None:
             run_name = f"detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        mlflow.start_run(run_name=run_name)
+        self.run_token = self.writer.start_run(run_name)
         print(f"🚀 MLflow Run Started: {run_name}")
     
     def log_parameters(self, detection_params):
         """Detection parameters log karta hai"""
-        mlflow.log_params({
+        self.writer.log_params(self.run_token, {
             "model": "YOLOv3",
             "dataset": "COCO",
             "confidence_threshold": Config.CONFIDENCE_THRESHOLD,
@@ -44,9 +43,22 @@ class MLflowTracker:
             "detection_time": detection_results['inference_time']
         }
         
-        mlflow.log_metrics(metrics)
+        self.writer.log_metrics(self.run_token, metrics)
         return metrics
     
+    def log_training_params(self, params):
+        """Eğitim ayarlarını (veri, temel model, epoch, aygıt, işçi sayısı...) log'lar"""
+        self.writer.log_params(self.run_token, params)
+
+    def log_epoch_metrics(self, epoch, metrics):
+        """Epoch metriklerini (süre, görsel/sn, kayıp, mAP) epoch adımıyla log'lar"""
+        self.writer.log_metrics(self.run_token, metrics, step=epoch)
+
+    def log_stage_timings(self, timings):
+        """Bu analizin aşama sürelerini (detection, caption, total) tek batch'te log'lar"""
+        if timings:
+            self.writer.log_metrics(self.run_token, {f"stage_{stage}_s": seconds for stage, seconds in timings.items()})
+    
     def log_captions(self, simple_caption, ai_caption):
         """Captions log karta hai"""
         captions_data = {
@@ -55,22 +67,18 @@ class MLflowTracker:
             "timestamp": datetime.now().isoformat()
         }
         
-        # Save captions to temporary file
-        with open('temp_captions.json', 'w') as f:
-            json.dump(captions_data, f, indent=2)
-        
-        mlflow.log_artifact('temp_captions.json')
-        os.remove('temp_captions.json')  # Cleanup
+        self.writer.log_dict(self.run_token, captions_data, 'captions.json')
     
     def log_artifacts(self, output_image_path, input_image_path=None):
         """Images and artifacts log karta hai"""
-        # Output image log karo
+        # Dosyalar hemen belleğe okunur; arka plan yazıcısı çalışana kadar silinseler de sorun olmaz
         if os.path.exists(output_image_path):
-            mlflow.log_artifact(output_image_path, "output")
+            with open(output_image_path, 'rb') as f:
+                self.writer.log_bytes(self.run_token, f.read(), f"output/{os.path.basename(output_image_path)}")
         
-        # Input image bhi log kar sakte ho
         if input_image_path and os.path.exists(input_image_path):
-            mlflow.log_artifact(input_image_path, "input")
+            with open(input_image_path, 'rb') as f:
+                self.writer.log_bytes(self.run_token, f.read(), f"input/{os.path.basename(input_image_path)}")
     
     def log_detection_details(self, boxes, confs, class_ids, classes):
         """Detailed detection results log karta hai"""
@@ -86,13 +94,14 @@ class MLflowTracker:
                 "bbox": box
             })
         
-        with open('temp_detections.json', 'w') as f:
-            json.dump(detection_details, f, indent=2)
-        
-        mlflow.log_artifact('temp_detections.json')
-        os.remove('temp_detections.json')  # Cleanup
+        self.writer.log_dict(self.run_token, detection_details, 'detections.json')
+    
+    def log_detections(self, detections):
+        """Detections nesnesini toplu olarak serileştirip log'lar"""
+        self.writer.log_dict(self.run_token, {"detections": detections.to_records(), "counts": detections.counts()}, 'detections.json')
     
     def end_run(self):
         """Run complete karta hai"""
-        mlflow.end_run()
-        print("✅ MLflow Run Completed")
\ No newline at end of file
+        self.writer.end_run(self.run_token)
+        self.run_token = None
+        print("✅ MLflow Run Completed")
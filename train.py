@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+from config.settings import Config
+from models.artifacts import get_artifact_manager
+from training.incremental import current_labels, read_manifest, write_manifest, select_incremental, write_incremental_data
+from tracking.mlflow_tracker import MLflowTracker
+
+
+def find_checkpoint(run_dir):
+    """ultralytics'in her epoch yazdığı last.pt (model + optimizer + epoch durumu)"""
+    path = os.path.join(run_dir, "weights", "last.pt")
+    return path if os.path.exists(path) else None
+
+
+def promote(best, labels, target=None):
+    """En iyi ağırlıkları uygulamanın kullandığı yola atomik kopyalar ve etiket manifestini günceller"""
+    target = target or Config.PC_MODEL_PATH
+    tmp = target + ".tmp"
+    shutil.copyfile(best, tmp)
+    os.replace(tmp, target)
+    write_manifest(labels, target)
+    print(f"📦 {best} -> {target} (etiket manifesti güncellendi)")
+
+
+def train(data=None, base=None, epochs=None, imgsz=None, batch=None, device=None, workers=None,
+          name="pc", resume=False, incremental=False, promote_best=False):
+    """YOLO eğitimi; resume ile yarıda kalan çalıştırma, incremental ile yeni etiketlerle ince ayar"""
+    from ultralytics import YOLO
+    from training.yolo_trainer import CachedDetectionTrainer, EpochMetricsLogger, select_device, default_workers
+
+    data = os.path.abspath(data or Config.TRAIN_DATA)
+    device = select_device(device)
+    workers = workers or default_workers()
+    run_dir = os.path.join(Config.TRAIN_PROJECT, name)
+    labels_path = os.path.join(run_dir, "labels.json")
+
+    checkpoint = find_checkpoint(run_dir) if resume else None
+    if resume and checkpoint is None:
+        print(f"⚠️ {run_dir} için checkpoint yok, eğitim baştan başlıyor")
+
+    params = {"data": data, "device": device, "workers": workers, "resume": bool(checkpoint),
+              "incremental": incremental, "image_cache": bool(Config.TRAIN_CACHE_DIR)}
+    overrides = {}
+    if checkpoint:
+        # Devam eden çalıştırmanın ayarları (türetilmiş data.yaml dahil) checkpoint'ten gelir
+        labels = current_labels(data)
+        if os.path.exists(labels_path):
+            with open(labels_path) as f:
+                labels = json.load(f)
+    else:
+        labels = current_labels(data)
+        if incremental:
+            base = base or Config.PC_MODEL_PATH
+            if not os.path.exists(base):
+                raise SystemExit(f"❌ İnce ayar için temel model bulunamadı: {base}")
+            new, replay = select_incremental(data, read_manifest(base))
+            if not new:
+                print("✅ Son eğitimden beri yeni veya değişmiş etiket yok, ince ayar atlanıyor")
+                return None
+            print(f"🧩 İnce ayar: {len(new)} yeni/değişmiş + {len(replay)} tekrar görseli")
+            data = write_incremental_data(data, new + replay, os.path.join(run_dir, "data"))
+            epochs = epochs or Config.TRAIN_INCREMENTAL_EPOCHS
+            overrides = {"lr0": Config.TRAIN_INCREMENTAL_LR, "freeze": Config.TRAIN_INCREMENTAL_FREEZE,
+                         "warmup_epochs": 0}
+            params.update(new_images=len(new), replay_images=len(replay))
+
+        base = get_artifact_manager().resolve(base or Config.TRAIN_BASE_MODEL)
+        os.makedirs(run_dir, exist_ok=True)
+        with open(labels_path, 'w') as f:
+            json.dump(labels, f)
+        params.update(base=base, epochs=epochs or Config.TRAIN_EPOCHS, imgsz=imgsz or Config.TRAIN_IMG_SIZE,
+                      batch=batch or Config.TRAIN_BATCH, **overrides)
+
+    model = YOLO(checkpoint or base)
+    tracker = MLflowTracker()
+    tracker.start_run(f"train_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    tracker.log_training_params(params)
+    EpochMetricsLogger(tracker).register(model)
+    print(f"🚀 Eğitim: {data} | aygıt {device} | {workers} işçi")
+
+    try:
+        if checkpoint:
+            model.train(resume=True, device=device, trainer=CachedDetectionTrainer)
+        else:
+            model.train(
+                trainer=CachedDetectionTrainer,
+                data=data,
+                epochs=params["epochs"],
+                imgsz=params["imgsz"],
+                batch=params["batch"],
+                device=device,
+                workers=workers,
+                project=Config.TRAIN_PROJECT,
+                name=name,
+                exist_ok=True,  # resume aynı klasördeki last.pt'yi bulur
+                save_period=Config.TRAIN_SAVE_PERIOD,
+                cache=False,  # görseller ImageCache'ten okunur
+                **overrides
+            )
+    finally:
+        tracker.end_run()
+
+    best = str(model.trainer.best)
+    print(f"✅ Eğitim tamamlandı! En iyi ağırlıklar: {best}")
+    if promote_best:
+        promote(best, labels)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PC veri kümesinde YOLO eğitimi / ince ayarı")
+    parser.add_argument("--data", default=Config.TRAIN_DATA)
+    parser.add_argument("--base", help=f"Başlangıç ağırlıkları (varsayılan: {Config.TRAIN_BASE_MODEL}, "
+                                       f"--incremental ile {Config.PC_MODEL_PATH})")
+    parser.add_argument("--epochs", type=int)
+    parser.add_argument("--imgsz", type=int, default=Config.TRAIN_IMG_SIZE)
+    parser.add_argument("--batch", type=int, default=Config.TRAIN_BATCH)
+    parser.add_argument("--device", help="Örn. cpu, mps, 0; boşsa otomatik seçilir")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--name", default="pc", help=f"Çalıştırma klasörü: {Config.TRAIN_PROJECT}/<name>")
+    parser.add_argument("--resume", action="store_true", help="Aynı isimli çalıştırmanın last.pt'sinden devam et")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Mevcut PC modelini yalnızca yeni/değişmiş etiketler (+ tekrar örneği) ile ince ayarla")
+    parser.add_argument("--promote", action="store_true",
+                        help=f"En iyi ağırlıkları {Config.PC_MODEL_PATH} yoluna kopyala ve etiket manifestini güncelle")
+    args = parser.parse_args()
+
+    train(args.data, args.base, args.epochs, args.imgsz, args.batch, args.device, args.workers,
+          args.name, args.resume, args.incremental, args.promote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import json
+import math
+import os
+from multiprocessing import Pool
+
+import cv2
+import numpy as np
+
+
+def decode_resized(path, imgsz):
+    """Görseli ultralytics'in load_image (rect_mode) davranışıyla aynı şekilde çözer: BGR, uzun kenar imgsz"""
+    im = cv2.imread(path)
+    if im is None:
+        raise FileNotFoundError(f"Görsel okunamadı: {path}")
+    h0, w0 = im.shape[:2]
+    r = imgsz / max(h0, w0)
+    if r != 1:
+        w, h = min(math.ceil(w0 * r), imgsz), min(math.ceil(h0 * r), imgsz)
+        im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+    return (h0, w0), np.ascontiguousarray(im)
+
+
+def _decode_job(job):
+    path, imgsz = job
+    return decode_resized(path, imgsz)
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class ImageCache:
+    """Eğitim görsellerini bir kez çözüp tek bir uint8 veri dosyasında saklar ve memmap ile okur.
+
+    Her epoch'ta JPEG çözme yerine sayfa önbelleğinden kopya okunur; DataLoader işçileri aynı sayfaları paylaşır.
+    Dosyalar yol + boyut + mtime ile izlenir, yalnızca yeni veya değişmiş görseller çözülüp sona eklenir.
+    """
+    def __init__(self, directory, files, imgsz):
+        self.directory = directory
+        self.data_path = os.path.join(directory, "images.bin")
+        self.index_path = os.path.join(directory, "index.json")
+        self.files = [os.path.abspath(f) for f in files]
+        self.imgsz = imgsz
+        self._lookup = None  # görsel sırasına göre (offset, h0, w0, h, w)
+        self._data = None
+
+    @classmethod
+    def build(cls, files, imgsz, directory, workers=None):
+        cache = cls(directory, files, imgsz)
+        cache.update(workers)
+        return cache
+
+    def _read_index(self):
+        if os.path.exists(self.index_path) and os.path.exists(self.data_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index.get("imgsz") == self.imgsz:
+                return index
+        return {"imgsz": self.imgsz, "size": 0, "garbage": 0, "entries": {}}
+
+    def _write_index(self, index):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, self.index_path)
+
+    def update(self, workers=None):
+        """Eksik/değişmiş görselleri (paralel) çözüp veri dosyasına ekler ve okuma tablosunu kurar"""
+        os.makedirs(self.directory, exist_ok=True)
+        index = self._read_index()
+        entries = index["entries"]
+
+        # Değişen dosyaların eski baytları çöp sayılır; çöp canlı veriyi geçerse önbellek sıfırdan kurulur
+        if index["garbage"] > index["size"] - index["garbage"]:
+            print("♻️ Görsel önbelleği sıkıştırılıyor (yeniden oluşturuluyor)")
+            index = {"imgsz": self.imgsz, "size": 0, "garbage": 0, "entries": {}}
+            entries = index["entries"]
+
+        pending = []
+        for path in dict.fromkeys(self.files):
+            signature = _signature(path)
+            entry = entries.get(path)
+            if entry is not None and entry[:2] == signature:
+                continue
+            if entry is not None:
+                index["garbage"] += entry[5] * entry[6] * 3
+            pending.append((path, signature))
+
+        if pending:
+            print(f"🗜️ Görsel önbelleği: {len(pending)} görsel çözülüyor, {len(self.files) - len(pending)} önbellekte")
+            jobs = [(path, self.imgsz) for path, _ in pending]
+            with open(self.data_path, 'ab') as f:
+                # Yarıda kalan önceki yazımın dizinde olmayan baytları atılır
+                f.truncate(index["size"])
+                if workers and workers > 1:
+                    with Pool(workers) as pool:
+                        self._append(f, index, pending, pool.imap(_decode_job, jobs, chunksize=8))
+                else:
+                    self._append(f, index, pending, map(_decode_job, jobs))
+            self._write_index(index)
+
+        self._lookup = np.array([entries[path][2:] for path in self.files], dtype=np.int64).reshape(-1, 5)
+        self._data = None
+
+    @staticmethod
+    def _append(f, index, pending, decoded):
+        for (path, signature), ((h0, w0), im) in zip(pending, decoded):
+            offset = index["size"]
+            f.write(im.tobytes())
+            index["size"] += im.nbytes
+            index["entries"][path] = signature + [offset, h0, w0, im.shape[0], im.shape[1]]
+
+    def load(self, i):
+        """i. görseli ultralytics load_image biçiminde döndürür: (BGR kopya, (h0, w0), (h, w))"""
+        if self._data is None:
+            self._data = np.memmap(self.data_path, dtype=np.uint8, mode='r')
+        offset, h0, w0, h, w = self._lookup[i].tolist()
+        # Kopya: augmentasyonlar görüntüyü yerinde değiştirir
+        im = np.array(self._data[offset:offset + h * w * 3]).reshape(h, w, 3)
+        return im, (h0, w0), (h, w)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getstate__(self):
+        # DataLoader işçilerine (spawn) memmap içeriği değil yalnızca yollar gönderilir
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import random
+
+import yaml
+
+from config.settings import Config
+from utils.image_files import list_images
+
+
+def load_data_yaml(data_yaml):
+    with open(data_yaml) as f:
+        return yaml.safe_load(f)
+
+
+def resolve_split(data_yaml, key):
+    """data.yaml'daki split yolunu ultralytics'in kuralıyla mutlak yola çevirir (Roboflow '../train' dahil)"""
+    data = load_data_yaml(data_yaml)
+    base = data.get("path") or os.path.dirname(os.path.abspath(data_yaml))
+    path = os.path.abspath(os.path.join(base, data[key]))
+    if not os.path.exists(path) and data[key].startswith("../"):
+        path = os.path.abspath(os.path.join(base, data[key][3:]))
+    return path
+
+
+def label_path(image_path):
+    """YOLO düzeni: .../images/x.jpg -> .../labels/x.txt"""
+    return os.path.splitext(image_path.replace(f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"))[0] + ".txt"
+
+
+def label_signature(image_path):
+    """Etiket içeriğinin özeti (git checkout mtime'ı değiştirdiği için içerik kullanılır); etiket yoksa None"""
+    path = label_path(image_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def manifest_path(model_path=None):
+    """Modelin hangi etiketlerle eğitildiğini tutan dosya: models/yolo11_pc.pt -> models/yolo11_pc.labels.json"""
+    return os.path.splitext(model_path or Config.PC_MODEL_PATH)[0] + ".labels.json"
+
+
+def read_manifest(model_path=None):
+    path = manifest_path(model_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def current_labels(data_yaml):
+    """Eğitim split'indeki etiketli görseller (split klasörüne göre yol) -> etiket özeti"""
+    train_dir = resolve_split(data_yaml, "train")
+    labels = {}
+    for image in list_images(train_dir):
+        signature = label_signature(image)
+        if signature is not None:
+            labels[os.path.relpath(image, train_dir)] = signature
+    return labels
+
+
+def write_manifest(labels, model_path=None):
+    path = manifest_path(model_path)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(labels, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def select_incremental(data_yaml, manifest, replay_fraction=None, seed=0):
+    """Son eğitimden beri eklenen/değişen etiketli görseller ile eski görsellerden bir tekrar örneği seçer.
+
+    Tekrar örneği ince ayarda önceki sınıf dağılımının unutulmasını azaltır.
+    """
+    replay_fraction = Config.TRAIN_REPLAY_FRACTION if replay_fraction is None else replay_fraction
+    train_dir = resolve_split(data_yaml, "train")
+    new, old = [], []
+    for image, signature in current_labels(data_yaml).items():
+        (new if manifest.get(image) != signature else old).append(os.path.join(train_dir, image))
+    replay = random.Random(seed).sample(old, round(len(old) * replay_fraction))
+    return new, sorted(replay)
+
+
+def write_incremental_data(data_yaml, images, directory):
+    """Seçilen görsel listesiyle eğitilecek, doğrulama split'i aynı kalan türetilmiş data.yaml yazar"""
+    os.makedirs(directory, exist_ok=True)
+    list_path = os.path.abspath(os.path.join(directory, "train.txt"))
+    with open(list_path, 'w') as f:
+        f.write("\n".join(images) + "\n")
+
+    data = load_data_yaml(data_yaml)
+    derived = {"train": list_path, "val": resolve_split(data_yaml, "val"), "nc": data["nc"], "names": data["names"]}
+    derived_yaml = os.path.join(directory, "data.yaml")
+    with open(derived_yaml, 'w') as f:
+        yaml.safe_dump(derived, f, allow_unicode=True)
+    return derived_yaml
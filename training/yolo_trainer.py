@@ -0,0 +1,117 @@
+import os
+import re
+import time
+
+from ultralytics.data.dataset import YOLODataset
+from ultralytics.models.yolo.detect import DetectionTrainer
+
+from config.settings import Config
+from training.image_cache import ImageCache
+
+
+def select_device(device=None):
+    """Eğitim aygıtı: belirtilmişse o, değilse cuda > mps > cpu"""
+    device = device or Config.TRAIN_DEVICE
+    if device:
+        return device
+    import torch
+    if torch.cuda.is_available():
+        return "0"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def default_workers():
+    return Config.TRAIN_WORKERS or min(8, os.cpu_count() or 1)
+
+
+class MemmapYOLODataset(YOLODataset):
+    """Görselleri JPEG yerine önceden çözülmüş memmap önbelleğinden okuyan YOLODataset"""
+    image_cache = None
+
+    def load_image(self, i, rect_mode=True):
+        if self.image_cache is None or not rect_mode:
+            return super().load_image(i, rect_mode)
+        if self.ims[i] is not None:
+            return self.ims[i], self.im_hw0[i], self.im_hw[i]
+
+        im, hw0, hw = self.image_cache.load(i)
+        if self.augment:
+            # BaseDataset.load_image ile aynı tampon mantığı: Mosaic ek görselleri self.buffer'dan seçer
+            self.ims[i], self.im_hw0[i], self.im_hw[i] = im, hw0, hw
+            self.buffer.append(i)
+            if 1 < len(self.buffer) >= self.max_buffer_length:
+                j = self.buffer.pop(0)
+                self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+        return im, hw0, hw
+
+
+class CachedDetectionTrainer(DetectionTrainer):
+    """Train/val veri kümelerini ImageCache ile besleyen DetectionTrainer"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ultralytics CPU/MPS'te workers'ı 0'a çeker; görseller önbellekten geldiği için
+        # işçiler yalnızca augmentasyonu paralelleştirir ve CPU düğümlerinde de korunur
+        self.args.workers = (kwargs.get("overrides") or {}).get("workers") or default_workers()
+
+    def build_dataset(self, img_path, mode="train", batch=None):
+        dataset = super().build_dataset(img_path, mode, batch)
+        if not Config.TRAIN_CACHE_DIR:
+            return dataset
+        # build_yolo_dataset sınıfı sabit kurar; yalnızca load_image davranışı değiştirilir.
+        # Her split kendi klasörünü kullanır: birinin sıkıştırması diğerinin offset'lerini bozmaz
+        dataset.__class__ = MemmapYOLODataset
+        directory = os.path.join(Config.TRAIN_CACHE_DIR, f"{mode}_imgsz{dataset.imgsz}")
+        dataset.image_cache = ImageCache.build(dataset.im_files, dataset.imgsz, directory, self.args.workers)
+        return dataset
+
+
+class EpochMetricsLogger:
+    """Epoch süresi, görsel/sn, veri bekleme süresi, kayıp ve doğrulama metriklerini MLflowTracker'a yazar"""
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self._epoch_start = None
+        self._batch_end = None
+        self._data_wait = 0.0
+        self._timing = {}
+
+    def register(self, model):
+        model.add_callback("on_train_epoch_start", self.on_train_epoch_start)
+        model.add_callback("on_train_batch_start", self.on_train_batch_start)
+        model.add_callback("on_train_batch_end", self.on_train_batch_end)
+        model.add_callback("on_train_epoch_end", self.on_train_epoch_end)
+        model.add_callback("on_fit_epoch_end", self.on_fit_epoch_end)
+
+    def on_train_epoch_start(self, trainer):
+        self._epoch_start = self._batch_end = time.perf_counter()
+        self._data_wait = 0.0
+
+    def on_train_batch_start(self, trainer):
+        # Önceki adımın bitişinden bu batch'in gelişine kadar geçen süre DataLoader beklemesidir
+        self._data_wait += time.perf_counter() - self._batch_end
+
+    def on_train_batch_end(self, trainer):
+        self._batch_end = time.perf_counter()
+
+    def on_train_epoch_end(self, trainer):
+        elapsed = time.perf_counter() - self._epoch_start
+        images = len(trainer.train_loader.dataset)
+        self._timing = {
+            "epoch_time_s": elapsed,
+            "images_per_sec": images / max(elapsed, 1e-9),
+            "data_wait_s": self._data_wait,
+            "data_wait_ratio": self._data_wait / max(elapsed, 1e-9)
+        }
+
+    def on_fit_epoch_end(self, trainer):
+        metrics = dict(self._timing)
+        metrics.update(trainer.label_loss_items(trainer.tloss, prefix="train"))
+        metrics.update(trainer.metrics or {})
+        metrics.update(trainer.lr)
+        # MLflow metrik adlarında parantez kabul edilmez: "metrics/mAP50(B)" -> "metrics/mAP50B"
+        metrics = {re.sub(r"[^\w\-./ ]", "", k): float(v) for k, v in metrics.items()}
+        self.tracker.log_epoch_metrics(trainer.epoch, metrics)
+        if self._timing:
+            print(f"   ⏱️ epoch {trainer.epoch + 1}: {self._timing['epoch_time_s']:.1f} s, "
+                  f"{self._timing['images_per_sec']:.1f} görsel/sn, veri bekleme %{self._timing['data_wait_ratio'] * 100:.0f}")
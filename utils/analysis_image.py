@@ -0,0 +1,136 @@
+import threading
+
+import numpy as np
+import cv2
+from PIL import Image
+
+from config.settings import Config
+
+BLIP_INPUT_SIZE = (384, 384)
+DETR_MIN_SIDE = 800
+DETR_MAX_SIDE = 1333
+
+
+class AnalysisImage:
+    """Görseli bir kez çözer; tek RGB tampon üzerinden RGB/BGR/PIL/tensör görünümleri sunar.
+
+    Tampon tüm tüketiciler arasında paylaşılır ve salt okunur kabul edilir; üzerine
+    çizim yapılacaksa bgr_copy() kullanılmalıdır.
+    """
+    def __init__(self, rgb):
+        if rgb.ndim == 2:
+            rgb = cv2.cvtColor(rgb, cv2.COLOR_GRAY2RGB)
+        self._rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+        self._memo = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_file(cls, source):
+        """Dosya yolu veya dosya nesnesinden (ör. Streamlit UploadedFile) tek seferde çözer"""
+        pil_image = Image.open(source)
+        try:
+            return cls.from_pil(pil_image)
+        finally:
+            if hasattr(source, 'seek'):
+                source.seek(0)
+
+    @classmethod
+    def from_pil(cls, pil_image):
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        return cls(np.asarray(pil_image))
+
+    @classmethod
+    def from_array(cls, array, bgr=False):
+        """numpy dizisinden oluşturur; bgr=True ise OpenCV sırasındaki kanallar RGB'ye çevrilir"""
+        if bgr and array.ndim == 3:
+            array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
+        return cls(array)
+
+    @classmethod
+    def ensure(cls, image):
+        """Girdi zaten AnalysisImage değilse uygun yoldan çözer"""
+        if isinstance(image, cls):
+            return image
+        if isinstance(image, Image.Image):
+            return cls.from_pil(image)
+        if isinstance(image, np.ndarray):
+            return cls(image)
+        return cls.from_file(image)
+
+    def memo(self, key, compute):
+        """Türetilmiş veriyi (boyutlandırılmış kopya, hash vb.) ilk kullanımda hesaplayıp saklar"""
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    @property
+    def shape(self):
+        return self._rgb.shape
+
+    @property
+    def width(self):
+        return self._rgb.shape[1]
+
+    @property
+    def height(self):
+        return self._rgb.shape[0]
+
+    @property
+    def rgb(self):
+        """Kanonik RGB tampon (kopya değil)"""
+        return self._rgb
+
+    @property
+    def bgr(self):
+        """Kanal sırası ters çevrilmiş sıfır-kopya görünüm (negatif stride)"""
+        return self._rgb[..., ::-1]
+
+    def bgr_copy(self):
+        """Üzerine çizim yapılabilecek bitişik BGR kopyası"""
+        return cv2.cvtColor(self._rgb, cv2.COLOR_RGB2BGR)
+
+    @property
+    def pil(self):
+        return self.memo('pil', lambda: Image.fromarray(self._rgb))
+
+    def tensor(self):
+        """CHW uint8 torch tensörü, tampon ile bellek paylaşır"""
+        import torch
+        return torch.from_numpy(self._rgb).permute(2, 0, 1)
+
+    def resized(self, width, height, interpolation=cv2.INTER_LINEAR):
+        """Verilen boyuta ölçeklenmiş RGB diziyi (boyut başına bir kez) döndürür"""
+        if (width, height) == (self.width, self.height):
+            return self._rgb
+        return self.memo(
+            ('resized', width, height, interpolation),
+            lambda: cv2.resize(self._rgb, (width, height), interpolation=interpolation)
+        )
+
+    def resized_pil(self, width, height, resample=Image.BICUBIC):
+        if (width, height) == (self.width, self.height):
+            return self.pil
+        return self.memo(('resized_pil', width, height, resample), lambda: self.pil.resize((width, height), resample))
+
+    def _scaled_size(self, scale):
+        return max(1, int(round(self.width * scale))), max(1, int(round(self.height * scale)))
+
+    def model_input(self, model_type):
+        """Modelin giriş boyutuna küçültülmüş PIL görseli ve orijinale dönüş ölçeğini (sx, sy) döndürür"""
+        if model_type == "YOLO11":
+            scale = Config.IMG_SIZE / max(self.width, self.height)
+        elif model_type == "DETR":
+            scale = min(DETR_MIN_SIDE / min(self.width, self.height), DETR_MAX_SIDE / max(self.width, self.height))
+        elif model_type == "BLIP":
+            return self.resized_pil(*BLIP_INPUT_SIZE), (1.0, 1.0)
+        else:
+            scale = 1.0
+
+        if scale >= 1.0:
+            return self.pil, (1.0, 1.0)
+
+        width, height = self._scaled_size(scale)
+        pil_image = self.memo(('model_input', width, height), lambda: Image.fromarray(self.resized(width, height)))
+        return pil_image, (self.width / width, self.height / height)
@@ -0,0 +1,17 @@
+import os
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def iter_images(directory):
+    """Klasördeki görsel dosyalarını akış halinde verir (her seviyede sıralı os.walk, listeyi belleğe almaz)"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def list_images(directory):
+    """Klasördeki görsel dosyalarını sıralı şekilde listeler"""
+    return sorted(iter_images(directory))
@@ -0,0 +1,79 @@
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config.settings import Config
+from utils.telemetry import get_telemetry
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def torch_threads():
+    return Config.ANALYSIS_TORCH_THREADS or max(1, (os.cpu_count() or 1) // Config.ANALYSIS_WORKERS)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # torch.set_num_threads süreç geneldir; aşama başına çağrılırsa son çağıran tüm aşamaları belirler.
+            # Havuz kurulurken bir kez, işçi sayısına göre bölünmüş çekirdek sayısıyla ayarlanır.
+            import torch
+            torch.set_num_threads(torch_threads())
+            _executor = ThreadPoolExecutor(max_workers=Config.ANALYSIS_WORKERS, thread_name_prefix="analysis")
+        return _executor
+
+
+class AnalysisOrchestrator:
+    """Tespit ve caption üretimini aynı görsel üzerinde eşzamanlı çalıştırır, aşama sürelerini raporlar"""
+    def __init__(self, detector, caption_gen, parallel=None, caption_preset=None):
+        self.detector = detector
+        self.caption_gen = caption_gen
+        self.caption_preset = caption_preset
+        self.parallel = Config.ANALYSIS_PARALLEL if parallel is None else parallel
+
+    @staticmethod
+    def _run_stage(name, fn, image):
+        start = time.perf_counter()
+        result = fn(image)
+        elapsed = time.perf_counter() - start
+        get_telemetry().observe("analysis_stage", elapsed, part=name)
+        return name, result, elapsed
+
+    def run(self, image, on_result=None):
+        """Aşamaları çalıştırır; her aşama bittiğinde on_result(stage, result, seconds) çağrılır.
+
+        Dedektör destekliyorsa tespit sonucu sütunlu Detections olarak döner.
+        outcome["caption_stats"] bu çağrının decoding token/süre değerleridir (önbellek isabetinde boş).
+        """
+        detect = getattr(self.detector, "detect_arrays", self.detector.detect)
+        outcome = {"timings": {}, "caption_stats": {}}
+        stages = [
+            ("detection", detect),
+            ("caption", functools.partial(self.caption_gen.generate_ai_caption, preset=self.caption_preset,
+                                          stats=outcome["caption_stats"]))
+        ]
+        telemetry = get_telemetry()
+        start = time.perf_counter()
+
+        # Analiz tek profil olarak kaydedilir. cProfile yalnızca etkinleştirildiği thread'i izler ve
+        # iki örnek aynı anda çalışamaz; bu yüzden profil açıkken aşamalar sırayla çalışır.
+        with telemetry.profile("analysis"):
+            if self.parallel and not telemetry.profiler:
+                futures = [_get_executor().submit(self._run_stage, name, fn, image) for name, fn in stages]
+                completed = (future.result() for future in as_completed(futures))
+            else:
+                completed = (self._run_stage(name, fn, image) for name, fn in stages)
+
+            for name, result, elapsed in completed:
+                outcome[name] = result
+                outcome["timings"][name] = elapsed
+                if on_result is not None:
+                    on_result(name, result, elapsed)
+
+        outcome["timings"]["total"] = time.perf_counter() - start
+        telemetry.observe("analysis_total", outcome["timings"]["total"])
+        return outcome
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from config.settings import Config
+from captioning.caption_generator import CAPTION_ERROR
+from models.ensemble import member_cache_key
+from utils.analysis_image import AnalysisImage
+
+DEFAULT_WEIGHTS = {
+    "YOLO11": Config.YOLO11_MODEL_PATH,
+    "MY YOLO (PC Setup)": Config.PC_MODEL_PATH,
+    "DETR": Config.DETR_MODEL_NAME,
+    "BLIP": Config.BLIP_MODEL
+}
+
+_checksums = {}
+_checksums_lock = threading.Lock()
+
+
+def pixel_hash(image):
+    """Görselin çözülmüş piksellerinden SHA-256 üretir (dosya formatından bağımsız)"""
+    if isinstance(image, AnalysisImage):
+        return image.memo('sha256', lambda: pixel_hash(image.rgb))
+    if isinstance(image, Image.Image):
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        return pixel_hash(np.asarray(image))
+    elif isinstance(image, np.ndarray):
+        header = f"{image.dtype}:{image.shape}".encode()
+        data = np.ascontiguousarray(image).data
+    else:
+        # Dosya yolu veya Streamlit UploadedFile gibi dosya nesneleri
+        pil_image = Image.open(image)
+        try:
+            return pixel_hash(pil_image.convert('RGB'))
+        finally:
+            if hasattr(image, 'seek'):
+                image.seek(0)
+
+    h = hashlib.sha256(header)
+    h.update(data)
+    return h.hexdigest()
+
+
+def weights_checksum(model_type, model_path=None):
+    """Ağırlık dosyasının SHA-256 özetini döndürür, dosya yoksa model adını kullanır"""
+    path = model_path or DEFAULT_WEIGHTS.get(model_type, model_type)
+    if not os.path.isfile(path):
+        return path
+
+    stat = os.stat(path)
+    memo_key = (path, stat.st_mtime, stat.st_size)
+    with _checksums_lock:
+        if memo_key in _checksums:
+            return _checksums[memo_key]
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    with _checksums_lock:
+        _checksums[memo_key] = digest
+    return digest
+
+
+def backend_key(model_type, model_path=None, backend=None, quantize=None):
+    """Önbellek anahtarı için çıkarım arka ucu: (backend, int8, ONNX dosyası özeti); PyTorch'ta özet None"""
+    backend = backend or Config.INFERENCE_BACKEND
+    quantize = Config.ONNX_QUANTIZE_INT8 if quantize is None else quantize
+    onnx_checksum = None
+    if backend == "onnx" and model_type in DEFAULT_WEIGHTS:
+        # Export modülü torch'u import eder; yalnızca ONNX arka ucunda (torch zaten yüklüyken) kullanılır
+        from models.export import artifact_path
+        onnx_checksum = weights_checksum(model_type, artifact_path(model_type, model_path, quantize))
+    return backend, bool(quantize), onnx_checksum
+
+
+class ResultCache:
+    """Bellek içi LRU + SQLite disk katmanlı, içerik adresli sonuç önbelleği"""
+    def __init__(self, max_items=None, disk_path=None, disk_max_mb=None):
+        self.max_items = Config.RESULT_CACHE_MAX_ITEMS if max_items is None else max_items
+        self.disk_path = Config.RESULT_CACHE_DISK_PATH if disk_path is None else disk_path
+        disk_max_mb = Config.RESULT_CACHE_DISK_MAX_MB if disk_max_mb is None else disk_max_mb
+        self.disk_max_bytes = int(disk_max_mb * 1024 * 1024)
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        if self.disk_path:
+            os.makedirs(os.path.dirname(self.disk_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(*parts):
+        return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+
+    def get(self, key):
+        """Önce bellekte, sonra diskte arar; yoksa None döndürür"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    value = pickle.loads(row[0])
+                    self._put_memory(key, value)
+                    self.counters["disk_hits"] += 1
+                    return value
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._put_memory(key, value)
+            if self._db is not None:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time())
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def _put_memory(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _evict_disk(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM results ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.disk_max_bytes:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            self.counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["memory_items"] = len(self._memory)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+
+class CachedDetector:
+    """ObjectDetector.detect sonuçlarını görsel hash'i, model ve eşiklere göre önbellekler"""
+    def __init__(self, detector, cache=None, model_id=None, model_path=None):
+        self.detector = detector
+        self.cache = cache or get_result_cache()
+        self.model_id = model_id or detector.model_type
+        members = getattr(detector, "members", None)
+        if members:
+            # Ensemble/cascade: sonucu üyelerin ağırlıkları ve arka uçları belirler
+            members = [m.model_type for m in members()]
+            self.weights = [(m, weights_checksum(m)) for m in members]
+            self.runtime = [(m, backend_key(m)) for m in members]
+        else:
+            self.weights = weights_checksum(self.model_id, model_path)
+            self.runtime = backend_key(self.model_id, model_path)
+
+    @property
+    def model_type(self):
+        return self.detector.model_type
+
+    def cache_key(self):
+        """Dedektörün çıktısını belirleyen ayarlar: cache_key() (ensemble/cascade) veya karo ayarları"""
+        return member_cache_key(self.detector)
+
+    def precision_key(self):
+        precision_key = getattr(self.detector, "precision_key", None)
+        return precision_key() if precision_key else None
+
+    def detect(self, image):
+        key = self.cache.make_key(
+            "detect", pixel_hash(image), self.model_id, self.weights, self.runtime,
+            self.precision_key(), Config.CONFIDENCE_THRESHOLD, self.cache_key()
+        )
+        return self.cache.get_or_compute(key, lambda: self.detector.detect(image))
+
+    def detect_arrays(self, image):
+        key = self.cache.make_key(
+            "detect_arrays", pixel_hash(image), self.model_id, self.weights, self.runtime,
+            self.precision_key(), Config.CONFIDENCE_THRESHOLD, self.cache_key()
+        )
+        return self.cache.get_or_compute(key, lambda: self.detector.detect_arrays(image))
+
+
+class CachedCaptionGenerator:
+    """CaptionGenerator.generate_ai_caption sonuçlarını görsel hash'i ve decoding ayarlarına göre önbellekler"""
+    def __init__(self, caption_gen, cache=None):
+        self.caption_gen = caption_gen
+        self.cache = cache or get_result_cache()
+        self.weights = weights_checksum("BLIP")
+        self.runtime = backend_key("BLIP", backend=getattr(caption_gen, "backend", None),
+                                   quantize=getattr(caption_gen, "quantize", None))
+
+    def __getattr__(self, name):
+        return getattr(self.caption_gen, name)
+
+    def generate_ai_caption(self, image, preset=None, stats=None):
+        preset = preset or Config.CAPTION_PRESET
+        key = self.cache.make_key(
+            "caption", pixel_hash(image), Config.BLIP_MODEL, self.weights, self.runtime,
+            getattr(self.caption_gen, "precision", None),
+            preset, sorted(Config.CAPTION_PRESETS[preset].items())
+        )
+        caption = self.cache.get(key)
+        if caption is None:
+            # Önbellekten dönen caption için stats boş kalır (decoding yapılmadı)
+            caption = self.caption_gen.generate_ai_caption(image, preset, stats)
+            if caption != CAPTION_ERROR:
+                self.cache.put(key, caption)
+        return caption
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Süreç genelindeki tek ResultCache örneğini döndürür"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -0,0 +1,198 @@
+import contextlib
+import cProfile
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import Config
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "image_analyzer"
+# prometheus_text süre histogramına bu etiketleri kendisi ekler; çağıranın vermesi yinelenen etiket üretir
+RESERVED_LABELS = ("stage", "le")
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key, extra=None):
+    pairs = list(label_key) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _metric_suffix(label_key):
+    return "".join("_" + re.sub(r"[^0-9A-Za-z]+", "_", v).strip("_") for _, v in label_key)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total", "last")
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.last = value
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class Telemetry:
+    """Aşama süreleri, sayaçlar ve isteğe bağlı profil yakalama için ortak ölçüm yüzeyi"""
+    def __init__(self, profiler=None, profile_dir=None):
+        self.profiler = Config.PROFILER if profiler is None else profiler
+        self.profile_dir = profile_dir or Config.PROFILE_DIR
+        self._durations = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name, **labels):
+        """with telemetry.stage("inference", model="YOLO11"): ... süresini histograma ekler"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name, seconds, **labels):
+        reserved = [label for label in RESERVED_LABELS if label in labels]
+        if reserved:
+            raise ValueError(f"Ayrılmış etiket adı: {', '.join(reserved)} (aşama adı '{name}' zaten 'stage' etiketidir)")
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = _Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        """Config.PROFILER 'cprofile' veya 'torch' ise bloğu profiller ve PROFILE_DIR'a yazar"""
+        if not self.profiler:
+            yield
+            return
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stamp = f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{threading.get_ident()}"
+
+        if self.profiler == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(os.path.join(self.profile_dir, stamp + ".prof"))
+
+        elif self.profiler == "torch":
+            import torch
+            with torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU], record_shapes=True) as prof:
+                yield
+            prof.export_chrome_trace(os.path.join(self.profile_dir, stamp + ".json"))
+
+        else:
+            yield
+
+    def snapshot(self):
+        """MLflow'a yazılabilir düz metrik sözlüğü: son/ortalama süreler ve sayaç toplamları"""
+        metrics = {}
+        with self._lock:
+            for (name, labels), histogram in self._durations.items():
+                suffix = _metric_suffix(labels)
+                metrics[f"{name}{suffix}_last_s"] = histogram.last
+                metrics[f"{name}{suffix}_mean_s"] = histogram.total / histogram.count
+            for (name, labels), value in self._counters.items():
+                suffix = _metric_suffix(labels)
+                metrics[f"{name}{suffix}_total"] = value
+        return metrics
+
+    def prometheus_text(self, extra_gauges=None):
+        """Prometheus metin formatında (text/plain; version=0.0.4) tüm metrikler"""
+        lines = []
+        with self._lock:
+            durations = list(self._durations.items())
+            counters = list(self._counters.items())
+
+        metric = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {metric} Aşama başına süre")
+        lines.append(f"# TYPE {metric} histogram")
+        for (name, labels), histogram in durations:
+            label_key = (("stage", name),) + labels
+            for bound, count in zip(DURATION_BUCKETS, histogram.buckets):
+                lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', str(bound))])} {count}")
+            lines.append(f"{metric}_bucket{_format_labels(label_key, [('le', '+Inf')])} {histogram.count}")
+            lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.total}")
+            lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+
+        seen = set()
+        for (name, labels), value in sorted(counters):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        for name, labels, value in (extra_gauges or []):
+            lines.append(f"{METRIC_PREFIX}_{name}{_format_labels(_label_key(labels))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry():
+    """Süreç genelindeki Telemetry örneğini döndürür"""
+    return _telemetry
+
+
+def start_metrics_server(port=None, host="0.0.0.0"):
+    """Prometheus'un kazıyabileceği /metrics uç noktasını arka plan thread'inde açar"""
+    port = port or Config.METRICS_PORT
+    if not port:
+        return None
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = get_telemetry().prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"❌ Metrics sunucusu başlatılamadı ({port}): {e}")
+        return None
+    threading.Thread(target=httpd.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"📈 Metrics: http://{host}:{port}/metrics")
+    return httpd
@@ -0,0 +1,327 @@
+import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from config.settings import Config
+from models.detections import Detections, box_iou
+from utils.analysis_image import AnalysisImage
+from utils.telemetry import get_telemetry
+from utils.visualizer import ResultVisualizer
+
+_END = object()
+
+
+def open_capture(source):
+    """Dosya yolu, kamera indeksi ('0') veya RTSP/HTTP URL'sinden VideoCapture açar"""
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise RuntimeError(f"Video kaynağı açılamadı: {source}")
+    return capture
+
+
+def is_live(source):
+    return isinstance(source, int) or (isinstance(source, str) and (source.isdigit() or "://" in source))
+
+
+class FrameReader:
+    """Kareleri ayrı bir thread'de çözer; canlı kaynaklarda kuyruk dolunca en eski kare atılır"""
+    def __init__(self, source, queue_size=None, live=None):
+        self.source = source
+        self.live = is_live(source) if live is None else live
+        self.capture = open_capture(source)
+        self.source_fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        if self.source_fps <= 0 or self.source_fps > 240:
+            self.source_fps = 30.0
+
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size or Config.VIDEO_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="frame-reader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        index = 0
+        try:
+            while not self._stop.is_set():
+                ok, frame = self.capture.read()
+                if not ok:
+                    break
+                item = (index, index / self.source_fps, frame)
+                index += 1
+                if self.live:
+                    while True:
+                        try:
+                            self._queue.put_nowait(item)
+                            break
+                        except queue.Full:
+                            try:
+                                self._queue.get_nowait()
+                                self.dropped += 1
+                            except queue.Empty:
+                                pass
+                else:
+                    while not self._stop.is_set():
+                        try:
+                            self._queue.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+        finally:
+            self.capture.release()
+            # Tüketici durmuşsa kuyruk hiç boşalmaz; bloklayan put thread'i sonsuza kadar asılı bırakırdı
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            yield item
+
+    def stop(self, timeout=5.0):
+        """Okuyucuyu durdurur, kuyruğu boşaltır ve thread'in capture'ı bırakmasını bekler"""
+        self._stop.set()
+        self._drain()
+        self._thread.join(timeout)
+        # Hâlâ iterasyondaki bir tüketici varsa bitiş işaretiyle serbest kalır; join zaman aşımına
+        # uğradıysa okuyucu araya kare koymuş olabilir, kuyruk boşaltılıp yeniden denenir
+        while True:
+            self._drain()
+            try:
+                self._queue.put_nowait(_END)
+                return
+            except queue.Full:
+                continue
+
+    def _drain(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class BoxTracker:
+    """Tespit yapılmayan karelerde kutuları sabit hızla ilerletir.
+
+    Ardışık iki tespitteki kutular sınıf ve IoU ile eşlenir; eşlenen kutunun xywh hızı saniye başına hesaplanır,
+    yeni görünen kutular yerinde kalır.
+    """
+    def __init__(self, iou_threshold=None, max_gap=None):
+        self.iou_threshold = Config.VIDEO_TRACK_IOU if iou_threshold is None else iou_threshold
+        self.max_gap = Config.VIDEO_TRACK_MAX_GAP_S if max_gap is None else max_gap
+        self.detections = Detections.empty()
+        self.velocity = np.zeros((0, 4), dtype=np.float32)
+        self.timestamp = None
+
+    def update(self, detections, timestamp):
+        """Yeni tespitleri öncekilerle eşleyip hızları günceller"""
+        velocity = np.zeros((len(detections), 4), dtype=np.float32)
+        dt = None if self.timestamp is None else timestamp - self.timestamp
+        if dt and 0 < dt <= self.max_gap and len(detections) and len(self.detections):
+            ious = box_iou(detections.xyxy, self.detections.xyxy)
+            ious[detections.class_ids[:, None] != self.detections.class_ids[None, :]] = 0.0
+            # Açgözlü eşleme: en yüksek IoU'lu çiftten başlayarak her kutu en fazla bir kez kullanılır
+            for flat in np.argsort(-ious, axis=None):
+                i, j = np.unravel_index(flat, ious.shape)
+                if ious[i, j] < self.iou_threshold:
+                    break
+                velocity[i] = (detections.xywh[i] - self.detections.xywh[j]) / dt
+                ious[i, :] = 0.0
+                ious[:, j] = 0.0
+        self.detections = detections
+        self.velocity = velocity
+        self.timestamp = timestamp
+        return detections
+
+    def predict(self, timestamp, frame_shape=None):
+        """Son tespitlerin verilen zamandaki kestirilen konumları"""
+        if self.timestamp is None or not len(self.detections):
+            return self.detections
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_gap)
+        xywh = self.detections.xywh + self.velocity * dt
+        xywh[:, 2:] = np.maximum(xywh[:, 2:], 1.0)
+        if frame_shape is not None:
+            height, width = frame_shape[:2]
+            xywh[:, 0] = np.clip(xywh[:, 0], 0, width - xywh[:, 2])
+            xywh[:, 1] = np.clip(xywh[:, 1], 0, height - xywh[:, 3])
+        return Detections(xywh, self.detections.confs, self.detections.class_ids, self.detections.vocab)
+
+
+class FrameResult:
+    __slots__ = ("index", "timestamp", "frame", "detections", "caption", "analyzed")
+
+    def __init__(self, index, timestamp, frame, detections, caption, analyzed):
+        self.index = index
+        self.timestamp = timestamp
+        self.frame = frame
+        self.detections = detections
+        self.caption = caption
+        self.analyzed = analyzed
+
+
+def scene_difference(a, b):
+    """İki küçük gri kare arasındaki ortalama mutlak fark (0-1)"""
+    return float(np.mean(cv2.absdiff(a, b))) / 255.0
+
+
+class VideoAnalyzer:
+    """Video/kamera akışında hedef FPS'te tespit, sahne değişiminde caption ve artımlı overlay üretir"""
+    def __init__(self, detector, caption_gen=None, target_fps=None, scene_threshold=None, draw=True, tracking=None):
+        self.detector = detector
+        self.caption_gen = caption_gen
+        self.tracking = Config.VIDEO_TRACKING if tracking is None else tracking
+        self.target_fps = target_fps or Config.VIDEO_TARGET_FPS
+        self.scene_threshold = Config.SCENE_CHANGE_THRESHOLD if scene_threshold is None else scene_threshold
+        self.draw = draw
+        self.stats = {}
+
+        self._caption_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-caption") if caption_gen else None
+
+    def stream(self, source, max_frames=None):
+        """Her kare için FrameResult üreten generator; istatistikler self.stats'ta güncellenir"""
+        reader = FrameReader(source)
+        telemetry = get_telemetry()
+        visualizer = ResultVisualizer({})
+
+        interval = 1.0 / self.target_fps
+        next_detection = 0.0
+        avg_latency = 0.0
+        detections = Detections.empty()
+        tracker = BoxTracker()
+        caption, caption_future, caption_thumb = None, None, None
+
+        frames = analyzed = skipped = 0
+        start = time.perf_counter()
+        self.stats = {"source_fps": reader.source_fps, "live": reader.live}
+
+        try:
+            for index, timestamp, frame in reader:
+                clock = (time.perf_counter() - start) if reader.live else timestamp
+                run_detection = clock >= next_detection
+
+                if run_detection:
+                    image = AnalysisImage.from_array(frame, bgr=True)
+                    t0 = time.perf_counter()
+                    with telemetry.stage("video_detection", model=self.detector.model_type):
+                        detections = self.detector.detect_arrays(image) or Detections.empty()
+                    tracker.update(detections, clock)
+                    latency = time.perf_counter() - t0
+                    avg_latency = latency if analyzed == 0 else 0.8 * avg_latency + 0.2 * latency
+                    # Model hedef aralıktan yavaşsa aralık gecikmeye uyarlanır (adaptif kare atlama)
+                    next_detection = clock + max(interval, avg_latency if reader.live else interval)
+                    analyzed += 1
+
+                    if self.caption_gen is not None:
+                        caption, caption_future, caption_thumb = self._update_caption(
+                            image, caption, caption_future, caption_thumb
+                        )
+                else:
+                    skipped += 1
+                    if self.tracking:
+                        detections = tracker.predict(clock, frame.shape)
+
+                if self.draw:
+                    visualizer.draw(frame, detections)
+                    if caption:
+                        frame = visualizer.add_caption_to_image(frame, caption)
+
+                frames += 1
+                elapsed = max(time.perf_counter() - start, 1e-9)
+                self.stats.update({
+                    "frames": frames,
+                    "analyzed_frames": analyzed,
+                    "skipped_frames": skipped,
+                    "dropped_frames": reader.dropped,
+                    "output_fps": frames / elapsed,
+                    "detection_fps": analyzed / elapsed,
+                    "avg_detection_latency_s": avg_latency
+                })
+                yield FrameResult(index, timestamp, frame, detections, caption, run_detection)
+
+                if max_frames and frames >= max_frames:
+                    break
+        finally:
+            reader.stop()
+
+    def _update_caption(self, image, caption, future, thumb):
+        """Önceki caption'ın sahnesinden yeterince farklıysa arka planda yeni caption başlatır"""
+        if future is not None and future.done():
+            try:
+                caption = future.result()
+            except Exception as e:
+                print(f"❌ Video caption hatası: {e}")
+            future = None
+
+        current = cv2.resize(cv2.cvtColor(image.rgb, cv2.COLOR_RGB2GRAY), (64, 64), interpolation=cv2.INTER_AREA)
+        if future is None and (thumb is None or scene_difference(current, thumb) > self.scene_threshold):
+            future = self._caption_pool.submit(self.caption_gen.generate_ai_caption, image)
+            thumb = current
+        return caption, future, thumb
+
+    def close(self):
+        if self._caption_pool is not None:
+            self._caption_pool.shutdown(wait=False)
+
+
+def main():
+    from models.registry import get_registry
+    from models.detector import ObjectDetector
+
+    parser = argparse.ArgumentParser(description="Video dosyası / kamera / RTSP akışı analizi")
+    parser.add_argument("source", help="Video dosyası, kamera indeksi (0) veya RTSP URL")
+    parser.add_argument("--model", default="YOLO11", choices=["YOLO11", "DETR", "MY YOLO (PC Setup)"])
+    parser.add_argument("--fps", type=float, default=Config.VIDEO_TARGET_FPS, help="Hedef tespit FPS'i")
+    parser.add_argument("--no-caption", action="store_true")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--output", help="Overlay'li çıktı videosu (.mp4)")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    detector_handle = registry.acquire(args.model)
+    caption_handle = None if args.no_caption else registry.acquire("BLIP")
+    effective_type = "YOLO11" if "YOLO" in args.model else args.model
+    analyzer = VideoAnalyzer(
+        ObjectDetector(detector_handle.model, effective_type),
+        caption_handle.model if caption_handle else None,
+        target_fps=args.fps
+    )
+
+    writer = None
+    try:
+        for result in analyzer.stream(args.source, args.max_frames):
+            if args.output:
+                if writer is None:
+                    height, width = result.frame.shape[:2]
+                    fps = analyzer.stats.get("source_fps", 30.0)
+                    writer = cv2.VideoWriter(args.output, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+                writer.write(result.frame)
+            if result.index % 30 == 0:
+                s = analyzer.stats
+                print(f"   kare {s['frames']}: {s['output_fps']:.1f} FPS, tespit {s['detection_fps']:.1f} FPS, "
+                      f"atlanan {s['skipped_frames']}, düşen {s['dropped_frames']}")
+    finally:
+        if writer is not None:
+            writer.release()
+        analyzer.close()
+        detector_handle.release()
+        if caption_handle:
+            caption_handle.release()
+
+    print(f"✅ Bitti: {analyzer.stats}")
+
+
+if __name__ == "__main__":
+    main()
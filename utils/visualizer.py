@@ -1,14 +1,24 @@
+import hashlib
+import io
+
 import cv2
 import numpy as np
+from PIL import Image
 from config.settings import Config
+from utils.analysis_image import AnalysisImage
+from utils.telemetry import get_telemetry
 
 class ResultVisualizer:
+    _color_tables = {}
+
     def __init__(self, classes):
         self.classes = classes
     
     def draw_detections(self, img, boxes, confs, class_ids, indexes):
         """Image par bounding boxes draw karta hai"""
         font = cv2.FONT_HERSHEY_PLAIN
+        if isinstance(img, AnalysisImage):
+            img = img.bgr_copy()
         
         if len(boxes) > 0:
             for i in indexes.flatten():
@@ -24,7 +34,96 @@ class ResultVisualizer:
         
         return img
     
-    def _get_color(self, label):
+    def draw(self, img, detections):
+        """Detections nesnesindeki kutuları sınıf id -> renk tablosuyla çizer"""
+        if isinstance(img, AnalysisImage):
+            img = img.bgr_copy()
+        if len(detections) == 0:
+            return img
+
+        with get_telemetry().stage("draw"):
+            colors = self.color_table(detections.vocab)[detections.class_ids].tolist()
+            boxes = detections.xywh.astype(np.int32).tolist()
+            names = detections.class_names()
+            for (x, y, w, h), name, conf, color in zip(boxes, names, detections.confs.tolist(), colors):
+                cv2.rectangle(img, (x, y), (x + w, y + h), color, 2)
+                cv2.putText(img, f"{name} {conf:.2f}", (x, y - 10), cv2.FONT_HERSHEY_PLAIN, 1, color, 2)
+        return img
+
+    def render(self, image, detections, selected=None, max_width=None, fmt=None):
+        """Görüntüleme çözünürlüğünde JPEG/WebP byte'ları döndürür; (sonuç, seçim) başına bir kez çizilir.
+
+        selected None ise tüm kutular, aksi halde yalnızca o indeksteki kutu vurgulanır.
+        """
+        image = AnalysisImage.ensure(image)
+        max_width = max_width or Config.DISPLAY_MAX_WIDTH
+        fmt = fmt or Config.DISPLAY_FORMAT
+        key = ('render', self._detections_key(detections), selected, max_width, fmt)
+        return image.memo(key, lambda: self._render(image, detections, selected, max_width, fmt))
+
+    def _render(self, image, detections, selected, max_width, fmt):
+        with get_telemetry().stage("render"):
+            base, scale = self.display_base(image, max_width)
+            overlay = self.overlay(base.shape, detections, scale, selected)
+            # Taban paylaşılan önbellekte kalır; yalnızca overlay'in dolu pikselleri kopyanın üzerine yazılır
+            composed = base.copy()
+            mask = overlay[..., 3] > 0
+            composed[mask] = overlay[..., :3][mask]
+
+            buffer = io.BytesIO()
+            Image.fromarray(composed).save(buffer, format=fmt, quality=Config.DISPLAY_QUALITY)
+            return buffer.getvalue()
+
+    @staticmethod
+    def display_base(image, max_width):
+        """Ekrana sığacak şekilde küçültülmüş RGB taban (AnalysisImage üzerinde önbelleklenir) ve ölçek"""
+        if image.width <= max_width:
+            return image.rgb, 1.0
+        scale = max_width / image.width
+        return image.resized(max_width, max(1, round(image.height * scale)), cv2.INTER_AREA), scale
+
+    def overlay(self, shape, detections, scale=1.0, selected=None):
+        """Kutuları ve etiketleri ayrı, şeffaf bir RGBA katmana çizer"""
+        layer = np.zeros((shape[0], shape[1], 4), dtype=np.uint8)
+        if len(detections) == 0:
+            return layer
+
+        boxes = np.round(detections.xywh * scale).astype(np.int32)
+        if selected is not None:
+            x, y, w, h = boxes[selected].tolist()
+            x, y = max(0, x), max(0, y)
+            name = detections.vocab.name(int(detections.class_ids[selected]))
+            label = f"{name.capitalize()}: %{detections.confs[selected] * 100:.1f}"
+            cv2.rectangle(layer, (x, y), (x + w, y + h), (0, 255, 0, 255), 3)
+            cv2.putText(layer, label, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0, 255), 2)
+            return layer
+
+        # Renk tablosu BGR (OpenCV); RGBA katman için kanallar ters çevrilir
+        colors = self.color_table(detections.vocab)[detections.class_ids][:, ::-1].tolist()
+        for (x, y, w, h), name, conf, color in zip(boxes.tolist(), detections.class_names(), detections.confs.tolist(), colors):
+            cv2.rectangle(layer, (x, y), (x + w, y + h), (*color, 255), 2)
+            cv2.putText(layer, f"{name} {conf:.2f}", (x, y - 10), cv2.FONT_HERSHEY_PLAIN, 1, (*color, 255), 2)
+        return layer
+
+    @staticmethod
+    def _detections_key(detections):
+        h = hashlib.sha1(detections.xywh.tobytes())
+        h.update(detections.confs.tobytes())
+        h.update(detections.class_ids.tobytes())
+        return h.hexdigest()
+
+    @classmethod
+    def color_table(cls, vocab):
+        """Ortak sözlükteki her sınıf için rengi bir kez hesaplar (sözlük büyüdükçe genişletilir)"""
+        table = cls._color_tables.get(id(vocab))
+        if table is None or len(table) < len(vocab):
+            names = [vocab.name(i) for i in range(len(vocab))]
+            table = np.array([cls._get_color(n) for n in names], dtype=np.int32).reshape(-1, 3)
+            cls._color_tables[id(vocab)] = table
+        return table
+    
+    @staticmethod
+    def _get_color(label):
         """Object type ke hisaab se color return karta hai"""
         if 'person' in label:
             return Config.COLORS['person']